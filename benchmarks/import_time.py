@@ -0,0 +1,54 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# The headless core must import in under BUDGET_MS and must not pull in any
+# UI, chart or dataframe library; those are imported where they are used
+BUDGET_MS = 50
+FORBIDDEN = ('streamlit', 'plotly', 'pandas', 'pyarrow')
+
+
+def import_time_ms(module):
+    # Cumulative time reported by -X importtime for the module, in a fresh
+    # interpreter so nothing is already cached in sys.modules
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True).stderr
+    for line in reversed(output.splitlines()):
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def loaded_modules(module):
+    code = f'import sys, {module}; print(" ".join(sys.modules))'
+    return set(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                              check=True).stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the core package's import time against its budget")
+    parser.add_argument('--module', default='core')
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    times = [import_time_ms(args.module) for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f"import {args.module}: median {median:.1f}ms, min {min(times):.1f}ms over {args.runs} runs "
+          f"(budget {args.budget_ms:g}ms)")
+
+    failed = False
+    if median > args.budget_ms:
+        print(f"Over budget by {median - args.budget_ms:.1f}ms", file=sys.stderr)
+        failed = True
+    leaked = sorted(name for name in FORBIDDEN if name in loaded_modules(args.module))
+    if leaked:
+        print(f"{args.module} imports {', '.join(leaked)} at load time", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+from ledger_ingest import LedgerIngest
+
+# (account, share of postings, mean posting, share posted as debits) for a
+# synthetic general ledger
+ACCOUNTS = (
+    (1000, 0.20, 5000, 0.52), (1100, 0.20, 8000, 0.52), (1200, 0.10, 6000, 0.51), (2000, 0.15, 4000, 0.48),
+    (2200, 0.02, 20000, 0.45), (2500, 0.01, 50000, 0.4), (3000, 0.01, 100000, 0.2), (4000, 0.15, 9000, 0.05),
+    (5000, 0.10, 5000, 0.95), (6000, 0.05, 3000, 0.95), (8000, 0.01, 1000, 0.9)
+)
+
+
+def write_ledger(path, rows, chunk_rows=1 << 20, seed=0):
+    # Writes a GL export in chunks so generating it is memory-bounded too
+    rng = np.random.default_rng(seed)
+    accounts = np.array([account for account, *_ in ACCOUNTS])
+    shares = np.array([share for _, share, _, _ in ACCOUNTS])
+    means = np.array([mean for _, _, mean, _ in ACCOUNTS], dtype=float)
+    debit_shares = np.array([debit for *_, debit in ACCOUNTS])
+    start = np.datetime64('2024-01-01')
+    writer = None
+    try:
+        for offset in range(0, rows, chunk_rows):
+            n = min(chunk_rows, rows - offset)
+            picks = rng.choice(len(accounts), n, p=shares / shares.sum())
+            amounts = np.round(rng.exponential(means[picks]), 2)
+            debit = rng.random(n) < debit_shares[picks]
+            table = pa.table({
+                'date': start + rng.integers(0, 730, n).astype('timedelta64[D]'),
+                'account': accounts[picks] + rng.integers(0, 50, n),
+                'debit': np.where(debit, amounts, 0.0),
+                'credit': np.where(debit, 0.0, amounts)
+            })
+            if path.endswith('.parquet'):
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                writer = writer or pv.CSVWriter(path, table.schema)
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and peak memory of streaming GL ingestion")
+    parser.add_argument('--rows', type=int, default=5000000)
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f'ledger.{args.format}')
+        write_ledger(path, args.rows)
+        size = os.path.getsize(path)
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        ingest = LedgerIngest()
+        start = time.perf_counter()
+        ingest.add_ledger(path)
+        inputs = ingest.financial_inputs()
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"{args.rows:,} rows ({size / 1e6:,.0f} MB {args.format}) in {elapsed:.2f}s: "
+          f"{args.rows / elapsed:,.0f} rows/sec, {size / elapsed / 1e6:,.0f} MB/sec")
+    print(f"Peak RSS {peak / 1024:,.0f} MB (+{max(peak - baseline, 0) / 1024:,.0f} MB while ingesting)")
+    print(inputs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+from score_cli import score_chunks, score_chunks_parallel
+
+
+def shards(frame, chunksize):
+    for start in range(0, len(frame), chunksize):
+        yield frame.iloc[start:start + chunksize]
+
+
+def run(frame, workers, chunksize):
+    start = time.perf_counter()
+    if workers == 1:
+        results = score_chunks(shards(frame, chunksize), BusinessAnalysisTool(), ['company'], details=True)
+    else:
+        results = score_chunks_parallel(shards(frame, chunksize), workers, ['company'], details=True)
+    rows = sum(len(result) for result in results)
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio scoring throughput by worker count")
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunksize', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    frame = generate_companies(args.rows)
+    print(f"{args.rows:,} rows, chunksize {args.chunksize:,}, {os.cpu_count()} CPUs available")
+    print(f"{'workers':>8} {'rows/sec':>12} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        rate = run(frame, workers, args.chunksize)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generate_companies
+
+
+async def client(host, port, payloads, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in payloads:
+            start = time.perf_counter()
+            writer.write(b"POST /report HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (host.encode(), len(body), body))
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b' 200 ' not in status:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, requests, concurrency, payloads):
+    bodies = [json.dumps(payload).encode() for payload in payloads]
+    per_client = [[bodies[(c + i * concurrency) % len(bodies)] for i in range(requests // concurrency)]
+                  for c in range(concurrency)]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, payloads, latencies, errors) for payloads in per_client))
+    return time.perf_counter() - start, np.array(latencies), errors
+
+
+async def wait_until_up(host, port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for scoring_service.py, reporting throughput "
+                                                 "and latency percentiles")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=64,
+                        help="Open keep-alive connections, each sending requests back to back")
+    parser.add_argument('--spawn', action='store_true',
+                        help="Start a local service for the run (with the batching options below)")
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    service = None
+    if args.spawn:
+        service = subprocess.Popen(
+            [sys.executable, 'scoring_service.py', '--host', args.host, '--port', str(args.port),
+             '--max-batch-size', str(args.max_batch_size), '--max-wait-ms', str(args.max_wait_ms)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    try:
+        asyncio.run(wait_until_up(args.host, args.port))
+        payloads = generate_companies(1000).drop(columns=['company']).to_dict('records')
+        elapsed, latencies, errors = asyncio.run(
+            run_load(args.host, args.port, args.requests, args.concurrency, payloads))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+    print(f"{len(latencies):,} requests, concurrency {args.concurrency}: {len(latencies) / elapsed:,.0f} req/sec")
+    print(f"latency p50 {p50:.1f}ms  p90 {p90:.1f}ms  p99 {p99:.1f}ms  max {latencies.max() * 1000:.1f}ms")
+    if errors:
+        print(f"{len(errors):,} non-200 responses", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
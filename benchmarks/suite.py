@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_companies, input_records
+from core import BusinessAnalysisTool, RecommendationAnalyzer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+DEFAULT_TOLERANCE = 0.25
+
+
+def best_per_call(function, items, repeat=5):
+    # Best of `repeat` passes over items, as seconds per call; the best pass is
+    # the least disturbed by other work on the machine
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, (time.perf_counter() - start) / len(items))
+    return best
+
+
+def best_of(function, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_report_latency():
+    analyzer = BusinessAnalysisTool()
+    records = input_records(generate_companies(2000, seed=1, missing_rate=0.05))
+    return best_per_call(analyzer.generate_comprehensive_report, records) * 1e6, 'us', 'lower'
+
+
+def batch_throughput(rows, details=False, repeat=3):
+    analyzer = BusinessAnalysisTool()
+    frame = generate_companies(rows, seed=2, missing_rate=0.05)
+    return rows / best_of(lambda: analyzer.score_batch(frame, details=details), repeat), 'rows/s', 'higher'
+
+
+def bench_batch_10k():
+    return batch_throughput(10000)
+
+
+def bench_batch_details_10k():
+    return batch_throughput(10000, details=True)
+
+
+def bench_batch_1m():
+    return batch_throughput(1000000, repeat=2)
+
+
+def bench_data_quality():
+    analyzer = RecommendationAnalyzer()
+    records = input_records(generate_companies(2000, seed=3, missing_rate=0.05))
+    return best_per_call(lambda record: analyzer.calculate_data_quality_score(record, 'marketing'),
+                         records) * 1e6, 'us', 'lower'
+
+
+def chart_inputs():
+    analyzer = BusinessAnalysisTool()
+    return [analyzer.generate_comprehensive_report(record)
+            for record in generate_companies(50, seed=4).to_dict('records')]
+
+
+def bench_radar_chart():
+    from main import create_radar_chart
+
+    reports = chart_inputs()
+    return best_per_call(lambda report: create_radar_chart(report['category_scores']).to_json(),
+                         reports, repeat=3) * 1e3, 'ms', 'lower'
+
+
+def bench_risk_gauge():
+    from main import create_risk_gauge
+
+    reports = chart_inputs()
+    return best_per_call(lambda report: create_risk_gauge(report['overall_score']).to_json(),
+                         reports, repeat=3) * 1e3, 'ms', 'lower'
+
+
+def submitted_app():
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    app.run()
+    app.button(key='generate_analysis').click().run()
+    return app
+
+
+def bench_app_initial_render():
+    # The form alone, before anything is submitted
+    from streamlit.testing.v1 import AppTest
+
+    def first_run():
+        AppTest.from_file(APP_PATH, default_timeout=60).run()
+    return best_of(first_run, repeat=3) * 1e3, 'ms', 'lower'
+
+
+def bench_app_rerun():
+    # A full script rerun with the report already submitted and cached, as
+    # after any interaction outside a fragment
+    app = submitted_app()
+    times = []
+    for _ in range(10):
+        start = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3, 'ms', 'lower'
+
+
+def bench_app_input_change():
+    # Changing a form input and resubmitting: new report, charts and panels
+    app = submitted_app()
+    times = []
+    for value in range(20, 40, 2):
+        start = time.perf_counter()
+        app.slider(key='conversion_rate').set_value(value).run()
+        app.button(key='generate_analysis').click().run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3, 'ms', 'lower'
+
+
+BENCHMARKS = {
+    'report_latency': bench_report_latency,
+    'batch_10k': bench_batch_10k,
+    'batch_details_10k': bench_batch_details_10k,
+    'batch_1m': bench_batch_1m,
+    'data_quality_score': bench_data_quality,
+    'radar_chart': bench_radar_chart,
+    'risk_gauge': bench_risk_gauge,
+    'app_initial_render': bench_app_initial_render,
+    'app_rerun': bench_app_rerun,
+    'app_input_change': bench_app_input_change
+}
+LARGE = {'batch_1m'}
+
+
+def regression(result, baseline, tolerance):
+    # Relative change against the baseline, and whether it is a regression:
+    # worse (slower, or lower throughput) by more than the tolerance
+    change = (result['value'] - baseline['value']) / baseline['value']
+    worse = -change if result['better'] == 'higher' else change
+    return change, worse > baseline.get('tolerance', tolerance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance benchmarks checked against a JSON baseline")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="Run just these benchmarks")
+    parser.add_argument('--skip-large', action='store_true', help="Skip the 1M-row batch benchmark")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Write these results as the new baseline instead of comparing")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative regression per metric (a baseline entry's own tolerance wins)")
+    parser.add_argument('--output', help="Also write this run's results as JSON")
+    args = parser.parse_args()
+
+    names = args.only or [name for name in BENCHMARKS if not (args.skip_large and name in LARGE)]
+    results = {}
+    # The app benchmarks save history and scenarios; keep them out of data/
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ['HISTORY_PATH'] = os.path.join(scratch, 'history')
+        os.environ['SCENARIO_DB_PATH'] = os.path.join(scratch, 'scenarios.sqlite3')
+        for name in names:
+            value, unit, better = BENCHMARKS[name]()
+            results[name] = {'value': round(value, 3), 'unit': unit, 'better': better}
+            print(f"{name:<20} {value:>14,.2f} {unit}", flush=True)
+
+    run = {'python': platform.python_version(), 'machine': platform.machine(),
+           'cpus': os.cpu_count(), 'metrics': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+
+    if args.update_baseline:
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                # Metrics no benchmark produces any more are dropped
+                previous = {name: metric for name, metric in json.load(f)['metrics'].items() if name in BENCHMARKS}
+        for name, result in results.items():
+            if 'tolerance' in previous.get(name, {}):
+                result['tolerance'] = previous[name]['tolerance']
+        run['metrics'] = dict(previous, **results)
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 1
+    with open(args.baseline) as f:
+        baseline = json.load(f)['metrics']
+    failures = []
+    print(f"\n{'metric':<20} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<20} {'-':>14} {result['value']:>14,.2f}      new")
+            continue
+        change, failed = regression(result, baseline[name], args.tolerance)
+        print(f"{name:<20} {baseline[name]['value']:>14,.2f} {result['value']:>14,.2f} {change:>+7.0%}"
+              f"{'  REGRESSION' if failed else ''}")
+        if failed:
+            failures.append(name)
+    if failures:
+        print(f"\n{len(failures)} metric(s) regressed past tolerance: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+INDUSTRIES = ["B2B Software", "B2C E-commerce", "Professional Services", "Manufacturing"]
+
+PERCENT_FIELDS = {
+    # field: (beta a, beta b) on the 0-100 scale
+    'conversion_rate': (2, 6),
+    'revenue_growth': (2, 5),
+    'recurring_revenue_percentage': (4, 3),
+    'pipeline_conversion': (2, 6),
+    'retention_rate': (8, 2),
+    'satisfaction_score': (7, 2),
+    'defect_rate': (1, 20),
+    'product_satisfaction': (7, 2),
+    'sla_compliance': (12, 1),
+    'on_time_delivery': (10, 1.5),
+    'automation_percentage': (3, 3),
+    'process_automation': (3, 3),
+    'resource_utilization': (6, 2),
+    'error_rate': (1, 15),
+    'overhead_ratio': (2, 5),
+    'employee_satisfaction': (6, 2),
+    'employee_retention': (8, 2),
+    'skill_coverage': (5, 2)
+}
+
+RATING_FIELDS = [
+    'campaign_effectiveness', 'tech_stack_rating', 'infrastructure_scalability',
+    'leadership_experience', 'succession_readiness', 'vision_rating',
+    'culture_rating', 'innovation_rating'
+]
+
+LOGNORMAL_FIELDS = {
+    # field: (median, sigma, upper bound)
+    'total_addressable_audience': (50000, 1.5, 10000000),
+    'customer_acquisition_cost': (500, 0.9, 10000),
+    'average_deal_size': (5000, 1.0, 100000),
+    'sales_cycle_length': (45, 0.6, 365),
+    'delivery_cost': (200, 1.0, 10000),
+    'cycle_time': (15, 0.7, 100),
+    'cost_per_unit': (50, 0.9, 1000),
+    'cash_flow_operations': (250000, 1.5, 100000000),
+    'inventory_turnover': (8, 0.6, 50),
+    'days_sales_outstanding': (45, 0.4, 365),
+    'current_ratio': (1.8, 0.4, 10),
+    'quick_ratio': (1.2, 0.45, 10),
+    'debt_to_equity': (1.0, 0.6, 10),
+    'pipeline_coverage': (3, 0.4, 10)
+}
+
+MARKET_FIELDS = {
+    # Marketing inputs the data-quality analyzer and rules read: (beta a, beta b)
+    'brand_recognition': (3, 3),
+    'market_growth': (2, 8),
+    'customer_retention': (8, 2),
+    'customer_satisfaction': (7, 2)
+}
+
+# Inputs where a lower value is better; they move against company health
+LOWER_IS_BETTER = {
+    'defect_rate', 'error_rate', 'overhead_ratio', 'customer_acquisition_cost', 'sales_cycle_length',
+    'delivery_cost', 'cycle_time', 'cost_per_unit', 'days_sales_outstanding', 'debt_to_equity'
+}
+
+MARGIN_FIELDS = {
+    # field: (mean, sd) in percent, clipped to -100..100
+    'gross_profit_margin': (50, 20),
+    'net_profit_margin': (8, 15),
+    'operating_margin': (12, 15)
+}
+
+
+def generate_companies(n, seed=0, correlation=0.4, missing_rate=0.0):
+    # Each field keeps its own marginal distribution; a shared latent "company
+    # health" factor reorders the draws so healthy companies tend to be good
+    # across the board (a rank copula with the given correlation). With
+    # missing_rate > 0 that share of input cells is left empty
+    rng = np.random.default_rng(seed)
+    health = rng.standard_normal(n)
+    columns = {
+        'company': np.char.add('company-', np.arange(n).astype(str)),
+        'industry': rng.choice(INDUSTRIES, n)
+    }
+    for field, (a, b) in PERCENT_FIELDS.items():
+        columns[field] = np.round(rng.beta(a, b, n) * 100)
+    for field in RATING_FIELDS:
+        columns[field] = np.clip(np.round(rng.normal(7, 1.8, n)), 1, 10)
+    for field, (median, sigma, upper) in LOGNORMAL_FIELDS.items():
+        columns[field] = np.minimum(upper, np.round(rng.lognormal(np.log(median), sigma, n), 2))
+    for field, (mean, sd) in MARGIN_FIELDS.items():
+        columns[field] = np.clip(np.round(rng.normal(mean, sd, n)), -100, 100)
+    for field, (a, b) in MARKET_FIELDS.items():
+        columns[field] = np.round(rng.beta(a, b, n) * 100)
+    columns['marketing_roi'] = np.clip(np.round(rng.lognormal(np.log(200), 0.6, n)), 0, 1000)
+    columns['capacity_utilization'] = np.round(rng.beta(6, 2, n) * 100)
+    columns['market_share'] = np.minimum(100, np.round(rng.lognormal(np.log(4), 1.0, n), 1))
+    columns['competitive_advantage'] = np.clip(np.round(rng.normal(6, 2, n)), 1, 10)
+    columns['total_addressable_market'] = np.round(rng.lognormal(np.log(5e8), 1.2, n), -3)
+
+    inputs = [field for field in columns if field not in ('company', 'industry')]
+    if correlation:
+        for field in inputs:
+            sign = -1 if field in LOWER_IS_BETTER else 1
+            latent = sign * correlation * health + np.sqrt(1 - correlation ** 2) * rng.standard_normal(n)
+            columns[field] = np.sort(columns[field])[np.argsort(np.argsort(latent))]
+
+    columns['data_source'] = rng.choice(['automatic', 'manual'], n, p=[0.4, 0.6])
+    columns['data_age_months'] = rng.integers(0, 13, n)
+    frame = pd.DataFrame(columns)
+    if missing_rate:
+        frame[inputs] = frame[inputs].mask(rng.random((n, len(inputs))) < missing_rate)
+    return frame
+
+
+def input_records(frame):
+    # Rows as input dicts with the empty cells left out, as a form omits
+    # the fields it has no answer for
+    return [{field: value for field, value in record.items() if value == value}
+            for record in frame.to_dict('records')]
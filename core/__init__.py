@@ -0,0 +1,3 @@
+from core.analysis import BusinessAnalysisTool
+from core.data_quality import RecommendationAnalyzer
+from core.industry_benchmarks import IndustryBenchmarks, get_benchmarks
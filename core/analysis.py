@@ -0,0 +1,285 @@
+import numpy as np
+
+from core.compact_report import MISSING, RISK_LEVELS, ReportBatch, ReportCodec, fixed_array
+from core.data_quality import RecommendationAnalyzer
+from core.industry_benchmarks import get_benchmarks
+from core.recommendation_rules import RecommendationMatrix, RecommendationRules
+from core.scoring_plan import ScoringPlan, round_scores
+
+
+class BusinessAnalysisTool:
+    # (rating, minimum overall score), best first; anything lower is "Poor"
+    VIABILITY_RATINGS = (("Excellent", 8.5), ("Strong", 7), ("Good", 5.5), ("Fair", 4))
+    # Same shape, on the mean of the operational, delivery and financial scores
+    SCALABILITY_RATINGS = (("Highly Scalable", 8.5), ("Scalable", 7), ("Moderately Scalable", 5.5),
+                           ("Limited Scalability", 4))
+    # Stages of generate_comprehensive_report that instrument() times
+    TIMED_STAGES = ('analyze_marketing', 'analyze_sales', 'analyze_product_delivery',
+                    'analyze_operational_efficiency', 'analyze_financial_health', 'analyze_people',
+                    '_generate_recommendations', '_assess_risks')
+
+    def __init__(self, recommendation_analyzer=None, peer_index=None):
+        self.score_weights = {
+            'marketing': 0.15,
+            'sales': 0.20,
+            'product_delivery': 0.20,
+            'operational_efficiency': 0.15,
+            'financial_health': 0.20,
+            'people': 0.10
+        }
+        self.plan = ScoringPlan()
+        self.recommendation_analyzer = recommendation_analyzer or RecommendationAnalyzer()
+        self.benchmarks = get_benchmarks()
+        self.recommendation_rules = RecommendationRules(self.benchmarks)
+        self.peer_index = peer_index
+        self.category_analyzers = {
+            'marketing': self.analyze_marketing,
+            'sales': self.analyze_sales,
+            'product_delivery': self.analyze_product_delivery,
+            'operational_efficiency': self.analyze_operational_efficiency,
+            'financial_health': self.analyze_financial_health,
+            'people': self.analyze_people
+        }
+        self.report_codec = ReportCodec(self)
+    
+    def instrument(self, timings):
+        timings.instrument(self, self.TIMED_STAGES)
+        self.category_analyzers = {category: getattr(self, f'analyze_{category}')
+                                   for category in self.category_analyzers}
+        return self
+
+    def analyze_marketing(self, data):
+        return self.plan.score_category('marketing', data)
+
+    def analyze_sales(self, data):
+        return self.plan.score_category('sales', data)
+
+    def analyze_product_delivery(self, data):
+        return self.plan.score_category('product_delivery', data)
+
+    def analyze_operational_efficiency(self, data):
+        return self.plan.score_category('operational_efficiency', data)
+
+    def analyze_financial_health(self, data):
+        return self.plan.score_category('financial_health', data)
+
+    def analyze_people(self, data):
+        return self.plan.score_category('people', data)
+
+    def generate_comprehensive_report(self, data):
+        scores = {
+            'marketing': self.analyze_marketing(data),
+            'sales': self.analyze_sales(data),
+            'product_delivery': self.analyze_product_delivery(data),
+            'operational_efficiency': self.analyze_operational_efficiency(data),
+            'financial_health': self.analyze_financial_health(data),
+            'people': self.analyze_people(data)
+        }
+
+        weighted_score = self._weighted_score(scores)
+
+        report = {
+            'overall_score': round(weighted_score, 2),
+            'category_scores': {k: round(v, 2) for k, v in scores.items()},
+            'viability_rating': self._get_viability_rating(weighted_score),
+            'scalability_rating': self._get_scalability_rating(scores),
+            'recommendations': self._generate_recommendations(scores, data),
+            'risk_assessment': self._assess_risks(scores)
+        }
+        if self.peer_index is not None:
+            report['peer_percentiles'] = self.peer_index.rank_record(data, scores)
+
+        return report
+
+    def _weighted_score(self, scores):
+        return sum(scores[category] * self.score_weights[category]
+                   for category in scores)
+
+    def score_batch(self, frame, details=False):
+        import pandas as pd
+
+        scores = self.plan.score_frame(frame)
+
+        # Same accumulation order as generate_comprehensive_report so the
+        # floating point results are bit-identical to the single-dict path
+        weighted_score = self._weighted_score(scores)
+
+        result = pd.DataFrame(index=frame.index)
+        result['overall_score'] = round_scores(weighted_score, 2)
+        for category, values in scores.items():
+            result[f'{category}_score'] = round_scores(values, 2)
+        result['viability_rating'] = self._viability_rating_array(weighted_score)
+        result['scalability_rating'] = self._scalability_rating_array(scores)
+        if details:
+            matrix = self.recommendation_matrix(frame, scores)
+            risks = []
+            for row in range(len(frame)):
+                risks.append(self._assess_risks({category: float(values[row]) for category, values in scores.items()}))
+            result['recommendations'] = [matrix.expand(row) for row in range(len(frame))]
+            result['risk_assessment'] = risks
+        if self.peer_index is not None:
+            scored = frame.assign(**{f'{category}_score': values for category, values in scores.items()})
+            result = result.join(self.peer_index.rank_frame(scored))
+        return result
+
+    def generate_comprehensive_reports(self, records):
+        import pandas as pd
+
+        # generate_comprehensive_report for many input dicts at once, through
+        # the vectorized score_batch path
+        frame = pd.DataFrame.from_records(records)
+        scored = self.score_batch(frame, details=True).to_dict('records')
+        reports = []
+        for data, row in zip(records, scored):
+            report = {
+                'overall_score': row['overall_score'],
+                'category_scores': {category: row[f'{category}_score'] for category in self.plan.categories},
+                'viability_rating': row['viability_rating'],
+                'scalability_rating': row['scalability_rating'],
+                'recommendations': row['recommendations'],
+                'risk_assessment': row['risk_assessment']
+            }
+            if self.peer_index is not None:
+                report['peer_percentiles'] = {
+                    'peer_group': self.peer_index.industries[self.peer_index._group(data.get('industry'))],
+                    # Unranked (missing, None or NaN) inputs are left out, as in rank_record
+                    'metrics': {field: row[f'{field}_percentile'] for field in self.peer_index.columns
+                                if not np.isnan(row.get(f'{field}_percentile', np.nan))},
+                    'categories': {category: row[f'{category}_score_percentile'] for category in self.plan.categories
+                                   if f'{category}_score_percentile' in row}
+                }
+            reports.append(report)
+        return reports
+
+    def score_compact(self, frame):
+        # score_batch(frame, details=True) as a ReportBatch, built straight
+        # from the score arrays; report i decodes to the same dict
+        # generate_comprehensive_report returns for row i
+        codec = self.report_codec
+        scores = self.plan.score_frame(frame)
+        weighted_score = self._weighted_score(scores)
+        n = len(frame)
+        values = np.column_stack([scores[category] for category in codec.categories])
+        overall = fixed_array(round_scores(weighted_score, 2), 100)
+        category_scores = fixed_array(round_scores(values, 2), 100)
+
+        matrix = self.recommendation_matrix(frame, scores)
+        rows, columns = np.nonzero(matrix.fired[:, codec.rule_order])
+        rules = codec.rule_order[columns]
+        confidences = matrix.quality[rows, codec.rule_category[rules]] * codec.rule_weight[rules]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+        flagged = (matrix.flagged << np.arange(len(codec.categories), dtype=np.uint8)).sum(axis=1)
+
+        risk_levels = np.select([values < 5, values < 7],
+                                [RISK_LEVELS.index("High"), RISK_LEVELS.index("Moderate")], 0)
+        risk_tenths = fixed_array(np.where(risk_levels > 0, round_scores(values, 1), 0), 10)
+
+        peer_group = np.full(n, MISSING, dtype=np.int16)
+        peer_metrics = np.full((n, len(codec.peer_columns)), MISSING, dtype=np.int16)
+        peer_categories = np.full((n, len(codec.categories)), MISSING, dtype=np.int16)
+        if self.peer_index is not None:
+            scored = frame.assign(**{f'{category}_score': values for category, values in scores.items()})
+            ranks = self.peer_index.rank_frame(scored)
+            industries = frame['industry'] if 'industry' in frame else [None] * n
+            peer_group[:] = [self.peer_index._group(industry) for industry in industries]
+            for j, column in enumerate(codec.peer_columns):
+                if column in frame and f'{column}_percentile' in ranks:
+                    percentiles = ranks[f'{column}_percentile'].to_numpy()
+                    peer_metrics[:, j] = np.where(np.isnan(percentiles), MISSING,
+                                                  np.rint(np.nan_to_num(percentiles) * 10))
+            for c, category in enumerate(codec.categories):
+                if f'{category}_score_percentile' in ranks:
+                    peer_categories[:, c] = np.rint(ranks[f'{category}_score_percentile'].to_numpy() * 10)
+
+        return ReportBatch(
+            codec, overall, category_scores,
+            self._viability_code_array(weighted_score).astype(np.uint8),
+            self._scalability_code_array(scores).astype(np.uint8), flagged.astype(np.uint8),
+            offsets.astype(np.int64), rules.astype(np.int16), confidences.astype(np.float64),
+            risk_levels.astype(np.uint8), risk_tenths, peer_group, peer_metrics, peer_categories
+        )
+
+    def _get_viability_rating(self, score):
+        for rating, threshold in self.VIABILITY_RATINGS:
+            if score >= threshold: return rating
+        return "Poor"
+
+    def _get_scalability_rating(self, scores):
+        key_scalability_factors = [
+            scores['operational_efficiency'],
+            scores['product_delivery'],
+            scores['financial_health']
+        ]
+        avg_scalability = sum(key_scalability_factors) / len(key_scalability_factors)
+
+        for rating, threshold in self.SCALABILITY_RATINGS:
+            if avg_scalability >= threshold: return rating
+        return "Poor Scalability"
+
+    # Rating codes index VIABILITY_RATINGS / SCALABILITY_RATINGS, with one
+    # past the end for the "Poor" rating
+    def _viability_code_array(self, scores):
+        return np.select([scores >= threshold for _, threshold in self.VIABILITY_RATINGS],
+                         np.arange(len(self.VIABILITY_RATINGS), dtype=np.uint8),
+                         len(self.VIABILITY_RATINGS))
+
+    def _scalability_code_array(self, scores):
+        scalability = (scores['operational_efficiency'] + scores['product_delivery']
+                       + scores['financial_health']) / 3
+        return np.select([scalability >= threshold for _, threshold in self.SCALABILITY_RATINGS],
+                         np.arange(len(self.SCALABILITY_RATINGS), dtype=np.uint8),
+                         len(self.SCALABILITY_RATINGS))
+
+    def _viability_rating_array(self, scores):
+        return np.array(self.report_codec.viability_ratings)[self._viability_code_array(scores)]
+
+    def _scalability_rating_array(self, scores):
+        return np.array(self.report_codec.scalability_ratings)[self._scalability_code_array(scores)]
+
+    def _generate_recommendations(self, scores, data):
+        recommendations = []
+        for category, score in scores.items():
+            if score < 6:
+                recommendations.append(self._get_category_recommendation(category, score, data))
+        return recommendations
+
+    def _get_category_recommendation(self, category, score, data):
+        analyzer = self.recommendation_analyzer
+        quality_score = analyzer.calculate_data_quality_score(data, category)
+
+        # Format recommendations with confidence scores
+        formatted_recommendations = []
+        for index in self.recommendation_rules.evaluate(data, category):
+            formatted_rec = analyzer.format_recommendation(
+                self.recommendation_rules.texts[index],
+                quality_score * (1.2 if self.recommendation_rules.priorities[index] == 'high' else 1.0)
+            )
+            formatted_recommendations.append(formatted_rec)
+
+        return formatted_recommendations
+
+    def recommendation_matrix(self, frame, scores):
+        categories = list(scores)
+        flagged = np.column_stack([scores[category] < 6 for category in categories])
+        quality = np.column_stack([
+            self.recommendation_analyzer.calculate_data_quality_batch(frame, category)[0]
+            for category in categories
+        ])
+        return RecommendationMatrix(self.recommendation_rules, categories,
+                                    self.recommendation_rules.evaluate_frame(frame),
+                                    flagged, quality, self.recommendation_analyzer)
+
+    def _assess_risks(self, scores):
+        risks = []
+        for category, score in scores.items():
+            risk = self._assess_category_risk(category, score)
+            if risk:
+                risks.append(risk)
+        return risks if risks else ["No significant risks identified"]
+
+    def _assess_category_risk(self, category, score):
+        if score < 5:
+            return f"High risk in {category.replace('_', ' ')}: Score {score:.1f}/10"
+        elif score < 7:
+            return f"Moderate risk in {category.replace('_', ' ')}: Score {score:.1f}/10"
+        return None
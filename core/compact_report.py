@@ -0,0 +1,271 @@
+import itertools
+import re
+
+import numpy as np
+
+# Risk level codes; 0 is a category without a risk line
+RISK_LEVELS = (None, "Moderate", "High")
+NO_RISKS = "No significant risks identified"
+RISK_PATTERN = re.compile(r'(High|Moderate) risk in (.+): Score (-?\d+\.\d)/10')
+# Fixed-point entries (scores in hundredths, percentiles in tenths) that are
+# absent, e.g. a peer percentile for an input the company didn't provide
+MISSING = -1
+
+
+# Every fixed-point entry is stored as int16
+FIXED_RANGE = (np.iinfo(np.int16).min, np.iinfo(np.int16).max)
+
+
+def _fixed(value, scale):
+    units = int(round(value * scale))
+    if units / scale != value:
+        raise ValueError(f"{value!r} doesn't fit in 1/{scale} units")
+    if not FIXED_RANGE[0] <= units <= FIXED_RANGE[1]:
+        raise ValueError(f"{value!r} is outside the range a compact report can hold")
+    return units
+
+
+def fixed_array(values, scale):
+    # Values already rounded to 1/scale as int16 units; raises rather than
+    # letting out-of-range scores (from inputs far outside FIELD_RANGES) wrap
+    units = np.rint(np.asarray(values, dtype=float) * scale)
+    outside = (units < FIXED_RANGE[0]) | (units > FIXED_RANGE[1])
+    if outside.any():
+        raise ValueError(f"{int(outside.sum())} value(s) such as {units[outside][0] / scale!r} are outside "
+                         f"the range a compact report can hold")
+    return units.astype(np.int16)
+
+
+class CompactReport:
+    # One report in compact form: scores as hundredths, ratings and risk
+    # levels as codes, recommendations as (rule index, confidence) pairs
+    # grouped by flagged category. Text is built from the codec on demand
+    __slots__ = ('codec', 'overall', 'category_scores', 'viability', 'scalability', 'flagged', 'rules',
+                 'confidences', 'risk_levels', 'risk_tenths', 'peer_group', 'peer_metrics', 'peer_categories')
+
+    def __init__(self, codec, overall, category_scores, viability, scalability, flagged, rules, confidences,
+                 risk_levels, risk_tenths, peer_group=MISSING, peer_metrics=(), peer_categories=()):
+        self.codec = codec
+        self.overall = overall
+        self.category_scores = category_scores
+        self.viability = viability
+        self.scalability = scalability
+        self.flagged = flagged
+        self.rules = rules
+        self.confidences = confidences
+        self.risk_levels = risk_levels
+        self.risk_tenths = risk_tenths
+        self.peer_group = peer_group
+        self.peer_metrics = peer_metrics
+        self.peer_categories = peer_categories
+
+    @property
+    def overall_score(self):
+        return self.overall / 100
+
+    @property
+    def viability_rating(self):
+        return self.codec.viability_ratings[self.viability]
+
+    @property
+    def scalability_rating(self):
+        return self.codec.scalability_ratings[self.scalability]
+
+    def rule_ids(self):
+        return [self.codec.rules.rule_ids[rule] for rule in self.rules]
+
+    def to_dict(self):
+        return self.codec.decode(self)
+
+
+class ReportCodec:
+    # Converts between report dicts and CompactReport for one analyzer's
+    # categories, rules, ratings and peer index
+    def __init__(self, analyzer):
+        self.categories = tuple(analyzer.score_weights)
+        self.viability_ratings = tuple(rating for rating, _ in analyzer.VIABILITY_RATINGS) + ("Poor",)
+        self.scalability_ratings = (tuple(rating for rating, _ in analyzer.SCALABILITY_RATINGS)
+                                    + ("Poor Scalability",))
+        self.rules = analyzer.recommendation_rules
+        self.recommendation_analyzer = analyzer.recommendation_analyzer
+        self.rule_category = np.array([self.categories.index(category) for category in self.rules.categories],
+                                      dtype=np.intp)
+        self.rule_weight = np.array([1.2 if priority == 'high' else 1.0 for priority in self.rules.priorities])
+        # Rules in the order a report lists them: by category, then rule index
+        self.rule_order = np.lexsort((np.arange(len(self.rule_category)), self.rule_category))
+        self.risk_categories = {category.replace('_', ' '): c for c, category in enumerate(self.categories)}
+        self.peer_index = analyzer.peer_index
+        self.peer_groups = self.peer_index.industries if self.peer_index is not None else ()
+        self.peer_columns = self.peer_index.columns if self.peer_index is not None else ()
+
+    def encode(self, report):
+        scores = report['category_scores']
+        rules, confidences = [], []
+        for recommendations in report['recommendations']:
+            for recommendation in recommendations:
+                rules.append(self.rules.text_index[recommendation['text']])
+                confidences.append(recommendation['confidence_score'])
+        flagged = self._flagged_mask(report['recommendations'], rules, scores)
+
+        risk_levels = [0] * len(self.categories)
+        risk_tenths = [0] * len(self.categories)
+        for risk in report['risk_assessment']:
+            if risk == NO_RISKS:
+                continue
+            match = RISK_PATTERN.fullmatch(risk)
+            if match is None:
+                raise ValueError(f"Unrecognized risk line: {risk!r}")
+            c = self.risk_categories[match.group(2)]
+            risk_levels[c] = RISK_LEVELS.index(match.group(1))
+            risk_tenths[c] = _fixed(float(match.group(3)), 10)
+
+        compact = CompactReport(
+            self, _fixed(report['overall_score'], 100),
+            tuple(_fixed(scores[category], 100) for category in self.categories),
+            self.viability_ratings.index(report['viability_rating']),
+            self.scalability_ratings.index(report['scalability_rating']),
+            flagged, tuple(rules), tuple(confidences), tuple(risk_levels), tuple(risk_tenths)
+        )
+        peers = report.get('peer_percentiles')
+        if peers is not None:
+            if self.peer_index is None:
+                raise ValueError("Report has peer percentiles but the analyzer has no peer index")
+            compact.peer_group = self.peer_groups.index(peers['peer_group'])
+            compact.peer_metrics = tuple(_fixed(peers['metrics'][column], 10) if column in peers['metrics']
+                                         else MISSING for column in self.peer_columns)
+            compact.peer_categories = tuple(_fixed(peers['categories'][category], 10)
+                                            if category in peers['categories'] else MISSING
+                                            for category in self.categories)
+        return compact
+
+    def _flagged_mask(self, recommendations, rules, scores):
+        # Each inner list belongs to one flagged category (unrounded score
+        # below 6), in category order. A category shown as exactly 6.0 may
+        # have been just under it, so those are tried too, keeping the first
+        # assignment whose non-empty lists match their rules' categories
+        below = [c for c, category in enumerate(self.categories) if scores[category] < 6]
+        boundary = [c for c, category in enumerate(self.categories) if scores[category] == 6]
+        lists = []
+        position = 0
+        for recommendations_c in recommendations:
+            lists.append(rules[position:position + len(recommendations_c)])
+            position += len(recommendations_c)
+        extra = len(lists) - len(below)
+        if 0 <= extra <= len(boundary):
+            for chosen in itertools.combinations(boundary, extra):
+                flagged = sorted(below + list(chosen))
+                if all(self.rule_category[rule] == c for c, rules_c in zip(flagged, lists) for rule in rules_c):
+                    return sum(1 << c for c in flagged)
+        raise ValueError("Recommendations don't line up with the categories scored below 6")
+
+    def decode(self, compact):
+        category_scores = {category: score / 100 for category, score in zip(self.categories, compact.category_scores)}
+        recommendations = []
+        position = 0
+        for c in range(len(self.categories)):
+            if not compact.flagged >> c & 1:
+                continue
+            formatted = []
+            while position < len(compact.rules) and self.rule_category[compact.rules[position]] == c:
+                formatted.append(self.recommendation_analyzer.format_recommendation(
+                    self.rules.texts[compact.rules[position]], compact.confidences[position]))
+                position += 1
+            recommendations.append(formatted)
+        risks = [f"{RISK_LEVELS[level]} risk in {category.replace('_', ' ')}: Score {tenths / 10:.1f}/10"
+                 for category, level, tenths in zip(self.categories, compact.risk_levels, compact.risk_tenths)
+                 if level]
+
+        report = {
+            'overall_score': compact.overall / 100,
+            'category_scores': category_scores,
+            'viability_rating': compact.viability_rating,
+            'scalability_rating': compact.scalability_rating,
+            'recommendations': recommendations,
+            'risk_assessment': risks if risks else [NO_RISKS]
+        }
+        if compact.peer_group != MISSING:
+            report['peer_percentiles'] = {
+                'peer_group': self.peer_groups[compact.peer_group],
+                'metrics': {column: value / 10 for column, value in zip(self.peer_columns, compact.peer_metrics)
+                            if value != MISSING},
+                'categories': {category: value / 10 for category, value in zip(self.categories, compact.peer_categories)
+                               if value != MISSING}
+            }
+        return report
+
+
+class ReportBatch:
+    # Struct-of-arrays for many compact reports. Per report: int16 scores in
+    # hundredths, uint8 rating codes and flagged-category bitmask, and per
+    # category uint8 risk levels and int16 risk scores in tenths.
+    # Recommendations of report i are rules[offsets[i]:offsets[i + 1]] with
+    # their float64 confidences. Peer percentiles are int16 tenths, MISSING
+    # where absent, with peer_group MISSING for reports without them
+    def __init__(self, codec, overall, category_scores, viability, scalability, flagged, offsets, rules,
+                 confidences, risk_levels, risk_tenths, peer_group, peer_metrics, peer_categories):
+        self.codec = codec
+        self.overall = overall
+        self.category_scores = category_scores
+        self.viability = viability
+        self.scalability = scalability
+        self.flagged = flagged
+        self.offsets = offsets
+        self.rules = rules
+        self.confidences = confidences
+        self.risk_levels = risk_levels
+        self.risk_tenths = risk_tenths
+        self.peer_group = peer_group
+        self.peer_metrics = peer_metrics
+        self.peer_categories = peer_categories
+
+    @classmethod
+    def from_reports(cls, codec, reports):
+        compact = [report if isinstance(report, CompactReport) else codec.encode(report) for report in reports]
+        n, k, m = len(compact), len(codec.categories), len(codec.peer_columns)
+        lengths = np.array([len(report.rules) for report in compact], dtype=np.int64)
+
+        def column(attribute, dtype, width=None):
+            values = [getattr(report, attribute) for report in compact]
+            if width is not None:
+                values = [value or (MISSING,) * width for value in values]
+                return np.array(values, dtype=dtype).reshape(n, width)
+            return np.array(values, dtype=dtype)
+
+        return cls(
+            codec, column('overall', np.int16), column('category_scores', np.int16, k),
+            column('viability', np.uint8), column('scalability', np.uint8), column('flagged', np.uint8),
+            np.concatenate([[0], np.cumsum(lengths)]),
+            np.array([rule for report in compact for rule in report.rules], dtype=np.int16),
+            np.array([value for report in compact for value in report.confidences], dtype=np.float64),
+            column('risk_levels', np.uint8, k), column('risk_tenths', np.int16, k),
+            column('peer_group', np.int16), column('peer_metrics', np.int16, m),
+            column('peer_categories', np.int16, k)
+        )
+
+    def __len__(self):
+        return len(self.overall)
+
+    def __getitem__(self, i):
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return CompactReport(
+            self.codec, int(self.overall[i]), tuple(self.category_scores[i].tolist()),
+            int(self.viability[i]), int(self.scalability[i]), int(self.flagged[i]),
+            tuple(self.rules[start:end].tolist()), tuple(self.confidences[start:end].tolist()),
+            tuple(self.risk_levels[i].tolist()), tuple(self.risk_tenths[i].tolist()),
+            int(self.peer_group[i]), tuple(self.peer_metrics[i].tolist()), tuple(self.peer_categories[i].tolist())
+        )
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in (
+            'overall', 'category_scores', 'viability', 'scalability', 'flagged', 'offsets', 'rules',
+            'confidences', 'risk_levels', 'risk_tenths', 'peer_group', 'peer_metrics', 'peer_categories'))
+
+    def overall_scores(self):
+        return self.overall / 100
+
+    def viability_ratings(self):
+        return np.array(self.codec.viability_ratings)[self.viability]
+
+    def to_dicts(self):
+        return [self.codec.decode(self[i]) for i in range(len(self))]
@@ -0,0 +1,144 @@
+import numpy as np
+
+
+def present(data, metric):
+    # None and NaN count as missing, like the null cells of the batch path
+    value = data.get(metric)
+    return value is not None and value == value
+
+
+class RecommendationAnalyzer:
+    REQUIRED_METRICS = {
+        'marketing': {
+            'primary': ['market_share', 'customer_acquisition_cost', 'marketing_roi'],
+            'secondary': ['brand_recognition', 'market_growth', 'competitive_advantage'],
+            'supporting': ['total_addressable_market', 'conversion_rate']
+        },
+        'sales': {
+            'primary': ['revenue_growth', 'pipeline_conversion', 'average_deal_size'],
+            'secondary': ['recurring_revenue_percentage', 'sales_cycle_length'],
+            'supporting': ['customer_retention', 'customer_satisfaction']
+        }
+    }
+    QUALITY_WEIGHTS = {'completeness': 0.4, 'accuracy': 0.4, 'reliability': 0.2}
+
+    def __init__(self):
+        self.confidence_thresholds = {
+            'high': 0.8,
+            'medium': 0.5,
+            'low': 0.3
+        }
+
+    def calculate_data_quality_score(self, data, category):
+        metrics = self.REQUIRED_METRICS.get(category, {})
+        scores = {
+            'completeness': self._calculate_completeness(data, metrics),
+            'accuracy': self._calculate_accuracy(data, metrics),
+            'reliability': self._calculate_reliability(data, category)
+        }
+
+        return sum(scores[k] * self.QUALITY_WEIGHTS[k] for k in scores)
+
+    def calculate_data_quality_batch(self, frame, category):
+        # Null cells count as missing metrics, i.e. each row is scored like a
+        # dict that omits its null keys
+        metrics = self.REQUIRED_METRICS.get(category, {})
+        n = len(frame)
+        present = {m: frame[m].notna().to_numpy() if m in frame else np.zeros(n, dtype=bool)
+                   for m in metrics.get('primary', []) + metrics.get('secondary', [])}
+
+        completeness = 0
+        for tier, weight in (('primary', 0.6), ('secondary', 0.4)):
+            tier_metrics = metrics.get(tier, [])
+            count = sum((present[m].astype(np.int64) for m in tier_metrics), np.zeros(n, dtype=np.int64))
+            tier_score = count / len(tier_metrics) if tier_metrics else np.zeros(n)
+            completeness = completeness + tier_score * weight
+
+        accuracy = np.zeros(n)
+        for m in present:
+            accuracy = np.where(present[m], 1.0, accuracy)
+
+        if 'data_source' in frame:
+            automatic = (frame['data_source'] == 'automatic').to_numpy()
+        else:
+            automatic = np.zeros(n, dtype=bool)
+        if 'data_age_months' in frame:
+            data_age = frame['data_age_months'].fillna(12).to_numpy(dtype=float)
+        else:
+            data_age = np.full(n, 12.0)
+        reliability = np.where(automatic, 0.7, 0.3) * np.maximum(0, 1 - (data_age / 12))
+
+        scores = {'completeness': completeness, 'accuracy': accuracy, 'reliability': reliability}
+        quality = 0
+        for k in scores:
+            quality = quality + scores[k] * self.QUALITY_WEIGHTS[k]
+        return quality, self.get_confidence_levels(quality)
+
+    def _calculate_completeness(self, data, metrics):
+        primary_count = sum(1 for m in metrics.get('primary', []) if present(data, m))
+        secondary_count = sum(1 for m in metrics.get('secondary', []) if present(data, m))
+        
+        primary_weight = 0.6
+        secondary_weight = 0.4
+        
+        primary_score = primary_count / len(metrics.get('primary', [])) if metrics.get('primary') else 0
+        secondary_score = secondary_count / len(metrics.get('secondary', [])) if metrics.get('secondary') else 0
+        
+        return (primary_score * primary_weight) + (secondary_score * secondary_weight)
+
+    def _calculate_accuracy(self, data, metrics):
+        accuracy_score = 0
+        total_metrics = 0
+        
+        for metric in metrics.get('primary', []) + metrics.get('secondary', []):
+            if present(data, metric):
+                total_metrics += 1
+                accuracy_score += 1
+                    
+        return accuracy_score / total_metrics if total_metrics > 0 else 0
+
+    def _calculate_reliability(self, data, category):
+        reliability_score = 0
+        data_source = data.get('data_source', 'manual')
+        reliability_score += 0.7 if data_source == 'automatic' else 0.3
+        
+        data_age = data['data_age_months'] if present(data, 'data_age_months') else 12
+        age_factor = max(0, 1 - (data_age / 12))
+        reliability_score *= age_factor
+        
+        return reliability_score
+
+    def get_confidence_level(self, quality_score):
+        if quality_score >= self.confidence_thresholds['high']:
+            return 'High'
+        elif quality_score >= self.confidence_thresholds['medium']:
+            return 'Medium'
+        elif quality_score >= self.confidence_thresholds['low']:
+            return 'Low'
+        else:
+            return 'Very Low'
+
+    def get_confidence_levels(self, quality_scores):
+        return np.select(
+            [quality_scores >= self.confidence_thresholds['high'],
+             quality_scores >= self.confidence_thresholds['medium'],
+             quality_scores >= self.confidence_thresholds['low']],
+            ['High', 'Medium', 'Low'],
+            'Very Low'
+        )
+
+    def format_recommendation(self, recommendation, confidence_score):
+        confidence_level = self.get_confidence_level(confidence_score)
+        confidence_indicator = {
+            'High': '🟢',
+            'Medium': '🟡',
+            'Low': '🟠',
+            'Very Low': '🔴'
+        }
+        
+        return {
+            'text': recommendation,
+            'confidence_level': confidence_level,
+            'confidence_score': confidence_score,
+            'indicator': confidence_indicator[confidence_level]
+        }
@@ -0,0 +1,107 @@
+class ReportState:
+    def __init__(self, data, scores, recommendations, risks, report):
+        self.data = data
+        # Unrounded category scores; the report only carries rounded ones
+        self.scores = scores
+        # Per-category recommendation list / risk text (None when not triggered)
+        self.recommendations = recommendations
+        self.risks = risks
+        self.report = report
+
+
+class IncrementalEvaluator:
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.field_categories = analyzer.plan.field_categories
+        # Fields a category's recommendations read besides its score: rule
+        # conditions and the data-quality metrics
+        self.recommendation_fields = {}
+        for field, categories in analyzer.recommendation_rules.field_categories.items():
+            self.recommendation_fields.setdefault(field, set()).update(categories)
+        for category, tiers in analyzer.recommendation_analyzer.REQUIRED_METRICS.items():
+            for field in tiers.get('primary', []) + tiers.get('secondary', []):
+                self.recommendation_fields.setdefault(field, set()).add(category)
+
+    def evaluate(self, data):
+        data = dict(data)
+        scores = {category: analyze(data) for category, analyze in self.analyzer.category_analyzers.items()}
+        recommendations = {category: self._recommendation(category, score, data)
+                           for category, score in scores.items()}
+        risks = {category: self.analyzer._assess_category_risk(category, score)
+                 for category, score in scores.items()}
+        peer_percentiles = None
+        if self.analyzer.peer_index is not None:
+            peer_percentiles = self.analyzer.peer_index.rank_record(data, scores)
+        return self._state(data, scores, recommendations, risks, peer_percentiles)
+
+    def affected_categories(self, changed_fields):
+        affected = set()
+        for field in changed_fields:
+            affected |= self.field_categories.get(field, set())
+        return affected
+
+    def update(self, previous, data, changed_fields=None):
+        data = dict(data)
+        if changed_fields is None:
+            changed_fields = {field for field in set(previous.data) | set(data)
+                              if previous.data.get(field) != data.get(field)}
+        if not changed_fields:
+            return previous
+
+        affected = self.affected_categories(changed_fields)
+        scores = dict(previous.scores)
+        for category in affected:
+            scores[category] = self.analyzer.category_analyzers[category](data)
+        changed = {category for category in affected if scores[category] != previous.scores[category]}
+        # Fields outside the scoring plan (e.g. industry) only feed the
+        # derived outputs, which are then rebuilt for every category
+        context_changed = any(field not in self.field_categories for field in changed_fields)
+
+        recommendations = dict(previous.recommendations)
+        stale = set(scores) if context_changed else changed | {
+            category for field in changed_fields for category in self.recommendation_fields.get(field, ())
+        }
+        for category in stale:
+            recommendations[category] = self._recommendation(category, scores[category], data)
+        risks = dict(previous.risks)
+        for category in changed:
+            risks[category] = self.analyzer._assess_category_risk(category, scores[category])
+
+        peer_percentiles = previous.report.get('peer_percentiles')
+        if peer_percentiles is not None and context_changed:
+            peer_percentiles = self.analyzer.peer_index.rank_record(data, scores)
+        elif peer_percentiles is not None:
+            ranked = self.analyzer.peer_index.rank_record(
+                {'industry': data.get('industry'), **{field: data.get(field) for field in changed_fields}},
+                {category: scores[category] for category in changed}
+            )
+            # Fields removed or set to None drop out of the metrics
+            metrics = {field: rank for field, rank in peer_percentiles['metrics'].items()
+                       if field not in changed_fields}
+            peer_percentiles = {
+                'peer_group': peer_percentiles['peer_group'],
+                'metrics': {**metrics, **ranked['metrics']},
+                'categories': {**peer_percentiles['categories'], **ranked['categories']}
+            }
+        return self._state(data, scores, recommendations, risks, peer_percentiles)
+
+    def _recommendation(self, category, score, data):
+        if score < 6:
+            return self.analyzer._get_category_recommendation(category, score, data)
+        return None
+
+    def _state(self, data, scores, recommendations, risks, peer_percentiles):
+        # Assembled exactly as BusinessAnalysisTool.generate_comprehensive_report
+        weighted_score = self.analyzer._weighted_score(scores)
+        risk_assessment = [risk for risk in risks.values() if risk]
+        report = {
+            'overall_score': round(weighted_score, 2),
+            'category_scores': {k: round(v, 2) for k, v in scores.items()},
+            'viability_rating': self.analyzer._get_viability_rating(weighted_score),
+            'scalability_rating': self.analyzer._get_scalability_rating(scores),
+            'recommendations': [rec for rec in recommendations.values() if rec is not None],
+            'risk_assessment': risk_assessment or ["No significant risks identified"]
+        }
+        if peer_percentiles is not None:
+            report['peer_percentiles'] = peer_percentiles
+        return ReportState(data, scores, recommendations, risks, report)
@@ -0,0 +1,56 @@
+import csv
+import os
+from functools import lru_cache
+
+import numpy as np
+
+BENCHMARKS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data',
+                               'industry_benchmarks.csv')
+
+
+class IndustryBenchmarks:
+    def __init__(self, industries, metrics, values):
+        self.industries = tuple(industries)
+        self.metrics = tuple(metrics)
+        self.industry_index = {industry: i for i, industry in enumerate(self.industries)}
+        self.metric_index = {metric: j for j, metric in enumerate(self.metrics)}
+        # industry x metric, NaN where the industry has no benchmark
+        self.values = np.asarray(values, dtype=float)
+
+    @classmethod
+    def from_csv(cls, path=BENCHMARKS_PATH):
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = [row for row in reader if row]
+        values = [[float(cell) if cell else np.nan for cell in row[1:]] for row in rows]
+        return cls([row[0] for row in rows], header[1:], values)
+
+    def get(self, industry, metric, default=0):
+        i = self.industry_index.get(industry)
+        j = self.metric_index.get(metric)
+        if i is None or j is None or np.isnan(self.values[i, j]):
+            return default
+        return self.values[i, j].item()
+
+    def lookup_many(self, industries, metric, default=0):
+        industries = np.asarray(industries, dtype=object)
+        if metric not in self.metric_index:
+            return np.full(len(industries), float(default))
+        column = np.append(self.values[:, self.metric_index[metric]], np.nan)
+        unique, inverse = np.unique(industries.astype(str), return_inverse=True)
+        rows = np.array([self.industry_index.get(industry, -1) for industry in unique], dtype=np.intp)
+        result = column[rows[inverse]]
+        return np.where(np.isnan(result), default, result)
+
+    def for_industry(self, industry):
+        i = self.industry_index.get(industry)
+        if i is None:
+            return {}
+        return {metric: self.values[i, j].item()
+                for j, metric in enumerate(self.metrics) if not np.isnan(self.values[i, j])}
+
+
+@lru_cache(maxsize=None)
+def get_benchmarks(path=BENCHMARKS_PATH):
+    return IndustryBenchmarks.from_csv(path)
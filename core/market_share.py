@@ -0,0 +1,173 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ALL_INDUSTRIES = '__all__'
+# Where market_metrics looks for an estimator fitted by this module's CLI
+MARKET_SHARE_PATH = os.environ.get(
+    'MARKET_SHARE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'market_share.npz'))
+
+SIZE_CLASSES = (
+    "Startup (1-10 employees)",
+    "Small (11-50 employees)",
+    "Medium (51-200 employees)",
+    "Large (201+ employees)"
+)
+# Largest headcount of each size class but the last
+SIZE_LIMITS = (10, 50, 200)
+# Company age bins in years: [0, 1), [1, 2), ... [30, inf)
+AGE_EDGES = (0, 1, 2, 3, 5, 8, 12, 20, 30)
+MIN_COUNT = 30
+
+
+def size_classes(employees):
+    return np.searchsorted(SIZE_LIMITS, np.asarray(employees, dtype=float), side='left')
+
+
+def age_bins(ages, edges=AGE_EDGES):
+    return np.clip(np.searchsorted(edges, np.asarray(ages, dtype=float), side='right') - 1, 0, len(edges) - 1)
+
+
+def grouped_medians(keys, values, groups):
+    # Median and count of values per integer key in [0, groups), from one
+    # sort by (key, value); keys without values get NaN
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    counts = np.bincount(keys, minlength=groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    medians = np.full(groups, np.nan)
+    present = counts > 0
+    lower = starts[present] + (counts[present] - 1) // 2
+    upper = starts[present] + counts[present] // 2
+    medians[present] = (values[lower] + values[upper]) / 2
+    return medians, counts
+
+
+class MarketShareEstimator:
+    # Median market share (%) of peers by industry x size class x age bin,
+    # fitted from a peer dataset and stored as one dense table. Cells with
+    # fewer than min_count peers fall back, at fit time, to the same size and
+    # age across all industries, then to the size class alone, then to every
+    # peer, so estimating is a single table lookup
+    def __init__(self, industries, age_edges, table, counts):
+        self.industries = tuple(industries)
+        self.age_edges = tuple(age_edges)
+        self.table = np.asarray(table, dtype=float)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.industry_index = {industry: i for i, industry in enumerate(self.industries)}
+
+    @classmethod
+    def fit(cls, industries, sizes, ages, shares, age_edges=AGE_EDGES, min_count=MIN_COUNT):
+        # sizes: SIZE_CLASSES indices (see size_classes); rows with a missing
+        # age or share are ignored
+        shares = np.asarray(shares, dtype=float)
+        ages = np.asarray(ages, dtype=float)
+        sizes = np.asarray(sizes, dtype=np.int64)
+        valid = ~np.isnan(shares) & ~np.isnan(ages) & (sizes >= 0) & (sizes < len(SIZE_CLASSES))
+        names, groups = np.unique(np.asarray(industries, dtype=str)[valid], return_inverse=True)
+        shares, sizes, bins = shares[valid], sizes[valid], age_bins(ages[valid], age_edges)
+        # Rows without an industry (ALL_INDUSTRIES) only count towards the pooled levels
+        named = names != ALL_INDUSTRIES
+        groups = groups.ravel()
+        rows = named[groups]
+        groups = (np.cumsum(named) - 1)[groups]
+        names = names[named].tolist()
+
+        n_sizes, n_ages = len(SIZE_CLASSES), len(age_edges)
+        cell = sizes * n_ages + bins
+        by_cell, cell_counts = grouped_medians(cell, shares, n_sizes * n_ages)
+        by_size, size_counts = grouped_medians(sizes, shares, n_sizes)
+        overall = float(np.median(shares)) if len(shares) else np.nan
+
+        # Fallbacks, coarsest first so each finer level overwrites it where it has enough peers
+        table = np.full((len(names) + 1, n_sizes, n_ages), overall)
+        enough = size_counts >= min_count
+        table[:, enough, :] = by_size[enough][None, :, None]
+        by_cell, cell_counts = by_cell.reshape(n_sizes, n_ages), cell_counts.reshape(n_sizes, n_ages)
+        table[:] = np.where(cell_counts >= min_count, by_cell, table)
+        # counts: peers in the cell itself, whichever level its value came from
+        counts = np.empty(table.shape, dtype=np.int64)
+        counts[-1] = cell_counts
+        if names:
+            by_industry, industry_counts = grouped_medians(groups[rows] * n_sizes * n_ages + cell[rows], shares[rows],
+                                                           len(names) * n_sizes * n_ages)
+            by_industry = by_industry.reshape(len(names), n_sizes, n_ages)
+            counts[:-1] = industry_counts.reshape(len(names), n_sizes, n_ages)
+            table[:-1] = np.where(counts[:-1] >= min_count, by_industry, table[:-1])
+        return cls(names + [ALL_INDUSTRIES], age_edges, table, counts)
+
+    @classmethod
+    def fit_frame(cls, frame, industry_column='industry', size_column='company_size', age_column='company_age',
+                  share_column='market_share', **options):
+        # size_column holds SIZE_CLASSES labels, or headcounts if numeric
+        import pandas as pd
+
+        sizes = frame[size_column]
+        if pd.api.types.is_numeric_dtype(sizes):
+            sizes = size_classes(sizes.fillna(-1).to_numpy())
+            sizes[frame[size_column].isna().to_numpy()] = -1
+        else:
+            lookup = {label: i for i, label in enumerate(SIZE_CLASSES)}
+            sizes = sizes.map(lookup).fillna(-1).to_numpy(dtype=np.int64)
+        industries = (frame[industry_column].fillna(ALL_INDUSTRIES).astype(str).to_numpy()
+                      if industry_column in frame else np.full(len(frame), ALL_INDUSTRIES))
+        return cls.fit(industries, sizes, pd.to_numeric(frame[age_column], errors='coerce').to_numpy(dtype=float),
+                       pd.to_numeric(frame[share_column], errors='coerce').to_numpy(dtype=float), **options)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as saved:
+            return cls(saved['industries'].tolist(), saved['age_edges'].tolist(), saved['table'], saved['counts'])
+
+    def save(self, path):
+        np.savez_compressed(path, industries=np.array(self.industries), age_edges=np.array(self.age_edges),
+                            table=self.table, counts=self.counts)
+
+    def _group(self, industry):
+        return self.industry_index.get(industry, self.industry_index[ALL_INDUSTRIES])
+
+    def estimate(self, age, size, industry=None):
+        # size: a SIZE_CLASSES label or index
+        size = SIZE_CLASSES.index(size) if isinstance(size, str) else int(size)
+        return float(self.table[self._group(industry), size, age_bins(age, self.age_edges)])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Fit a market share estimator from a peer dataset")
+    parser.add_argument('input', help="Peer .csv or .parquet file, one row per company")
+    parser.add_argument('output', help="Where to write the estimator (.npz)")
+    parser.add_argument('--industry-column', default='industry')
+    parser.add_argument('--size-column', default='company_size',
+                        help="Size class labels, or employee headcounts if numeric")
+    parser.add_argument('--age-column', default='company_age')
+    parser.add_argument('--share-column', default='market_share')
+    parser.add_argument('--min-count', type=int, default=MIN_COUNT,
+                        help="Peers a cell needs before its own median is used")
+    return parser
+
+
+def main(argv=None):
+    import pandas as pd
+
+    args = build_parser().parse_args(argv)
+    columns = [args.industry_column, args.size_column, args.age_column, args.share_column]
+    if args.input.endswith('.parquet'):
+        frame = pd.read_parquet(args.input, columns=columns)
+    else:
+        frame = pd.read_csv(args.input, usecols=lambda column: column in columns)
+    start = time.perf_counter()
+    estimator = MarketShareEstimator.fit_frame(frame, args.industry_column, args.size_column, args.age_column,
+                                               args.share_column, min_count=args.min_count)
+    elapsed = time.perf_counter() - start
+    estimator.save(args.output)
+    print(f"Fitted on {len(frame):,} companies across {len(estimator.industries) - 1} industries "
+          f"in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import numpy as np
+
+from core.scoring_plan import FIELD_RANGES
+
+# Margin added to the score gap so the rescored result clears the threshold
+# despite floating point, and the distance (as a fraction of the range) kept
+# from a 0 bound on guarded inputs, which score an input of exactly 0 as 0
+SCORE_MARGIN = 1e-9
+GUARD_MARGIN = 1e-6
+
+
+class TargetOptimizer:
+    # overall_score is a sum of independent per-input contributions, each
+    # piecewise linear, so the cheapest way to close a score gap is a
+    # fractional knapsack over the pieces: buy score from the inputs with the
+    # best gain per unit of cost first. Cost is the move as a fraction of the
+    # input's range, times an optional per-input weight. Each input's gain
+    # curve is replaced by its concave envelope so pieces are bought in order.
+    # Guarded inputs at or below 0 score 0 there, so crossing the guard is a
+    # jump rather than a slope: it is a whole item (the jump's gain for the
+    # cost of moving just past 0) bought ahead of that input's pieces, and
+    # only if closing the rest of the gap without it would cost more. The
+    # result is the LP optimum when no jump is involved and the curves are
+    # already concave, and a greedy plan otherwise
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.plan = plan = analyzer.plan
+        self.fields = plan.fields
+        self.criteria = {field: [] for field in plan.fields}
+        for criterion, group in enumerate(plan.criterion_group):
+            category = plan.group_category[group]
+            coefficient = (analyzer.score_weights[plan.categories[category]]
+                           / plan.category_sizes[category] / plan.group_sizes[group])
+            field = plan.fields[plan.criterion_field[criterion]]
+            self.criteria[field].append((plan.normalizers[plan.criterion_normalizer[criterion]], coefficient))
+        self.kinks = plan.field_kinks
+        self.guarded = {field: any(normalizer.guard for normalizer, _ in criteria)
+                        for field, criteria in self.criteria.items()}
+
+    def threshold(self, target):
+        if isinstance(target, str):
+            return dict(self.analyzer.VIABILITY_RATINGS)[target]
+        return float(target)
+
+    def segments(self, field, value, direction):
+        # (length, gain per unit) pieces from value to the range bound
+        low, high = FIELD_RANGES[field]
+        bound = high if direction > 0 else low
+        if self.guarded[field] and bound == 0:
+            bound += GUARD_MARGIN * (high - low) * -direction
+        if (bound - value) * direction <= 0:
+            return np.zeros(0), np.zeros(0)
+        kinks = self.kinks[field]
+        inner = kinks[(kinks - value) * direction > 0]
+        inner = inner[(bound - inner) * direction > 0]
+        points = np.concatenate([[value], inner[::direction], [bound]])
+        lengths = np.abs(np.diff(points))
+        midpoints = (points[:-1] + points[1:]) / 2
+        slopes = np.zeros(len(midpoints))
+        for normalizer, coefficient in self.criteria[field]:
+            slopes += normalizer.slopes(midpoints)[1] * coefficient
+        return lengths, slopes * direction
+
+    def field_score(self, field, value):
+        # The input's own contribution to overall_score at value
+        value = np.array([value], dtype=float)
+        return float(sum(normalizer.apply(value)[0] * coefficient for normalizer, coefficient in self.criteria[field]))
+
+    def score(self, matrix):
+        # overall_score (unrounded) per row of a frame_matrix
+        return self.analyzer._weighted_score(self.plan.score_matrix(matrix))
+
+    def solve(self, data, target, costs=None, fixed=()):
+        # Missing, None and NaN inputs start from 0, as in score_batch
+        values = self.plan.record_vector(data)
+        return self._solve(values, float(self.score(values[None])[0]), self.threshold(target), costs, fixed)
+
+    def solve_frame(self, frame, target, costs=None, fixed=()):
+        # Current scores come from one batch pass and rows already at the
+        # threshold return straight away; the envelope and knapsack are
+        # per row, since every row has its own kinks and piece order
+        matrix = self.plan.frame_matrix(frame)
+        current = self.score(matrix)
+        threshold = self.threshold(target)
+        return [self._solve(matrix[row], float(current[row]), threshold, costs, fixed) for row in range(len(matrix))]
+
+    def _solve(self, values, current, threshold, costs, fixed):
+        gap = threshold - current + SCORE_MARGIN
+        result = {'threshold': threshold, 'current_score': current, 'reachable': True,
+                  'changes': [], 'cost': 0.0, 'projected_score': current}
+        if gap <= 0:
+            return result
+
+        pieces = []
+        curves = {}
+        for order, field in enumerate(self.fields):
+            if field in fixed:
+                continue
+            low, high = FIELD_RANGES[field]
+            unit_cost = (costs or {}).get(field, 1) / (high - low)
+            for direction in (1, -1):
+                start, jump = values[order], None
+                crossing = GUARD_MARGIN * (high - low)
+                if direction > 0 and self.guarded[field] and start < crossing < high:
+                    gain = self.field_score(field, crossing) - self.field_score(field, start)
+                    if gain > 0:
+                        jump = ((crossing - start) * unit_cost, gain)
+                        start = crossing
+                lengths, slopes = self.segments(field, start, direction)
+                if jump is None and not (slopes > 0).any():
+                    continue
+                offset = 0.0 if jump is None else jump[0]
+                curves[field] = (direction, unit_cost, lengths, slopes, offset)
+                envelope = [(offset + start, offset + end, gain)
+                            for start, end, gain in self._envelope(lengths * unit_cost, lengths * slopes)]
+                for start, end, gain in envelope:
+                    pieces.append((-gain / (end - start), order, start, end, gain, field, False))
+                if jump is not None:
+                    # Ahead of the input's own pieces, whatever its ratio
+                    ratio = max([jump[1] / jump[0]] + [gain / (end - start) for start, end, gain in envelope[:1]])
+                    pieces.append((-ratio, order, 0.0, jump[0], jump[1], field, True))
+                break
+
+        pieces.sort()
+        jumps = {field for *_, field, whole in pieces if whole}
+        moved = {}
+        for index, (_, _, start, end, gain, field, whole) in enumerate(pieces):
+            if field in jumps and not whole:
+                continue
+            if whole:
+                if gap <= gain and self._fill_cost(pieces[index + 1:], jumps - {field}, gap) <= end:
+                    continue
+                jumps.discard(field)
+            if gap <= gain:
+                moved[field] = end if whole else start + self._cost_for_gain(curves[field], start, gap)
+                gap = 0
+                break
+            moved[field] = end
+            gap -= gain
+        if gap > 0:
+            result['reachable'] = False
+            return result
+
+        updated = values.copy()
+        for order, field in enumerate(self.fields):
+            if field not in moved:
+                continue
+            direction, unit_cost = curves[field][:2]
+            old_value = float(values[order])
+            new_value = float(np.clip(old_value + direction * moved[field] / unit_cost, *FIELD_RANGES[field]))
+            updated[order] = new_value
+            result['changes'].append({'field': field, 'from': old_value, 'to': new_value,
+                                      'change': new_value - old_value})
+            result['cost'] += float(moved[field])
+        result['projected_score'] = float(self.score(updated[None])[0])
+        return result
+
+    def _fill_cost(self, pieces, jumps, gap):
+        # Cost of closing gap fractionally from the remaining pieces, leaving
+        # out jumps and the inputs behind them
+        spent = 0.0
+        for _, _, start, end, gain, field, whole in pieces:
+            if whole or field in jumps:
+                continue
+            if gap <= gain:
+                return spent + (end - start) * gap / gain
+            spent += end - start
+            gap -= gain
+        return np.inf
+
+    @staticmethod
+    def _envelope(costs, gains):
+        # Upper concave hull of the cumulative (cost, gain) curve from (0, 0);
+        # returns (start cost, end cost, gain) per hull piece with gain > 0
+        xs = np.concatenate([[0], np.cumsum(costs)])
+        ys = np.concatenate([[0], np.cumsum(gains)])
+        hull = [0]
+        for i in range(1, len(xs)):
+            while len(hull) >= 2:
+                a, b = hull[-2], hull[-1]
+                if (ys[b] - ys[a]) * (xs[i] - xs[b]) <= (ys[i] - ys[b]) * (xs[b] - xs[a]):
+                    hull.pop()
+                else:
+                    break
+            hull.append(i)
+        return [(xs[a], xs[b], ys[b] - ys[a]) for a, b in zip(hull, hull[1:]) if ys[b] > ys[a]]
+
+    @staticmethod
+    def _cost_for_gain(curve, start, needed):
+        # Walk the true pieces from a hull vertex until they add up to the gain
+        # still needed; the hull piece being split guarantees they get there
+        _, unit_cost, lengths, slopes, offset = curve
+        costs = lengths * unit_cost
+        start -= offset
+        position = 0.0
+        spent = 0.0
+        for cost, gain_rate in zip(costs, slopes / unit_cost):
+            if position + cost <= start:
+                position += cost
+                continue
+            available = position + cost - max(position, start)
+            if gain_rate > 0 and available * gain_rate >= needed:
+                return spent + needed / gain_rate
+            spent += available
+            needed -= available * gain_rate
+            position += cost
+        return spent
@@ -0,0 +1,165 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from core.scoring_plan import round_scores
+
+ALL_INDUSTRIES = '__all__'
+# Where the app and the scoring service look for an index built by this module's CLI
+PEER_INDEX_PATH = os.environ.get(
+    'PEER_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'peer_index.npz'))
+
+
+class PeerIndex:
+    def __init__(self, industries, columns, quantiles, counts):
+        # quantiles: group x column x resolution, each row sorted ascending;
+        # the last group is always the whole population
+        self.industries = tuple(industries)
+        self.columns = tuple(columns)
+        self.quantiles = np.asarray(quantiles, dtype=float)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.industry_index = {industry: i for i, industry in enumerate(self.industries)}
+        self.column_index = {column: j for j, column in enumerate(self.columns)}
+        self.value_tables = {}
+
+    @classmethod
+    def build(cls, frame, columns, industry_column='industry', resolution=1001, min_peers=30):
+        import pandas as pd
+
+        columns = [c for c in columns if c in frame]
+        probabilities = np.linspace(0, 1, resolution)
+        values = frame[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+        groups, quantiles, counts = [], [], []
+        if industry_column in frame:
+            for industry, rows in frame.groupby(industry_column, sort=True).indices.items():
+                if len(rows) >= min_peers:
+                    groups.append(industry)
+                    quantiles.append(cls._column_quantiles(values[rows], probabilities))
+                    counts.append(len(rows))
+        groups.append(ALL_INDUSTRIES)
+        quantiles.append(cls._column_quantiles(values, probabilities))
+        counts.append(len(values))
+        return cls(groups, columns, np.stack(quantiles), counts)
+
+    @staticmethod
+    def _column_quantiles(values, probabilities):
+        result = np.empty((values.shape[1], len(probabilities)))
+        for j in range(values.shape[1]):
+            column = values[:, j]
+            column = column[~np.isnan(column)]
+            result[j] = np.quantile(column, probabilities) if len(column) else np.nan
+        return result
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as saved:
+            return cls(saved['industries'].tolist(), saved['columns'].tolist(),
+                       saved['quantiles'], saved['counts'])
+
+    def save(self, path):
+        np.savez_compressed(path, industries=np.array(self.industries), columns=np.array(self.columns),
+                            quantiles=self.quantiles, counts=self.counts)
+
+    def _group(self, industry):
+        return self.industry_index.get(industry, self.industry_index[ALL_INDUSTRIES])
+
+    def _percentiles(self, group, column, values):
+        sketch = self.quantiles[group, self.column_index[column]]
+        # Midpoint rank over the sketch handles ties (e.g. many companies
+        # reporting exactly 0) without favouring either end
+        below = np.searchsorted(sketch, values, side='left')
+        at_or_below = np.searchsorted(sketch, values, side='right')
+        return (below + at_or_below) / 2 / len(sketch) * 100
+
+    def percentile_values(self, columns, percentiles):
+        # The inverse of _percentiles for every peer group at once: a
+        # group x column x percentile table of values, interpolated along
+        # each sketch. Tables are kept per (columns, percentiles), so drawing
+        # peer bands never goes back to the sketches
+        key = (tuple(columns), tuple(percentiles))
+        table = self.value_tables.get(key)
+        if table is None:
+            sketches = self.quantiles[:, [self.column_index[column] for column in columns]]
+            positions = np.asarray(percentiles, dtype=float) / 100 * (sketches.shape[2] - 1)
+            lower = np.floor(positions).astype(np.intp)
+            upper = np.minimum(lower + 1, sketches.shape[2] - 1)
+            fraction = positions - lower
+            table = self.value_tables[key] = (sketches[:, :, lower] * (1 - fraction)
+                                              + sketches[:, :, upper] * fraction)
+        return table
+
+    def percentile(self, industry, column, value):
+        return float(self._percentiles(self._group(industry), column, value))
+
+    def rank_record(self, data, category_scores):
+        group = self._group(data.get('industry'))
+        metrics = {field: round(float(self._percentiles(group, field, data[field])), 1)
+                   for field in self.columns if data.get(field) is not None and data[field] == data[field]}
+        categories = {category: round(float(self._percentiles(group, f'{category}_score', score)), 1)
+                      for category, score in category_scores.items()
+                      if f'{category}_score' in self.column_index}
+        return {
+            'peer_group': self.industries[group],
+            'metrics': metrics,
+            'categories': categories
+        }
+
+    def rank_frame(self, frame, industry_column='industry'):
+        import pandas as pd
+
+        result = pd.DataFrame(index=frame.index)
+        columns = [c for c in self.columns if c in frame]
+        if industry_column in frame:
+            industries = frame[industry_column].astype(str).to_numpy()
+        else:
+            industries = np.full(len(frame), ALL_INDUSTRIES)
+        unique, inverse = np.unique(industries, return_inverse=True)
+        groups = np.array([self._group(industry) for industry in unique])[inverse]
+
+        for column in columns:
+            values = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=float)
+            ranks = np.full(len(frame), np.nan)
+            for group in np.unique(groups):
+                rows = groups == group
+                ranks[rows] = self._percentiles(group, column, values[rows])
+            ranks[np.isnan(values)] = np.nan
+            result[f'{column}_percentile'] = round_scores(ranks, 1)
+        return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Build a peer percentile index from a reference dataset")
+    parser.add_argument('input', help="Reference .csv or .parquet file, one row per company")
+    parser.add_argument('output', help="Where to write the index (.npz)")
+    parser.add_argument('--industry-column', default='industry')
+    parser.add_argument('--resolution', type=int, default=1001,
+                        help="Quantile points stored per industry and column")
+    parser.add_argument('--min-peers', type=int, default=30,
+                        help="Industries with fewer companies are ranked against the whole population")
+    return parser
+
+
+def main(argv=None):
+    import pandas as pd
+
+    from core.analysis import BusinessAnalysisTool
+
+    args = build_parser().parse_args(argv)
+    reference = pd.read_parquet(args.input) if args.input.endswith('.parquet') else pd.read_csv(args.input)
+    analyzer = BusinessAnalysisTool()
+    scores = analyzer.plan.score_frame(reference)
+    reference = reference.assign(**{f'{category}_score': values for category, values in scores.items()})
+    columns = list(analyzer.plan.fields) + [f'{category}_score' for category in scores]
+
+    index = PeerIndex.build(reference, columns, args.industry_column, args.resolution, args.min_peers)
+    index.save(args.output)
+    print(f"Indexed {len(reference):,} companies across {len(index.industries) - 1} industries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
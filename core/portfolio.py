@@ -0,0 +1,88 @@
+import numpy as np
+
+SCORE_RANGE = (0.0, 10.0)
+# Most raw per-company points one scatter view returns; denser views are
+# binned into a GRID x GRID histogram over the visible range instead
+POINT_CAP = 5000
+GRID = 120
+DISTRIBUTION_BINS = 40
+SCALABILITY_CATEGORIES = ('operational_efficiency', 'product_delivery', 'financial_health')
+
+
+class Portfolio:
+    # Scores of a whole portfolio as flat arrays, and the aggregates the
+    # portfolio dashboard draws from them. Views only ever return binned
+    # counts or at most POINT_CAP companies
+    def __init__(self, batch, industries, companies):
+        codec = batch.codec
+        self.categories = codec.categories
+        self.category_scores = batch.category_scores.astype(np.float32) / 100
+        self.overall = batch.overall.astype(np.float32) / 100
+        # The same mean _get_scalability_rating compares against, from the
+        # rounded category scores
+        columns = [self.categories.index(category) for category in SCALABILITY_CATEGORIES]
+        self.scalability = self.category_scores[:, columns].mean(axis=1)
+        self.viability = batch.viability
+        self.viability_ratings = codec.viability_ratings
+        self.industries, self.industry = np.unique(np.asarray(industries, dtype=str), return_inverse=True)
+        self.companies = np.asarray(companies)
+
+    @classmethod
+    def score(cls, analyzer, frame, company_column='company'):
+        batch = analyzer.score_compact(frame)
+        industries = (frame['industry'].fillna('General').astype(str).to_numpy() if 'industry' in frame
+                      else np.full(len(frame), 'General'))
+        companies = (frame[company_column].astype(str).to_numpy() if company_column in frame
+                     else np.arange(len(frame)).astype(str))
+        return cls(batch, industries, companies)
+
+    def __len__(self):
+        return len(self.overall)
+
+    def mask(self, industries=(), ratings=()):
+        # Companies in any of the given industries and viability ratings;
+        # an empty selection doesn't filter
+        selected = np.ones(len(self), dtype=bool)
+        if industries:
+            selected &= np.isin(self.industry, np.flatnonzero(np.isin(self.industries, list(industries))))
+        if ratings:
+            selected &= np.isin(self.viability, [self.viability_ratings.index(rating) for rating in ratings])
+        return selected
+
+    def scatter(self, mask, x_range=SCORE_RANGE, y_range=SCORE_RANGE, cap=POINT_CAP, grid=GRID):
+        # Overall vs scalability score for the companies inside the view.
+        # Up to cap companies come back as points; past that, as the centers
+        # and counts of the non-empty cells of a grid over the view, so a
+        # zoomed view is binned at a finer resolution than the full one
+        (x0, x1), (y0, y1) = x_range, y_range
+        x, y = self.overall, self.scalability
+        rows = np.flatnonzero(mask & (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1))
+        if len(rows) <= cap:
+            return {
+                'binned': False, 'total': len(rows), 'x': x[rows], 'y': y[rows],
+                'company': self.companies[rows],
+                'viability': np.array(self.viability_ratings)[self.viability[rows]]
+            }
+        counts, x_edges, y_edges = np.histogram2d(x[rows], y[rows], bins=grid, range=[x_range, y_range])
+        ix, iy = np.nonzero(counts)
+        return {
+            'binned': True, 'total': len(rows),
+            'x': (x_edges[ix] + x_edges[ix + 1]) / 2, 'y': (y_edges[iy] + y_edges[iy + 1]) / 2,
+            'count': counts[ix, iy].astype(np.int64),
+            'cell': ((x1 - x0) / grid, (y1 - y0) / grid)
+        }
+
+    def score_distributions(self, mask, bins=DISTRIBUTION_BINS):
+        # Histogram counts over SCORE_RANGE for the overall score and each category
+        edges = np.linspace(*SCORE_RANGE, bins + 1)
+        distributions = {'overall': np.histogram(self.overall[mask], edges)[0]}
+        for c, category in enumerate(self.categories):
+            distributions[category] = np.histogram(self.category_scores[mask, c], edges)[0]
+        return edges, distributions
+
+    def rating_counts(self, mask):
+        # industries x viability ratings count matrix
+        ratings = len(self.viability_ratings)
+        counts = np.bincount(self.industry[mask] * ratings + self.viability[mask],
+                             minlength=len(self.industries) * ratings)
+        return counts.reshape(len(self.industries), ratings)
@@ -0,0 +1,192 @@
+import operator
+
+import numpy as np
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+
+class Benchmark:
+    def __init__(self, metric):
+        self.metric = metric
+
+
+# (rule id, category, priority, text, conditions); every condition of a rule
+# must hold for it to fire. Fields missing from the inputs (or None/NaN) count
+# as 0 and missing benchmarks as 0, the IndustryBenchmarks.get default
+RULES = (
+    ('marketing.brand_awareness', 'marketing', 'high',
+     "Increase brand awareness through targeted digital marketing and PR campaigns",
+     (('market_share', '<', Benchmark('market_share')), ('brand_recognition', '<', 50))),
+    ('marketing.acquisition_cost', 'marketing', 'high',
+     "Optimize marketing channels to reduce customer acquisition costs",
+     (('market_share', '<', Benchmark('market_share')),
+      ('customer_acquisition_cost', '>', Benchmark('customer_acquisition_cost')))),
+    ('marketing.spend_allocation', 'marketing', 'medium',
+     "Review and optimize marketing spend allocation across channels",
+     (('marketing_roi', '<', Benchmark('marketing_roi')),)),
+
+    ('sales.revenue_growth', 'sales', 'high',
+     "Accelerate revenue growth by expanding into adjacent segments and upselling existing accounts",
+     (('revenue_growth', '<', 15),)),
+    ('sales.pipeline_conversion', 'sales', 'medium',
+     "Tighten lead qualification and sales playbooks to lift pipeline conversion",
+     (('pipeline_conversion', '<', 20),)),
+    ('sales.cycle_length', 'sales', 'medium',
+     "Shorten the sales cycle with clearer pricing, proof-of-value offers and faster approvals",
+     (('sales_cycle_length', '>', 90),)),
+    ('sales.recurring_revenue', 'sales', 'medium',
+     "Shift the revenue mix toward subscriptions or retainers to increase recurring revenue",
+     (('recurring_revenue_percentage', '<', 50),)),
+
+    ('product_delivery.defects', 'product_delivery', 'high',
+     "Introduce quality gates and root-cause reviews to reduce defect rates",
+     (('defect_rate', '>', 5),)),
+    ('product_delivery.on_time', 'product_delivery', 'high',
+     "Improve delivery planning and capacity buffers to raise on-time delivery",
+     (('on_time_delivery', '<', 90),)),
+    ('product_delivery.automation', 'product_delivery', 'medium',
+     "Automate repetitive delivery steps to improve consistency and scalability",
+     (('automation_percentage', '<', 40),)),
+
+    ('operational_efficiency.margin', 'operational_efficiency', 'high',
+     "Review cost structure and pricing to improve operating margin",
+     (('operating_margin', '<', 10),)),
+    ('operational_efficiency.automation', 'operational_efficiency', 'medium',
+     "Prioritize automation of high-volume manual processes",
+     (('process_automation', '<', 50),)),
+    ('operational_efficiency.errors', 'operational_efficiency', 'medium',
+     "Standardize processes and add checks to reduce operational error rates",
+     (('error_rate', '>', 5),)),
+    ('operational_efficiency.unit_cost', 'operational_efficiency', 'medium',
+     "Reduce unit costs through supplier renegotiation and process redesign",
+     (('cost_per_unit', '>', 500),)),
+
+    ('financial_health.liquidity', 'financial_health', 'high',
+     "Improve short-term liquidity; current liabilities exceed current assets",
+     (('current_ratio', '<', 1),)),
+    ('financial_health.gross_margin', 'financial_health', 'medium',
+     "Revisit pricing and cost of goods sold to close the gross margin gap with industry peers",
+     (('gross_profit_margin', '<', Benchmark('gross_profit_margin')),)),
+    ('financial_health.collections', 'financial_health', 'medium',
+     "Tighten credit terms and collections to bring down days sales outstanding",
+     (('days_sales_outstanding', '>', 60),)),
+    ('financial_health.leverage', 'financial_health', 'high',
+     "Reduce leverage by paying down debt or raising equity",
+     (('debt_to_equity', '>', 2),)),
+
+    ('people.retention', 'people', 'high',
+     "Address attrition drivers with career paths, compensation review and stay interviews",
+     (('employee_retention', '<', 80),)),
+    ('people.satisfaction', 'people', 'medium',
+     "Run engagement surveys and act on the top issues to raise employee satisfaction",
+     (('employee_satisfaction', '<', 70),)),
+    ('people.skills', 'people', 'medium',
+     "Close critical skill gaps through targeted hiring and training",
+     (('skill_coverage', '<', 70),)),
+    ('people.innovation', 'people', 'medium',
+     "Create space for experimentation to strengthen innovation capability",
+     (('innovation_rating', '<', 5),))
+)
+
+
+class RecommendationRules:
+    def __init__(self, benchmarks, rules=RULES):
+        self.benchmarks = benchmarks
+        self.rule_ids = tuple(rule[0] for rule in rules)
+        self.categories = tuple(rule[1] for rule in rules)
+        self.priorities = tuple(rule[2] for rule in rules)
+        self.texts = tuple(rule[3] for rule in rules)
+        self.text_index = {text: i for i, text in enumerate(self.texts)}
+        self.conditions = tuple(
+            tuple((field, OPERATORS[op], threshold) for field, op, threshold in rule[4])
+            for rule in rules
+        )
+        self.category_rules = {}
+        for index, category in enumerate(self.categories):
+            self.category_rules.setdefault(category, []).append(index)
+        self.field_categories = {}
+        for category, conditions in zip(self.categories, self.conditions):
+            for field, _, _ in conditions:
+                self.field_categories.setdefault(field, set()).add(category)
+
+    def evaluate(self, data, category):
+        industry = data.get('industry')
+        if industry is None or industry != industry:
+            industry = 'General'
+        fired = []
+        for index in self.category_rules.get(category, []):
+            for field, compare, threshold in self.conditions[index]:
+                if isinstance(threshold, Benchmark):
+                    threshold = self.benchmarks.get(industry, threshold.metric)
+                value = data.get(field)
+                # None and NaN count as 0, as in evaluate_frame
+                if value is None or value != value:
+                    value = 0
+                if not compare(value, threshold):
+                    break
+            else:
+                fired.append(index)
+        return fired
+
+    def evaluate_frame(self, frame, industry_column='industry'):
+        import pandas as pd
+
+        n = len(frame)
+        if industry_column in frame:
+            industries = frame[industry_column].fillna('General').to_numpy()
+        else:
+            industries = np.full(n, 'General', dtype=object)
+        columns, thresholds = {}, {}
+        fired = np.ones((n, len(self.rule_ids)), dtype=bool)
+        for index, conditions in enumerate(self.conditions):
+            for field, compare, threshold in conditions:
+                if field not in columns:
+                    columns[field] = (pd.to_numeric(frame[field], errors='coerce').fillna(0).to_numpy(dtype=float)
+                                      if field in frame else np.zeros(n))
+                if isinstance(threshold, Benchmark):
+                    if threshold.metric not in thresholds:
+                        thresholds[threshold.metric] = self.benchmarks.lookup_many(industries, threshold.metric)
+                    threshold = thresholds[threshold.metric]
+                fired[:, index] &= compare(columns[field], threshold)
+        return fired
+
+
+class RecommendationMatrix:
+    # Compact recommendation sets for many companies: which rules fired per
+    # row, which categories were flagged (score < 6) and the per-category
+    # data-quality scores. Text is only materialized by expand()
+    def __init__(self, rules, categories, fired, flagged, quality, analyzer):
+        self.rules = rules
+        self.categories = tuple(categories)
+        rule_category = np.array([self.categories.index(c) for c in rules.categories], dtype=np.intp)
+        self.fired = fired & flagged[:, rule_category]
+        self.flagged = flagged
+        self.quality = quality
+        self.analyzer = analyzer
+
+    def __len__(self):
+        return len(self.fired)
+
+    def rule_ids(self, row):
+        return [self.rules.rule_ids[i] for i in np.flatnonzero(self.fired[row])]
+
+    def expand(self, row):
+        recommendations = []
+        for c, category in enumerate(self.categories):
+            if not self.flagged[row, c]:
+                continue
+            formatted = []
+            for index in self.rules.category_rules.get(category, []):
+                if self.fired[row, index]:
+                    priority = self.rules.priorities[index]
+                    formatted.append(self.analyzer.format_recommendation(
+                        self.rules.texts[index],
+                        float(self.quality[row, c]) * (1.2 if priority == 'high' else 1.0)
+                    ))
+            recommendations.append(formatted)
+        return recommendations
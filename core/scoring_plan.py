@@ -0,0 +1,353 @@
+import numpy as np
+
+
+def number(value):
+    # None, NaN and non-numeric inputs count as 0, as in frame_matrix
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if value == value else 0.0
+
+
+class Normalizer:
+    def __init__(self, kind, divisor, multiplier=1, guard=False):
+        self.kind = kind
+        self.divisor = divisor
+        self.multiplier = multiplier
+        self.guard = guard
+
+    def __call__(self, value):
+        if self.guard and value <= 0: return 0
+        if self.kind == 'scale':
+            return value / self.divisor * self.multiplier
+        if self.kind == 'complement':
+            return (self.divisor - value) / self.divisor * self.multiplier
+        if self.kind == 'clamp':
+            return min(10, max(0, value / self.divisor * self.multiplier))
+        return min(10, max(0, 10 - value / self.divisor * self.multiplier))
+
+    def apply(self, values):
+        if self.kind == 'scale':
+            result = values / self.divisor * self.multiplier
+        elif self.kind == 'complement':
+            result = (self.divisor - values) / self.divisor * self.multiplier
+        elif self.kind == 'clamp':
+            result = np.minimum(10, np.maximum(0, values / self.divisor * self.multiplier))
+        else:
+            result = np.minimum(10, np.maximum(0, 10 - values / self.divisor * self.multiplier))
+        if self.guard:
+            result = np.where(values <= 0, 0, result)
+        return result
+
+    def kinks(self):
+        # Inputs where apply() changes slope (or jumps, at a guard)
+        points = {0} if self.guard else set()
+        if self.kind in ('clamp', 'clamp_inverse'):
+            points.update((0, 10 * self.divisor / self.multiplier))
+        return sorted(points)
+
+    def slopes(self, values):
+        # Exact one-sided derivatives (left, right) of apply(); each piece is
+        # linear, so a derivative is the piece's slope or 0 past a clamp. The
+        # guard's jump at 0 is not a slope and is left out
+        slope = self.multiplier / self.divisor
+        if self.kind in ('scale', 'complement'):
+            left = right = np.full(values.shape, slope if self.kind == 'scale' else -slope)
+        elif self.kind == 'clamp':
+            raw = values / self.divisor * self.multiplier
+            left = np.where((raw > 0) & (raw <= 10), slope, 0.0)
+            right = np.where((raw >= 0) & (raw < 10), slope, 0.0)
+        else:
+            raw = 10 - values / self.divisor * self.multiplier
+            left = np.where((raw >= 0) & (raw < 10), -slope, 0.0)
+            right = np.where((raw > 0) & (raw <= 10), -slope, 0.0)
+        if self.guard:
+            left = np.where(values <= 0, 0.0, left)
+            right = np.where(values < 0, 0.0, right)
+        return left, right
+
+
+# The arithmetic of each normalizer mirrors the original hand-written
+# expressions operation for operation (e.g. x / 100 * 10 rather than x / 10)
+# so scores stay bit-identical to earlier releases
+NORMALIZERS = {
+    'percent': Normalizer('scale', 100, 10),
+    'rating': Normalizer('scale', 10),
+    'pipeline_coverage': Normalizer('scale', 4, 10),
+    'inverse_percent': Normalizer('complement', 100, 10),
+    'audience': Normalizer('clamp', 100000, guard=True),
+    'cac': Normalizer('clamp_inverse', 1000, guard=True),
+    'roi': Normalizer('clamp', 30),
+    'tam': Normalizer('clamp', 1e9, guard=True),
+    'deal_size': Normalizer('clamp', 10000, guard=True),
+    'sales_cycle': Normalizer('clamp_inverse', 30, guard=True),
+    'delivery_cost': Normalizer('clamp_inverse', 1000, guard=True),
+    'cycle_time': Normalizer('clamp_inverse', 30, guard=True),
+    'utilization': Normalizer('clamp', 10),
+    'margin': Normalizer('clamp', 10),
+    'unit_cost': Normalizer('clamp_inverse', 100, guard=True),
+    'ratio': Normalizer('clamp', 1, 5, guard=True),
+    'cash_flow': Normalizer('clamp', 100000, guard=True),
+    'turnover': Normalizer('clamp', 12, 10, guard=True),
+    'dso': Normalizer('clamp_inverse', 30, guard=True),
+    'leverage': Normalizer('clamp_inverse', 1, 2, guard=True)
+}
+
+# (category, group, criterion, input field, normalizer)
+METRIC_DEFINITIONS = (
+    ('marketing', 'audience_metrics', 'total_addressable_audience', 'total_addressable_audience', 'audience'),
+    ('marketing', 'audience_metrics', 'campaign_effectiveness', 'campaign_effectiveness', 'rating'),
+    ('marketing', 'audience_metrics', 'conversion_rate', 'conversion_rate', 'percent'),
+    ('marketing', 'performance_metrics', 'cac', 'customer_acquisition_cost', 'cac'),
+    ('marketing', 'performance_metrics', 'marketing_roi', 'marketing_roi', 'roi'),
+
+    ('sales', 'revenue_metrics', 'revenue_growth', 'revenue_growth', 'percent'),
+    ('sales', 'revenue_metrics', 'recurring_revenue', 'recurring_revenue_percentage', 'percent'),
+    ('sales', 'revenue_metrics', 'average_deal_size', 'average_deal_size', 'deal_size'),
+    ('sales', 'pipeline_health', 'conversion_rate', 'pipeline_conversion', 'percent'),
+    ('sales', 'pipeline_health', 'sales_cycle', 'sales_cycle_length', 'sales_cycle'),
+    ('sales', 'pipeline_health', 'pipeline_coverage', 'pipeline_coverage', 'pipeline_coverage'),
+    ('sales', 'customer_metrics', 'customer_retention', 'retention_rate', 'percent'),
+    ('sales', 'customer_metrics', 'customer_satisfaction', 'satisfaction_score', 'percent'),
+
+    ('product_delivery', 'quality_metrics', 'defect_rate', 'defect_rate', 'inverse_percent'),
+    ('product_delivery', 'quality_metrics', 'customer_satisfaction', 'product_satisfaction', 'percent'),
+    ('product_delivery', 'quality_metrics', 'service_level', 'sla_compliance', 'percent'),
+    ('product_delivery', 'delivery_efficiency', 'on_time_delivery', 'on_time_delivery', 'percent'),
+    ('product_delivery', 'delivery_efficiency', 'delivery_cost', 'delivery_cost', 'delivery_cost'),
+    ('product_delivery', 'delivery_efficiency', 'cycle_time', 'cycle_time', 'cycle_time'),
+    ('product_delivery', 'scalability', 'capacity_utilization', 'capacity_utilization', 'utilization'),
+    ('product_delivery', 'scalability', 'automation_level', 'automation_percentage', 'percent'),
+
+    ('operational_efficiency', 'process_efficiency', 'process_automation', 'process_automation', 'percent'),
+    ('operational_efficiency', 'process_efficiency', 'resource_utilization', 'resource_utilization', 'percent'),
+    ('operational_efficiency', 'process_efficiency', 'error_rate', 'error_rate', 'inverse_percent'),
+    ('operational_efficiency', 'cost_efficiency', 'operating_margin', 'operating_margin', 'margin'),
+    ('operational_efficiency', 'cost_efficiency', 'overhead_ratio', 'overhead_ratio', 'inverse_percent'),
+    ('operational_efficiency', 'cost_efficiency', 'cost_per_unit', 'cost_per_unit', 'unit_cost'),
+    ('operational_efficiency', 'infrastructure', 'tech_stack', 'tech_stack_rating', 'rating'),
+    ('operational_efficiency', 'infrastructure', 'scalability_rating', 'infrastructure_scalability', 'rating'),
+
+    ('financial_health', 'profitability', 'gross_profit_margin', 'gross_profit_margin', 'margin'),
+    ('financial_health', 'profitability', 'net_profit_margin', 'net_profit_margin', 'margin'),
+    ('financial_health', 'profitability', 'operating_margin', 'operating_margin', 'margin'),
+    ('financial_health', 'liquidity', 'current_ratio', 'current_ratio', 'ratio'),
+    ('financial_health', 'liquidity', 'quick_ratio', 'quick_ratio', 'ratio'),
+    ('financial_health', 'liquidity', 'cash_flow_operations', 'cash_flow_operations', 'cash_flow'),
+    ('financial_health', 'efficiency', 'inventory_turnover', 'inventory_turnover', 'turnover'),
+    ('financial_health', 'efficiency', 'days_sales_outstanding', 'days_sales_outstanding', 'dso'),
+    ('financial_health', 'efficiency', 'debt_to_equity', 'debt_to_equity', 'leverage'),
+
+    ('people', 'talent_metrics', 'employee_satisfaction', 'employee_satisfaction', 'percent'),
+    ('people', 'talent_metrics', 'retention_rate', 'employee_retention', 'percent'),
+    ('people', 'talent_metrics', 'skill_coverage', 'skill_coverage', 'percent'),
+    ('people', 'leadership', 'experience', 'leadership_experience', 'rating'),
+    ('people', 'leadership', 'succession_planning', 'succession_readiness', 'rating'),
+    ('people', 'leadership', 'vision_clarity', 'vision_rating', 'rating'),
+    ('people', 'culture', 'culture_score', 'culture_rating', 'rating'),
+    ('people', 'culture', 'innovation_index', 'innovation_rating', 'rating')
+)
+
+
+# Valid (min, max) input range per field; the Streamlit form enforces the same
+# bounds, and fields it doesn't collect use comparable scales
+FIELD_RANGES = {
+    'total_addressable_audience': (0, 10000000),
+    'campaign_effectiveness': (1, 10),
+    'conversion_rate': (0, 100),
+    'customer_acquisition_cost': (0, 10000),
+    'marketing_roi': (0, 1000),
+    'revenue_growth': (0, 100),
+    'recurring_revenue_percentage': (0, 100),
+    'average_deal_size': (0, 100000),
+    'pipeline_conversion': (0, 100),
+    'sales_cycle_length': (0, 365),
+    'pipeline_coverage': (0.0, 10.0),
+    'retention_rate': (0, 100),
+    'satisfaction_score': (0, 100),
+    'defect_rate': (0, 100),
+    'product_satisfaction': (0, 100),
+    'sla_compliance': (0, 100),
+    'on_time_delivery': (0, 100),
+    'delivery_cost': (0, 10000),
+    'cycle_time': (0, 100),
+    'capacity_utilization': (0, 100),
+    'automation_percentage': (0, 100),
+    'process_automation': (0, 100),
+    'resource_utilization': (0, 100),
+    'error_rate': (0, 100),
+    'operating_margin': (-100, 100),
+    'overhead_ratio': (0, 100),
+    'cost_per_unit': (0, 1000),
+    'tech_stack_rating': (1, 10),
+    'infrastructure_scalability': (1, 10),
+    'gross_profit_margin': (-100, 100),
+    'net_profit_margin': (-100, 100),
+    'current_ratio': (0.0, 10.0),
+    'quick_ratio': (0.0, 10.0),
+    'cash_flow_operations': (-10000000, 100000000),
+    'inventory_turnover': (0.0, 50.0),
+    'days_sales_outstanding': (0, 365),
+    'debt_to_equity': (0.0, 10.0),
+    'employee_satisfaction': (0, 100),
+    'employee_retention': (0, 100),
+    'skill_coverage': (0, 100),
+    'leadership_experience': (1, 10),
+    'succession_readiness': (1, 10),
+    'vision_rating': (1, 10),
+    'culture_rating': (1, 10),
+    'innovation_rating': (1, 10)
+}
+
+
+class ScoringPlan:
+    def __init__(self, definitions=METRIC_DEFINITIONS, normalizers=NORMALIZERS):
+        self.categories = []
+        self.groups = []
+        self.fields = []
+        self.normalizer_names = []
+        criterion_field, criterion_group, criterion_normalizer = [], [], []
+
+        for category, group, _, field, normalizer in definitions:
+            if category not in self.categories:
+                self.categories.append(category)
+            if (category, group) not in self.groups:
+                self.groups.append((category, group))
+            if field not in self.fields:
+                self.fields.append(field)
+            if normalizer not in self.normalizer_names:
+                self.normalizer_names.append(normalizer)
+            criterion_field.append(self.fields.index(field))
+            criterion_group.append(self.groups.index((category, group)))
+            criterion_normalizer.append(self.normalizer_names.index(normalizer))
+
+        self.categories = tuple(self.categories)
+        self.fields = tuple(self.fields)
+        self.normalizers = tuple(normalizers[name] for name in self.normalizer_names)
+        self.criterion_field = np.array(criterion_field, dtype=np.intp)
+        self.criterion_group = np.array(criterion_group, dtype=np.intp)
+        self.criterion_normalizer = np.array(criterion_normalizer, dtype=np.intp)
+        self.field_categories = {}
+        for category, _, _, field, _ in definitions:
+            self.field_categories.setdefault(field, set()).add(category)
+        self.group_category = np.array([self.categories.index(category) for category, _ in self.groups],
+                                       dtype=np.intp)
+        self.field_kinks = {}
+        for category, _, _, field, normalizer in definitions:
+            self.field_kinks.setdefault(field, set()).update(normalizers[normalizer].kinks())
+        self.field_kinks = {field: np.array(sorted(points), dtype=float) for field, points in self.field_kinks.items()}
+
+        # Padded member tables (-1 = padding) let the batch path add group
+        # members column by column, in definition order, like the scalar path
+        self.group_members = self._padded_members(self.criterion_group, len(self.groups))
+        self.category_members = self._padded_members(self.group_category, len(self.categories))
+        self.group_sizes = np.bincount(self.criterion_group, minlength=len(self.groups))
+        self.category_sizes = np.bincount(self.group_category, minlength=len(self.categories))
+
+        # Scalar lookup tables: category -> ((field, normalizer), ...) per group
+        self._category_criteria = {}
+        for category_index, category in enumerate(self.categories):
+            self._category_criteria[category] = tuple(
+                tuple((self.fields[self.criterion_field[c]], self.normalizers[self.criterion_normalizer[c]])
+                      for c in np.flatnonzero(self.criterion_group == group_index))
+                for group_index in np.flatnonzero(self.group_category == category_index)
+            )
+
+    def _padded_members(self, owners, count):
+        width = np.bincount(owners, minlength=count).max()
+        members = np.full((count, width), -1, dtype=np.intp)
+        for owner in range(count):
+            indices = np.flatnonzero(owners == owner)
+            members[owner, :len(indices)] = indices
+        return members
+
+    def score_category(self, category, data):
+        try:
+            return self._score_category(category, data, False)
+        except TypeError:
+            # None or non-numeric inputs; scored again coerced like record_vector
+            return self._score_category(category, data, True)
+
+    def _score_category(self, category, data, coerce):
+        category_score = 0
+        groups = self._category_criteria[category]
+        for criteria in groups:
+            group_score = 0
+            for field, normalizer in criteria:
+                value = data.get(field, 0)
+                if coerce:
+                    value = number(value)
+                elif value != value:
+                    value = 0.0
+                group_score = group_score + normalizer(value)
+            category_score = category_score + group_score / len(criteria)
+        return category_score / len(groups)
+
+    def frame_matrix(self, frame):
+        import pandas as pd
+
+        # Missing columns and empty cells behave like data.get(field, 0)
+        matrix = np.zeros((len(frame), len(self.fields)))
+        for index, field in enumerate(self.fields):
+            if field in frame:
+                matrix[:, index] = pd.to_numeric(frame[field], errors='coerce').fillna(0).to_numpy(dtype=float)
+        return matrix
+
+    def record_vector(self, data):
+        # One input dict as a frame_matrix row, without building a DataFrame
+        vector = np.zeros(len(self.fields))
+        for index, field in enumerate(self.fields):
+            vector[index] = number(data.get(field, 0))
+        return vector
+
+    def score_matrix(self, matrix):
+        normalized = np.empty((matrix.shape[0], len(self.criterion_field) + 1))
+        normalized[:, -1] = 0
+        for index, normalizer in enumerate(self.normalizers):
+            criteria = np.flatnonzero(self.criterion_normalizer == index)
+            normalized[:, criteria] = normalizer.apply(matrix[:, self.criterion_field[criteria]])
+
+        group_scores = self._reduce_members(normalized, self.group_members) / self.group_sizes
+        group_scores = np.concatenate([group_scores, np.zeros((matrix.shape[0], 1))], axis=1)
+        category_scores = self._reduce_members(group_scores, self.category_members) / self.category_sizes
+        return {category: category_scores[:, index] for index, category in enumerate(self.categories)}
+
+    def field_slopes(self, matrix, weights):
+        # d(sum of weights[category] * category score) / d(field), from the
+        # left and from the right, for every row of an inputs matrix
+        coefficients = np.array([
+            weights[self.categories[self.group_category[group]]]
+            / self.category_sizes[self.group_category[group]] / self.group_sizes[group]
+            for group in self.criterion_group
+        ])
+        left = np.zeros(matrix.shape)
+        right = np.zeros(matrix.shape)
+        for index, normalizer in enumerate(self.normalizers):
+            for criterion in np.flatnonzero(self.criterion_normalizer == index):
+                field = self.criterion_field[criterion]
+                criterion_left, criterion_right = normalizer.slopes(matrix[:, field])
+                left[:, field] += criterion_left * coefficients[criterion]
+                right[:, field] += criterion_right * coefficients[criterion]
+        return left, right
+
+    def score_frame(self, frame):
+        return self.score_matrix(self.frame_matrix(frame))
+
+    def _reduce_members(self, values, members):
+        total = 0
+        for column in members.T:
+            total = total + values[:, column]
+        return total
+
+
+def round_scores(values, ndigits=2):
+    # np.round scales by 10**ndigits before rounding, which can disagree with
+    # the builtin round() on values sitting next to a half-way point
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, ndigits) for value in values[near_tie].tolist()]
+    return rounded
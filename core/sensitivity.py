@@ -0,0 +1,101 @@
+import numpy as np
+
+from core.scoring_plan import FIELD_RANGES
+
+LEVERAGE_STEP = 0.01
+
+
+def improvement_slopes(analyzer, matrix):
+    # Exact marginal gain in overall_score per unit of each input, moving it
+    # in whichever direction helps (1 = increase, -1 = decrease). Inputs
+    # already at a range bound can't move further that way
+    plan = analyzer.plan
+    low = np.array([FIELD_RANGES[field][0] for field in plan.fields], dtype=float)
+    high = np.array([FIELD_RANGES[field][1] for field in plan.fields], dtype=float)
+    left, right = plan.field_slopes(matrix, analyzer.score_weights)
+    up = np.where(matrix < high, np.maximum(right, 0), 0)
+    down = np.where(matrix > low, np.maximum(-left, 0), 0)
+    return np.maximum(up, down), np.where(down > up, -1, 1)
+
+
+def leverage(analyzer, matrix):
+    # Gain from moving each input by LEVERAGE_STEP of its range (or to the end
+    # of its current linear piece, if nearer), so inputs measured in dollars,
+    # percentages and ratings can be ranked against each other
+    spans = np.array([FIELD_RANGES[field][1] - FIELD_RANGES[field][0] for field in analyzer.plan.fields])
+    slopes, directions = improvement_slopes(analyzer, matrix)
+    steps = np.minimum(spans * LEVERAGE_STEP, piece_lengths(analyzer.plan, matrix, directions))
+    return slopes * steps, slopes, directions
+
+
+def piece_lengths(plan, matrix, directions):
+    # Distance from each input to the next kink (or range bound) in its
+    # improving direction; the slopes above are exact over that distance
+    lengths = np.empty(matrix.shape)
+    for index, field in enumerate(plan.fields):
+        low, high = FIELD_RANGES[field]
+        kinks = plan.field_kinks[field]
+        values = matrix[:, index]
+        ahead = np.minimum(np.append(kinks, high)[np.searchsorted(kinks, values, side='right')], high)
+        behind = np.maximum(np.insert(kinks, 0, low)[np.searchsorted(kinks, values, side='left')], low)
+        lengths[:, index] = np.where(directions[:, index] > 0, ahead - values, values - behind)
+    return np.maximum(lengths, 0)
+
+
+def next_viability_rating(analyzer, score):
+    next_rating = None
+    for rating, threshold in analyzer.VIABILITY_RATINGS:
+        if score >= threshold:
+            break
+        next_rating = (rating, threshold)
+    return next_rating
+
+
+def analyze_sensitivity(analyzer, data):
+    plan = analyzer.plan
+    scores = {category: analyzer.category_analyzers[category](data) for category in plan.categories}
+    overall = analyzer._weighted_score(scores)
+    matrix = plan.record_vector(data)[None, :]
+    impacts, slopes, directions = leverage(analyzer, matrix)
+    lengths = piece_lengths(plan, matrix, directions)
+    next_rating = next_viability_rating(analyzer, overall)
+
+    inputs = []
+    for index in np.argsort(-impacts[0], kind='stable'):
+        field, slope, direction = plan.fields[index], slopes[0, index], directions[0, index]
+        change = None
+        if next_rating is not None and slope > 0:
+            # Only reported when the input alone gets there without leaving
+            # its current linear piece, where the slope is exact
+            change = float((next_rating[1] - overall) / slope * direction)
+            if abs(change) > lengths[0, index]:
+                change = None
+        inputs.append({
+            'field': field,
+            'direction': 'increase' if direction > 0 else 'decrease',
+            'slope': float(slope),
+            'impact': float(impacts[0, index]),
+            'change_to_next_rating': change
+        })
+    return {
+        'overall_score': overall,
+        'next_rating': next_rating and next_rating[0],
+        'gap': next_rating and next_rating[1] - overall,
+        'inputs': inputs
+    }
+
+
+def top_leverage(analyzer, frame):
+    import pandas as pd
+
+    impacts, _, directions = leverage(analyzer, analyzer.plan.frame_matrix(frame))
+    best = impacts.argmax(axis=1)
+    rows = np.arange(len(frame))
+    fields = np.array(analyzer.plan.fields, dtype=object)[best]
+    impact = impacts[rows, best]
+    return pd.DataFrame({
+        'top_leverage_field': np.where(impact > 0, fields, None),
+        'top_leverage_direction': np.where(impact <= 0, None,
+                                           np.where(directions[rows, best] > 0, 'increase', 'decrease')),
+        'top_leverage_impact': np.round(impact, 4)
+    }, index=frame.index)
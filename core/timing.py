@@ -0,0 +1,146 @@
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds in seconds; an implicit +Inf bucket follows
+BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+METRIC_NAME = 'business_analyzer_stage_seconds'
+NULL_STAGE = contextlib.nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket holding the q-th observation,
+        # the same estimate Prometheus' histogram_quantile makes
+        if not self.count:
+            return float('nan')
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class _Stage:
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timings.observe(self.name, time.perf_counter() - self.start)
+
+
+class StageTimings:
+    # Per-stage latency histograms, shared by every caller in the process.
+    # Disabled timings hand out a shared no-op context manager and leave
+    # functions unwrapped, so the hooks cost nothing unless switched on
+    def __init__(self, enabled=False, buckets=BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def stage(self, name):
+        return _Stage(self, name) if self.enabled else NULL_STAGE
+
+    def timed(self, name, function):
+        if not self.enabled:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - start)
+        return wrapper
+
+    def instrument(self, obj, names):
+        # Shadow obj's methods with timed wrappers on the instance itself, so
+        # other instances of the class are untouched
+        if self.enabled:
+            for name in names:
+                setattr(obj, name, self.timed(name, getattr(obj, name)))
+        return obj
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def summary(self):
+        # One row per stage, slowest total first; times in milliseconds
+        with self.lock:
+            histograms = list(self.histograms.items())
+        rows = [{
+            'stage': name,
+            'count': histogram.count,
+            'total_ms': histogram.sum * 1000,
+            'mean_ms': histogram.sum / histogram.count * 1000,
+            'p50_ms': histogram.quantile(0.5) * 1000,
+            'p90_ms': histogram.quantile(0.9) * 1000,
+            'p99_ms': histogram.quantile(0.99) * 1000
+        } for name, histogram in histograms if histogram.count]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def prometheus(self):
+        # Prometheus text exposition format, one labelled histogram per stage
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+            lines = [f"# HELP {METRIC_NAME} Time spent in each analysis stage",
+                     f"# TYPE {METRIC_NAME} histogram"]
+            for name, histogram in histograms:
+                label = name.replace('\\', '\\\\').replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {histogram.sum!r}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        # Written to a temporary file and renamed, so a scraper reading the
+        # file (e.g. node_exporter's textfile collector) never sees half of it
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as f:
+            f.write(self.prometheus())
+        os.replace(temporary, path)
+
+
+# Switched on with STAGE_TIMING=1; STAGE_TIMING_EXPORT names the Prometheus
+# text file the app rewrites after each run
+STAGE_TIMINGS = StageTimings(enabled=os.environ.get('STAGE_TIMING', '') not in ('', '0'))
+STAGE_TIMING_EXPORT = os.environ.get('STAGE_TIMING_EXPORT')
@@ -0,0 +1,88 @@
+import numpy as np
+
+from core.scoring_plan import FIELD_RANGES
+
+# Relative standard deviation of an input at perfect (1.0) and no (0.0) data
+# quality; quality in between interpolates linearly
+MIN_SPREAD = 0.02
+MAX_SPREAD = 0.25
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def input_spreads(analyzer, data):
+    plan = analyzer.plan
+    quality = {category: analyzer.recommendation_analyzer.calculate_data_quality_score(data, category)
+               for category in plan.categories}
+    spreads = np.empty(len(plan.fields))
+    for index, field in enumerate(plan.fields):
+        # A field feeding several categories gets the best quality among them
+        field_quality = min(1, max(quality[category] for category in plan.field_categories[field]))
+        spreads[index] = MAX_SPREAD - (MAX_SPREAD - MIN_SPREAD) * field_quality
+    return spreads
+
+
+def _present(value):
+    # Whether record_vector would read the value itself rather than a 0
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return False
+    return value == value
+
+
+def simulate_scores(analyzer, data, samples=20000, seed=0):
+    plan = analyzer.plan
+    rng = np.random.default_rng(seed)
+    values = plan.record_vector(data)
+    present = np.array([_present(data.get(field)) for field in plan.fields])
+    guarded = np.zeros(len(plan.fields), dtype=bool)
+    for criterion, field in enumerate(plan.criterion_field):
+        guarded[field] |= plan.normalizers[plan.criterion_normalizer[criterion]].guard
+    # Draws stay inside the field's range (widened to include the input) and,
+    # for guarded inputs, on the input's side of the jump at 0
+    low = np.array([FIELD_RANGES[field][0] for field in plan.fields], dtype=float)
+    high = np.array([FIELD_RANGES[field][1] for field in plan.fields], dtype=float)
+    low = np.where(guarded & (values > 0), np.maximum(low, np.finfo(float).tiny), np.minimum(low, values))
+    high = np.where(guarded & (values <= 0), np.minimum(high, 0), np.maximum(high, values))
+
+    # Noise scales with the value itself, with a floor of 1% of the field's
+    # range so inputs sitting at 0 still vary; inputs that weren't given
+    # don't vary at all
+    scale = np.maximum(np.abs(values), 0.01 * (high - low)) * input_spreads(analyzer, data)
+    scale[~present] = 0
+    draws = values + rng.standard_normal((samples, len(values))) * scale
+    np.clip(draws, low, high, out=draws)
+    return plan.score_matrix(draws)
+
+
+def simulate_report(analyzer, data, samples=20000, seed=0, percentiles=PERCENTILES):
+    scores = simulate_scores(analyzer, data, samples, seed)
+    overall = analyzer._weighted_score(scores)
+    return {
+        'samples': samples,
+        'overall_score': _bands(overall, percentiles),
+        'category_scores': {category: _bands(values, percentiles) for category, values in scores.items()},
+        'viability_probabilities': _probabilities(analyzer._viability_rating_array(overall)),
+        'scalability_probabilities': _probabilities(analyzer._scalability_rating_array(scores))
+    }
+
+
+def simulate_batch(analyzer, frame, samples=10000, seed=0, percentiles=PERCENTILES):
+    # One independent, reproducible stream per company
+    seeds = np.random.SeedSequence(seed).spawn(len(frame))
+    return [simulate_report(analyzer, record, samples, np.random.default_rng(company_seed), percentiles)
+            for record, company_seed in zip(frame.to_dict('records'), seeds)]
+
+
+def describe_probabilities(probabilities):
+    return ", ".join(f"{p:.0%} {rating}" for rating, p in probabilities.items())
+
+
+def _bands(values, percentiles):
+    return {f'p{p}': round(float(v), 2) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+
+
+def _probabilities(ratings):
+    labels, counts = np.unique(ratings, return_counts=True)
+    order = np.argsort(-counts, kind='stable')
+    return {str(labels[i]): counts[i].item() / len(ratings) for i in order}
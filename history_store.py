@@ -0,0 +1,268 @@
+import argparse
+import contextlib
+import fcntl
+import os
+import re
+import sys
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from core.analysis import BusinessAnalysisTool
+
+# Deltas kept per score column; the ring buffer holds one more month than the
+# longest window so the month being written never overwrites the one it's
+# compared against
+DELTA_MONTHS = (3, 6, 12)
+WINDOW = max(DELTA_MONTHS) + 1
+ROW_GROUP_SIZE = 1024
+# Parts are merged once there are more than this many, which bounds the
+# files a company scan has to open
+MAX_PARTS = 12
+
+
+PERIOD_PATTERN = re.compile(r'(\d{4})-(\d{2})(?:$|[-T ])')
+
+
+def month_ordinal(period):
+    # 'YYYY-MM' (or a date/timestamp starting with one) to year * 12 + month - 1
+    match = PERIOD_PATTERN.match(str(period))
+    if match is None or not 1 <= int(match.group(2)) <= 12:
+        raise ValueError(f"Period must be a YYYY-MM month, got {period!r}")
+    return int(match.group(1)) * 12 + int(match.group(2)) - 1
+
+
+class HistoryStore:
+    # Append-only history of scored reports keyed by (company, period), where
+    # period is a 'YYYY-MM' month. Each append writes one Parquet part sorted
+    # by company, so a company scan only reads the row groups whose company
+    # statistics cover it.
+    # Rolling 3/6/12-month deltas are written with each row, computed from a
+    # small per-company ring buffer of the last WINDOW months (state.npz)
+    # rather than by reading history back.
+    # Several processes (the app, the CLI) may share one store: appends and
+    # compactions hold an exclusive lock on the directory and reload the
+    # state first, so a writer never allocates from a stale copy of it
+    def __init__(self, root, score_columns):
+        self.root = root
+        self.score_columns = tuple(score_columns)
+        os.makedirs(root, exist_ok=True)
+        self.state_path = os.path.join(root, 'state.npz')
+        self.lock_path = os.path.join(root, '.lock')
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        # Reload the state if another writer has replaced it since it was read
+        version = self._state_version()
+        if not force and version == self.state_version:
+            return
+        if version is not None:
+            with np.load(self.state_path, allow_pickle=False) as state:
+                self.companies = state['companies'].tolist()
+                self.months = state['months']
+                self.values = state['values']
+                self.sequence = int(state['sequence'])
+        else:
+            self.companies = []
+            self.months = np.full((0, WINDOW), -1, dtype=np.int64)
+            self.values = np.full((0, WINDOW, len(self.score_columns)), np.nan)
+            self.sequence = 0
+        self.company_index = {company: i for i, company in enumerate(self.companies)}
+        self.state_version = version
+
+    def _state_version(self):
+        # Every save replaces the file, so its inode changes along with its mtime
+        try:
+            stat = os.stat(self.state_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @contextlib.contextmanager
+    def lock(self, shared=False):
+        # Appends and compactions take it exclusively; reads of the parts
+        # share it so a compaction can't remove a part mid-read
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def parts(self):
+        return sorted(os.path.join(self.root, name) for name in os.listdir(self.root)
+                      if name.startswith('part-') and name.endswith('.parquet'))
+
+    def append(self, period, frame, company_column='company'):
+        # frame: one row per company with its inputs and score columns
+        month = month_ordinal(period)
+        with self.lock():
+            self.refresh(force=True)
+            rows = self._append(month, frame, company_column)
+            if len(self.parts()) > MAX_PARTS:
+                self._compact()
+        return rows
+
+    def _append(self, month, frame, company_column):
+        companies = frame[company_column].astype(str).to_numpy()
+        rows = self._company_rows(companies)
+        scores = frame[list(self.score_columns)].to_numpy(dtype=float)
+
+        history = frame.drop(columns=[company_column]).copy()
+        # Integer inputs are stored as float so every part keeps one schema
+        for column in history.columns:
+            if history[column].dtype.kind in 'iu':
+                history[column] = history[column].astype(float)
+        history.insert(0, 'company', companies)
+        history.insert(1, 'period', f"{month // 12:04d}-{month % 12 + 1:02d}")
+        for months_back in DELTA_MONTHS:
+            slot = (month - months_back) % WINDOW
+            known = self.months[rows, slot] == month - months_back
+            previous = np.where(known[:, None], self.values[rows, slot], np.nan)
+            for j, column in enumerate(self.score_columns):
+                history[f'{column}_delta_{months_back}m'] = scores[:, j] - previous[:, j]
+
+        # A late, older period must not evict a newer month sharing its slot
+        slot = month % WINDOW
+        newer = self.months[rows, slot] > month
+        self.months[rows[~newer], slot] = month
+        self.values[rows[~newer], slot] = scores[~newer]
+
+        self.sequence += 1
+        history['sequence'] = self.sequence
+        history = history.sort_values('company', kind='stable')
+        table = pa.Table.from_pandas(history, preserve_index=False)
+        # The suffix keeps part names unique even if two writers ever agree on a sequence
+        self._write(table, os.path.join(self.root, f'part-{self.sequence:08d}-{uuid.uuid4().hex[:8]}.parquet'))
+        self._save_state()
+        return len(history)
+
+    def company_history(self, company, start=None, end=None):
+        # All rows for one company ordered by period; a period written more
+        # than once resolves to its latest append
+        company = str(company)
+        with self.lock(shared=True):
+            tables = [table for table in (self._read_company(path, company) for path in self.parts())
+                      if table.num_rows]
+        if not tables:
+            return pd.DataFrame()
+        history = pa.concat_tables(tables, promote_options='default').to_pandas()
+        if start is not None:
+            history = history[history['period'] >= str(start)[:7]]
+        if end is not None:
+            history = history[history['period'] <= str(end)[:7]]
+        history = history.sort_values(['period', 'sequence']).drop_duplicates('period', keep='last')
+        return history.reset_index(drop=True)
+
+    def latest(self):
+        # Latest known scores per company, straight from the ring buffer
+        if not self.companies:
+            return pd.DataFrame(columns=['company', 'period', *self.score_columns])
+        slots = self.months.argmax(axis=1)
+        rows = np.arange(len(self.companies))
+        months = self.months[rows, slots]
+        latest = pd.DataFrame(self.values[rows, slots], columns=self.score_columns)
+        latest.insert(0, 'company', self.companies)
+        latest.insert(1, 'period', [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in months])
+        return latest
+
+    def compact(self):
+        # Merge every part into one, sorted by (company, period) and with
+        # superseded appends dropped; history itself is unchanged
+        with self.lock():
+            self._compact()
+
+    def _compact(self):
+        parts = self.parts()
+        if len(parts) < 2:
+            return
+        history = pa.concat_tables([pq.read_table(path) for path in parts], promote_options='default').to_pandas()
+        history = (history.sort_values(['company', 'period', 'sequence'])
+                   .drop_duplicates(['company', 'period'], keep='last'))
+        self._write(pa.Table.from_pandas(history, preserve_index=False), parts[-1])
+        for path in parts[:-1]:
+            os.remove(path)
+
+    def _read_company(self, path, company):
+        parquet = pq.ParquetFile(path)
+        column = parquet.schema_arrow.get_field_index('company')
+        groups = []
+        for index in range(parquet.metadata.num_row_groups):
+            statistics = parquet.metadata.row_group(index).column(column).statistics
+            if statistics is None or not statistics.has_min_max or statistics.min <= company <= statistics.max:
+                groups.append(index)
+        table = parquet.read_row_groups(groups)
+        return table.filter(pc.equal(table['company'], company))
+
+    def _company_rows(self, companies):
+        new = [company for company in dict.fromkeys(companies) if company not in self.company_index]
+        if new:
+            for company in new:
+                self.company_index[company] = len(self.companies)
+                self.companies.append(company)
+            self.months = np.concatenate([self.months, np.full((len(new), WINDOW), -1, dtype=np.int64)])
+            self.values = np.concatenate(
+                [self.values, np.full((len(new), WINDOW, len(self.score_columns)), np.nan)])
+        return np.array([self.company_index[company] for company in companies], dtype=np.intp)
+
+    def _write(self, table, path):
+        temporary = path + '.tmp'
+        pq.write_table(table, temporary, row_group_size=ROW_GROUP_SIZE)
+        os.replace(temporary, path)
+
+    def _save_state(self):
+        temporary = self.state_path + '.tmp.npz'
+        np.savez(temporary, companies=np.array(self.companies, dtype=str), months=self.months,
+                 values=self.values, sequence=self.sequence)
+        os.replace(temporary, self.state_path)
+        self.state_version = self._state_version()
+
+
+def score_columns(analyzer):
+    return ['overall_score'] + [f'{category}_score' for category in analyzer.plan.categories]
+
+
+def append_scored(store, analyzer, period, frame, company_column='company'):
+    scored = analyzer.score_batch(frame)
+    inputs = [field for field in analyzer.plan.fields if field in frame]
+    extra = [column for column in ('industry',) if column in frame]
+    return store.append(period, pd.concat([frame[[company_column] + extra + inputs], scored], axis=1),
+                        company_column)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Score a monthly company export and append it to the history store")
+    parser.add_argument('root', help="History store directory")
+    parser.add_argument('input', help="Input .csv or .parquet file, one row per company")
+    parser.add_argument('--period', required=True, help="Month the export covers, as YYYY-MM")
+    parser.add_argument('--company-column', default='company')
+    parser.add_argument('--compact', action='store_true', help="Merge all parts after appending")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        month_ordinal(args.period)
+    except ValueError as error:
+        parser.error(str(error))
+    frame = pd.read_parquet(args.input) if args.input.endswith('.parquet') else pd.read_csv(args.input)
+    analyzer = BusinessAnalysisTool()
+    store = HistoryStore(args.root, score_columns(analyzer))
+
+    start = time.perf_counter()
+    rows = append_scored(store, analyzer, args.period, frame, args.company_column)
+    if args.compact:
+        store.compact()
+    print(f"Appended {rows:,} companies for {args.period} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
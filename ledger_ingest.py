@@ -0,0 +1,281 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+from core.scoring_plan import FIELD_RANGES
+from history_store import month_ordinal
+
+# General-ledger exports need date and account columns plus either debit and
+# credit or a signed amount (debit positive); an account_class column, when
+# present, takes precedence over the account number ranges below. Invoice
+# exports need invoice_date, paid_date (empty while open) and amount
+LEDGER_COLUMNS = ('date', 'account', 'account_class', 'debit', 'credit', 'amount')
+INVOICE_COLUMNS = ('invoice_date', 'paid_date', 'amount')
+
+# (first account, last account, class) for a conventionally numbered chart of accounts
+ACCOUNT_RANGES = (
+    (1000, 1099, 'cash'),
+    (1100, 1199, 'receivables'),
+    (1200, 1299, 'inventory'),
+    (1300, 1499, 'other_current_assets'),
+    (1500, 1999, 'noncurrent_assets'),
+    (2000, 2199, 'current_liabilities'),
+    (2200, 2299, 'short_term_debt'),
+    (2300, 2499, 'current_liabilities'),
+    (2500, 2999, 'long_term_debt'),
+    (3000, 3999, 'equity'),
+    (4000, 4999, 'revenue'),
+    (5000, 5999, 'cost_of_goods_sold'),
+    (6000, 7999, 'operating_expenses'),
+    (8000, 9999, 'other_expenses')
+)
+# Classes carried as debit minus credit; the others as credit minus debit
+DEBIT_CLASSES = {'cash', 'receivables', 'inventory', 'other_current_assets', 'noncurrent_assets',
+                 'cost_of_goods_sold', 'operating_expenses', 'other_expenses'}
+# Bytes of CSV (or rows of Parquet) read per chunk, which bounds memory
+CSV_BLOCK_SIZE = 16 << 20
+PARQUET_BATCH_ROWS = 1 << 20
+
+
+def read_batches(source, columns):
+    # Record batches holding whichever of columns the file has, from a .csv
+    # or .parquet path or file object
+    name = str(getattr(source, 'name', source))
+    if name.endswith('.parquet'):
+        parquet = pq.ParquetFile(source)
+        present = [column for column in columns if column in parquet.schema_arrow.names]
+        yield from parquet.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=present)
+        return
+    # The header is read first so only the wanted columns are parsed
+    header = pv.open_csv(source, read_options=pv.ReadOptions(block_size=1 << 16))
+    present = [column for column in columns if column in header.schema.names]
+    header.close()
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    reader = pv.open_csv(source, read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+                         convert_options=pv.ConvertOptions(include_columns=present,
+                                                           column_types={'account_class': pa.string()}))
+    yield from reader
+
+
+def month_ordinals(column):
+    # Months since year 0 (year * 12 + month - 1), -1 where the date is missing or unparseable
+    if not pa.types.is_timestamp(column.type) and not pa.types.is_date(column.type):
+        column = pc.cast(column, pa.string())
+        column = pc.strptime(pc.utf8_slice_codeunits(column, 0, 10), format='%Y-%m-%d', unit='s',
+                             error_is_null=True)
+    months = pc.add(pc.multiply(pc.year(column), 12), pc.subtract(pc.month(column), 1))
+    return months.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int64)
+
+
+def _numbers(batch, column):
+    if column not in batch.schema.names:
+        return np.zeros(batch.num_rows)
+    return pc.cast(batch.column(column), pa.float64(), safe=False).fill_null(0).to_numpy(zero_copy_only=False)
+
+
+class MonthlyAccumulator:
+    # One-pass groupby-sum by (month, key): each batch is reduced with a
+    # single bincount and folded into one fixed-width row per month, so
+    # memory depends on the months covered, not on the rows read
+    def __init__(self, width):
+        self.width = width
+        self.months = {}
+
+    def add(self, months, keys, weights):
+        unique, inverse = np.unique(months, return_inverse=True)
+        sums = np.bincount(inverse * self.width + keys, weights=weights,
+                           minlength=len(unique) * self.width).reshape(len(unique), self.width)
+        for month, row in zip(unique.tolist(), sums):
+            if month in self.months:
+                self.months[month] += row
+            else:
+                self.months[month] = row
+
+    def table(self):
+        # Months sorted ascending, and a month x key matrix of sums
+        months = np.array(sorted(self.months), dtype=np.int64)
+        values = np.array([self.months[month] for month in months.tolist()]).reshape(len(months), self.width)
+        return months, values
+
+
+class LedgerIngest:
+    # Streams GL and invoice exports into monthly sums per account class,
+    # then derives the financial_health inputs from them
+    def __init__(self, account_ranges=ACCOUNT_RANGES):
+        self.classes = tuple(dict.fromkeys(account_class for _, _, account_class in account_ranges))
+        self.class_index = {account_class: k for k, account_class in enumerate(self.classes)}
+        self.range_starts = np.array([first for first, _, _ in account_ranges], dtype=float)
+        self.range_ends = np.array([last for _, last, _ in account_ranges], dtype=float)
+        self.range_classes = np.array([self.class_index[account_class] for _, _, account_class in account_ranges])
+        self.signs = np.array([1.0 if account_class in DEBIT_CLASSES else -1.0 for account_class in self.classes])
+        self.ledger = MonthlyAccumulator(len(self.classes))
+        # Per invoice month: amount paid, amount x days to payment
+        self.invoices = MonthlyAccumulator(2)
+        self.stats = {'ledger_rows': 0, 'invoice_rows': 0, 'skipped_rows': 0, 'bytes': 0, 'seconds': 0.0}
+
+    def add_ledger(self, source):
+        start = time.perf_counter()
+        for batch in read_batches(source, LEDGER_COLUMNS):
+            months = month_ordinals(batch.column('date'))
+            if 'amount' in batch.schema.names:
+                amounts = _numbers(batch, 'amount')
+            else:
+                amounts = _numbers(batch, 'debit') - _numbers(batch, 'credit')
+            classes = self._account_classes(batch)
+            valid = (months >= 0) & (classes >= 0)
+            self.ledger.add(months[valid], classes[valid], amounts[valid])
+            self._count(batch, 'ledger_rows', valid)
+        self.stats['seconds'] += time.perf_counter() - start
+
+    def add_invoices(self, source):
+        start = time.perf_counter()
+        for batch in read_batches(source, INVOICE_COLUMNS):
+            invoiced = month_ordinals(batch.column('invoice_date'))
+            days = pc.days_between(self._dates(batch.column('invoice_date')),
+                                   self._dates(batch.column('paid_date'))).to_numpy(zero_copy_only=False)
+            paid = (invoiced >= 0) & ~np.isnan(days.astype(float))
+            amounts = _numbers(batch, 'amount')[paid]
+            months = np.repeat(invoiced[paid], 2)
+            keys = np.tile([0, 1], paid.sum())
+            weights = np.column_stack([amounts, amounts * days[paid].astype(float)]).ravel()
+            self.invoices.add(months, keys, weights)
+            # Open invoices are expected, so only undated rows count as skipped
+            self._count(batch, 'invoice_rows', invoiced >= 0)
+        self.stats['seconds'] += time.perf_counter() - start
+
+    def _count(self, batch, rows, valid):
+        self.stats[rows] += batch.num_rows
+        self.stats['skipped_rows'] += int((~valid).sum())
+        self.stats['bytes'] += batch.nbytes
+
+    @staticmethod
+    def _dates(column):
+        if pa.types.is_timestamp(column.type) or pa.types.is_date(column.type):
+            return pc.cast(column, pa.timestamp('s'))
+        column = pc.utf8_slice_codeunits(pc.cast(column, pa.string()), 0, 10)
+        return pc.strptime(column, format='%Y-%m-%d', unit='s', error_is_null=True)
+
+    def _account_classes(self, batch):
+        if 'account_class' in batch.schema.names:
+            # Class names are mapped once per distinct value, not per row
+            encoded = pc.dictionary_encode(batch.column('account_class'))
+            lookup = np.array([self.class_index.get(name, -1) for name in encoded.dictionary.to_pylist()] + [-1],
+                              dtype=np.int64)
+            classes = lookup[encoded.indices.fill_null(len(encoded.dictionary)).to_numpy(zero_copy_only=False)]
+            if (classes >= 0).all() or 'account' not in batch.schema.names:
+                return classes
+        else:
+            classes = np.full(batch.num_rows, -1, dtype=np.int64)
+        accounts = pc.cast(batch.column('account'), pa.float64(), safe=False).to_numpy(zero_copy_only=False)
+        ranges = np.searchsorted(self.range_starts, accounts, side='right') - 1
+        in_range = (ranges >= 0) & (accounts <= self.range_ends[np.maximum(ranges, 0)])
+        by_number = np.where(in_range, self.range_classes[np.maximum(ranges, 0)], -1)
+        return np.where(classes >= 0, classes, by_number)
+
+    def financial_inputs(self, period=None, months=12):
+        # analyze_financial_health inputs as of the end of period ('YYYY-MM',
+        # default the last month in the ledger): balances at that month end,
+        # flows over the trailing `months` months (fewer if the ledger is
+        # shorter), annualized. Fields the ledger can't support are left out
+        ledger_months, movements = self.ledger.table()
+        if not len(ledger_months):
+            return {}
+        # A malformed period raises ValueError rather than being misread
+        end = ledger_months[-1] if period is None else month_ordinal(period)
+        start = max(end - months + 1, ledger_months[0])
+        covered = end - start + 1
+        if covered <= 0:
+            return {}
+
+        # Balances assume the export starts with (or from) opening balances
+        balances = np.cumsum(movements * self.signs, axis=0)
+        window = (ledger_months >= start) & (ledger_months <= end)
+        closing = balances[np.searchsorted(ledger_months, end, side='right') - 1]
+        flows = (movements[window] * self.signs).sum(axis=0) * 12 / covered
+
+        def amount(values, *classes):
+            return sum(values[self.class_index[c]] for c in classes if c in self.class_index)
+
+        def average(*classes):
+            # Month-end balance averaged over the window; months without
+            # movements keep the previous balance
+            rows = np.searchsorted(ledger_months, np.arange(start, end + 1), side='right') - 1
+            return np.mean([amount(balances[row], *classes) if row >= 0 else 0.0 for row in rows])
+
+        inputs = {}
+        revenue = amount(flows, 'revenue')
+        if revenue > 0:
+            gross_profit = revenue - amount(flows, 'cost_of_goods_sold')
+            operating_income = gross_profit - amount(flows, 'operating_expenses')
+            inputs['gross_profit_margin'] = gross_profit / revenue * 100
+            inputs['operating_margin'] = operating_income / revenue * 100
+            inputs['net_profit_margin'] = (operating_income - amount(flows, 'other_expenses')) / revenue * 100
+        current_liabilities = amount(closing, 'current_liabilities', 'short_term_debt')
+        if current_liabilities > 0:
+            current_assets = amount(closing, 'cash', 'receivables', 'inventory', 'other_current_assets')
+            inputs['current_ratio'] = current_assets / current_liabilities
+            inputs['quick_ratio'] = (current_assets - amount(closing, 'inventory')) / current_liabilities
+        equity = amount(closing, 'equity')
+        if equity > 0:
+            inputs['debt_to_equity'] = amount(closing, 'short_term_debt', 'long_term_debt') / equity
+        average_inventory = average('inventory')
+        if average_inventory > 0:
+            inputs['inventory_turnover'] = amount(flows, 'cost_of_goods_sold') / average_inventory
+
+        invoice_months, invoice_sums = self.invoices.table()
+        paid = invoice_sums[(invoice_months >= start) & (invoice_months <= end)].sum(axis=0)
+        if paid[0] > 0:
+            # Amount-weighted days from invoice to payment
+            inputs['days_sales_outstanding'] = paid[1] / paid[0]
+        elif revenue > 0 and average('receivables') > 0:
+            # Without receivables there is nothing to base DSO on; 0 would read as perfect
+            inputs['days_sales_outstanding'] = average('receivables') / revenue * 365
+
+        return {field: round(float(np.clip(value, *FIELD_RANGES[field])), 2) for field, value in inputs.items()}
+
+    def throughput(self):
+        rows = self.stats['ledger_rows'] + self.stats['invoice_rows']
+        seconds = max(self.stats['seconds'], 1e-9)
+        return {'rows': rows, 'seconds': round(self.stats['seconds'], 3), 'rows_per_second': rows / seconds,
+                'megabytes_per_second': self.stats['bytes'] / seconds / 1e6, 'skipped_rows': self.stats['skipped_rows']}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Derive financial inputs from general-ledger and invoice exports")
+    parser.add_argument('ledger', nargs='+', help="General-ledger .csv or .parquet exports")
+    parser.add_argument('--invoices', nargs='*', default=[], help="Invoice .csv or .parquet exports")
+    parser.add_argument('--period', help="Month to report as of, YYYY-MM (default: the last in the ledger)")
+    parser.add_argument('--months', type=int, default=12, help="Trailing months the flow ratios cover")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.period is not None:
+        try:
+            month_ordinal(args.period)
+        except ValueError as error:
+            parser.error(str(error))
+    ingest = LedgerIngest()
+    for path in args.ledger:
+        ingest.add_ledger(path)
+    for path in args.invoices:
+        ingest.add_invoices(path)
+    print(json.dumps(ingest.financial_inputs(args.period, args.months), indent=2))
+    stats = ingest.throughput()
+    print(f"Read {stats['rows']:,} rows in {stats['seconds']:.2f}s: {stats['rows_per_second']:,.0f} rows/sec, "
+          f"{stats['megabytes_per_second']:,.0f} MB/sec ({stats['skipped_rows']:,} skipped)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
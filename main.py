@@ -1,394 +1,145 @@
+import datetime
+import hashlib
+import json
+import os
+
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from data_quality import RecommendationAnalyzer 
-st.set_page_config(
-    page_title="Business Analysis Tool", 
-    layout="wide",
-    menu_items={
-        'Get Help': None,
-        'Report a bug': None,
-        'About': None
-    }
-)
-
-class BusinessAnalysisTool:
-    def __init__(self):
-        self.score_weights = {
-            'marketing': 0.15,
-            'sales': 0.20,
-            'product_delivery': 0.20,
-            'operational_efficiency': 0.15,
-            'financial_health': 0.20,
-            'people': 0.10
-        }
-    
-    def analyze_marketing(self, data):
-        metrics = {
-            'audience_metrics': {
-                'score': 0,
-                'criteria': {
-                    'total_addressable_audience': self._normalize_audience(data.get('total_addressable_audience', 0)),
-                    'campaign_effectiveness': data.get('campaign_effectiveness', 0) / 10,
-                    'conversion_rate': data.get('conversion_rate', 0) / 100 * 10
-                }
-            },
-            'performance_metrics': {
-                'score': 0,
-                'criteria': {
-                    'cac': self._normalize_cac(data.get('customer_acquisition_cost', 0)),
-                    'marketing_roi': self._normalize_roi(data.get('marketing_roi', 0))
-                }
-            }
-        }
-        return self._calculate_category_score(metrics)
-
-    def analyze_sales(self, data):
-        metrics = {
-            'revenue_metrics': {
-                'score': 0,
-                'criteria': {
-                    'revenue_growth': data.get('revenue_growth', 0) / 100 * 10,
-                    'recurring_revenue': data.get('recurring_revenue_percentage', 0) / 100 * 10,
-                    'average_deal_size': self._normalize_deal_size(data.get('average_deal_size', 0))
-                }
-            },
-            'pipeline_health': {
-                'score': 0,
-                'criteria': {
-                    'conversion_rate': data.get('pipeline_conversion', 0) / 100 * 10,
-                    'sales_cycle': self._normalize_sales_cycle(data.get('sales_cycle_length', 0)),
-                    'pipeline_coverage': data.get('pipeline_coverage', 0) / 4 * 10
-                }
-            },
-            'customer_metrics': {
-                'score': 0,
-                'criteria': {
-                    'customer_retention': data.get('retention_rate', 0) / 100 * 10,
-                    'customer_satisfaction': data.get('satisfaction_score', 0) / 100 * 10
-                }
-            }
-        }
-        return self._calculate_category_score(metrics)
-
-    def analyze_product_delivery(self, data):
-        metrics = {
-            'quality_metrics': {
-                'score': 0,
-                'criteria': {
-                    'defect_rate': (100 - data.get('defect_rate', 0)) / 100 * 10,
-                    'customer_satisfaction': data.get('product_satisfaction', 0) / 100 * 10,
-                    'service_level': data.get('sla_compliance', 0) / 100 * 10
-                }
-            },
-            'delivery_efficiency': {
-                'score': 0,
-                'criteria': {
-                    'on_time_delivery': data.get('on_time_delivery', 0) / 100 * 10,
-                    'delivery_cost': self._normalize_delivery_cost(data.get('delivery_cost', 0)),
-                    'cycle_time': self._normalize_cycle_time(data.get('cycle_time', 0))
-                }
-            },
-            'scalability': {
-                'score': 0,
-                'criteria': {
-                    'capacity_utilization': self._normalize_utilization(data.get('capacity_utilization', 0)),
-                    'automation_level': data.get('automation_percentage', 0) / 100 * 10
-                }
-            }
-        }
-        return self._calculate_category_score(metrics)
-
-    def analyze_operational_efficiency(self, data):
-        metrics = {
-            'process_efficiency': {
-                'score': 0,
-                'criteria': {
-                    'process_automation': data.get('process_automation', 0) / 100 * 10,
-                    'resource_utilization': data.get('resource_utilization', 0) / 100 * 10,
-                    'error_rate': (100 - data.get('error_rate', 0)) / 100 * 10
-                }
-            },
-            'cost_efficiency': {
-                'score': 0,
-                'criteria': {
-                    'operating_margin': self._normalize_margin(data.get('operating_margin', 0)),
-                    'overhead_ratio': (100 - data.get('overhead_ratio', 0)) / 100 * 10,
-                    'cost_per_unit': self._normalize_unit_cost(data.get('cost_per_unit', 0))
-                }
-            },
-            'infrastructure': {
-                'score': 0,
-                'criteria': {
-                    'tech_stack': data.get('tech_stack_rating', 0) / 10,
-                    'scalability_rating': data.get('infrastructure_scalability', 0) / 10
-                }
-            }
-        }
-        return self._calculate_category_score(metrics)
-
-    def analyze_financial_health(self, data):
-        metrics = {
-            'profitability': {
-                'score': 0,
-                'criteria': {
-                    'gross_profit_margin': self._normalize_margin(data.get('gross_profit_margin', 0)),
-                    'net_profit_margin': self._normalize_margin(data.get('net_profit_margin', 0)),
-                    'operating_margin': self._normalize_margin(data.get('operating_margin', 0))
-                }
-            },
-            'liquidity': {
-                'score': 0,
-                'criteria': {
-                    'current_ratio': self._normalize_ratio(data.get('current_ratio', 0)),
-                    'quick_ratio': self._normalize_ratio(data.get('quick_ratio', 0)),
-                    'cash_flow_operations': self._normalize_cash_flow(data.get('cash_flow_operations', 0))
-                }
-            },
-            'efficiency': {
-                'score': 0,
-                'criteria': {
-                    'inventory_turnover': self._normalize_turnover(data.get('inventory_turnover', 0)),
-                    'days_sales_outstanding': self._normalize_dso(data.get('days_sales_outstanding', 0)),
-                    'debt_to_equity': self._normalize_leverage(data.get('debt_to_equity', 0))
-                }
-            }
-        }
-        return self._calculate_category_score(metrics)
-    def analyze_people(self, data):
-        metrics = {
-            'talent_metrics': {
-                'score': 0,
-                'criteria': {
-                    'employee_satisfaction': data.get('employee_satisfaction', 0) / 100 * 10,
-                    'retention_rate': data.get('employee_retention', 0) / 100 * 10,
-                    'skill_coverage': data.get('skill_coverage', 0) / 100 * 10
-                }
-            },
-            'leadership': {
-                'score': 0,
-                'criteria': {
-                    'experience': data.get('leadership_experience', 0) / 10,
-                    'succession_planning': data.get('succession_readiness', 0) / 10,
-                    'vision_clarity': data.get('vision_rating', 0) / 10
-                }
-            },
-            'culture': {
-                'score': 0,
-                'criteria': {
-                    'culture_score': data.get('culture_rating', 0) / 10,
-                    'innovation_index': data.get('innovation_rating', 0) / 10
-                }
-            }
-        }
-        return self._calculate_category_score(metrics)
-
-    def _calculate_category_score(self, metrics):
-        category_score = 0
-        for metric_group in metrics.values():
-            metric_group['score'] = sum(metric_group['criteria'].values()) / len(metric_group['criteria'])
-            category_score += metric_group['score']
-        return category_score / len(metrics)
-
-    def _normalize_cac(self, cac):
-        if cac <= 0: return 0
-        return min(10, max(0, 10 - (cac / 1000)))
-
-    def _normalize_roi(self, roi):
-        return min(10, max(0, roi / 30))
-
-    def _normalize_tam(self, tam):
-        if tam <= 0: return 0
-        return min(10, max(0, tam / 1e9))
-
-    def _normalize_deal_size(self, size):
-        if size <= 0: return 0
-        return min(10, max(0, size / 10000))
-
-    def _normalize_sales_cycle(self, cycle):
-        if cycle <= 0: return 0
-        return min(10, max(0, 10 - (cycle / 30)))
-
-    def _normalize_delivery_cost(self, cost):
-        if cost <= 0: return 0
-        return min(10, max(0, 10 - (cost / 1000)))
-
-    def _normalize_cycle_time(self, time):
-        if time <= 0: return 0
-        return min(10, max(0, 10 - (time / 30)))
-
-    def _normalize_utilization(self, utilization):
-        return min(10, max(0, utilization / 10))
-
-    def _normalize_margin(self, margin):
-        return min(10, max(0, margin / 10))
-
-    def _normalize_unit_cost(self, cost):
-        if cost <= 0: return 0
-        return min(10, max(0, 10 - (cost / 100)))
-
-    def _normalize_ratio(self, ratio):
-        if ratio <= 0: return 0
-        return min(10, max(0, ratio * 5))
-
-    def _normalize_audience(self, audience):
-        if audience <= 0: return 0
-        return min(10, max(0, (audience / 100000)))  # Scale based on audience size
-
-    def _normalize_cash_flow(self, cash_flow):
-        if cash_flow <= 0: return 0
-        return min(10, max(0, (cash_flow / 100000)))  # Scale based on cash flow amount
-
-    def _normalize_turnover(self, turnover):
-        if turnover <= 0: return 0
-        return min(10, max(0, (turnover / 12) * 10))  # 12 turns per year as benchmark
-
-    def _normalize_dso(self, dso):
-        if dso <= 0: return 0
-        return min(10, max(0, 10 - (dso / 30)))  # Lower DSO is better
-
-    def _normalize_leverage(self, ratio):
-        if ratio <= 0: return 0
-        return min(10, max(0, 10 - (ratio * 2)))  # Lower debt-to-equity is better
-    def generate_comprehensive_report(self, data):
-        scores = {
-            'marketing': self.analyze_marketing(data),
-            'sales': self.analyze_sales(data),
-            'product_delivery': self.analyze_product_delivery(data),
-            'operational_efficiency': self.analyze_operational_efficiency(data),
-            'financial_health': self.analyze_financial_health(data),
-            'people': self.analyze_people(data)
-        }
-
-        weighted_score = sum(scores[category] * self.score_weights[category] 
-                           for category in scores)
-
-        report = {
-            'overall_score': round(weighted_score, 2),
-            'category_scores': {k: round(v, 2) for k, v in scores.items()},
-            'viability_rating': self._get_viability_rating(weighted_score),
-            'scalability_rating': self._get_scalability_rating(scores),
-            'recommendations': self._generate_recommendations(scores),
-            'risk_assessment': self._assess_risks(scores)
-        }
-
-        return report
-
-    def _get_viability_rating(self, score):
-        if score >= 8.5: return "Excellent"
-        elif score >= 7: return "Strong"
-        elif score >= 5.5: return "Good"
-        elif score >= 4: return "Fair"
-        else: return "Poor"
+from core.analysis import BusinessAnalysisTool
+from core.incremental import IncrementalEvaluator
+from core.industry_benchmarks import get_benchmarks
+from core.optimizer import TargetOptimizer
+from core.peer_ranking import PEER_INDEX_PATH, PeerIndex
+from core.scoring_plan import FIELD_RANGES
+from core.sensitivity import analyze_sensitivity
+from core.timing import STAGE_TIMING_EXPORT, STAGE_TIMINGS
+from core.uncertainty import describe_probabilities, simulate_report
+from history_store import HistoryStore, append_scored, month_ordinal, score_columns
+from ledger_ingest import LedgerIngest
+from scenario_store import ScenarioStore, diff_scenarios
+
+# Bounds for the report/figure caches shared by every session on the server
+REPORT_CACHE_MAX_ENTRIES = 1024
+REPORT_CACHE_TTL = 3600
+HISTORY_PATH = os.environ.get(
+    'HISTORY_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'history'))
+SCENARIO_DB_PATH = os.environ.get(
+    'SCENARIO_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'scenarios.sqlite3'))
+# Peer percentile bands drawn behind the company on the radar, outer first
+RADAR_BANDS = ((10, 90), (25, 75))
+MAX_COMPETITORS = 20
+
+def inputs_cache_key(inputs):
+    canonical = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+@st.cache_resource
+def get_analyzer():
+    # The peer index is built offline (python -m core.peer_ranking) and only loaded here
+    peer_index = PeerIndex.load(PEER_INDEX_PATH) if os.path.exists(PEER_INDEX_PATH) else None
+    return BusinessAnalysisTool(peer_index=peer_index).instrument(STAGE_TIMINGS)
+
+@st.cache_resource
+def get_history_store():
+    return HistoryStore(HISTORY_PATH, score_columns(get_analyzer()))
+
+@st.cache_resource
+def get_scenario_store():
+    return ScenarioStore(SCENARIO_DB_PATH)
+
+# Keyed on the store's append sequence, so a new append invalidates it
+@st.cache_data(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL, show_spinner=False)
+def cached_company_history(company, sequence):
+    return get_history_store().company_history(company)
+
+@st.cache_data(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL, show_spinner=False)
+def cached_latest_scores(sequence):
+    return get_history_store().latest()
+
+@st.cache_resource
+def get_incremental_evaluator():
+    return IncrementalEvaluator(get_analyzer())
+
+# Shared across sessions like the other caches; on a miss the state is built
+# incrementally from the calling session's previous one, which only
+# re-evaluates the categories (and recommendations, risks and percentiles)
+# the changed inputs feed
+@st.cache_data(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL, show_spinner=False)
+def cached_report_state(inputs_key, _inputs, _previous):
+    evaluator = get_incremental_evaluator()
+    return evaluator.evaluate(_inputs) if _previous is None else evaluator.update(_previous, _inputs)
+
+def session_report(inputs_key, inputs):
+    # Each session keeps the state behind its last report to update from next
+    last = st.session_state.get('report_state')
+    if last is None or last[0] != inputs_key:
+        state = cached_report_state(inputs_key, inputs, None if last is None else last[1])
+        last = st.session_state['report_state'] = (inputs_key, state)
+    return last[1].report
+
+# Figures are cached as objects (not copied per hit like cache_data values);
+# st.plotly_chart only reads them, so sharing across sessions is safe
+@st.cache_resource(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL, show_spinner=False)
+def cached_charts(inputs_key, _report, _industry):
+    with STAGE_TIMINGS.stage('create_risk_gauge'):
+        gauge = create_risk_gauge(_report['overall_score'])
+    with STAGE_TIMINGS.stage('create_radar_chart'):
+        radar = create_radar_chart(_report['category_scores'], cached_radar_bands(_industry))
+    return gauge, radar
+
+@st.cache_resource(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL, show_spinner=False)
+def cached_competitor_radar(inputs_key, competitors, sequence, _report, _industry):
+    latest = cached_latest_scores(sequence).set_index('company')
+    categories = list(_report['category_scores'])
+    overlays = {company: dict(zip(categories, latest.loc[company, [f'{c}_score' for c in categories]]))
+                for company in competitors if company in latest.index}
+    with STAGE_TIMINGS.stage('create_radar_chart'):
+        return create_radar_chart(_report['category_scores'], cached_radar_bands(_industry), overlays)
+
+# Band polygons per industry, from the peer index's precomputed percentile
+# table; none without an index that holds category scores
+@st.cache_data(show_spinner=False)
+def cached_radar_bands(industry):
+    analyzer = get_analyzer()
+    peer_index = analyzer.peer_index
+    columns = [f'{category}_score' for category in analyzer.plan.categories]
+    if peer_index is None or any(column not in peer_index.column_index for column in columns):
+        return []
+    percentiles = [p for band in RADAR_BANDS for p in band]
+    values = peer_index.percentile_values(columns, percentiles)[peer_index._group(industry)]
+    theta = list(analyzer.plan.categories) + [analyzer.plan.categories[0]]
+    group = peer_index.industries[peer_index._group(industry)].replace('__all__', 'all industries')
+    bands = []
+    for b, (low, high) in enumerate(RADAR_BANDS):
+        lower = values[:, 2 * b].tolist()
+        upper = values[:, 2 * b + 1].tolist()
+        # One closed ring: out along the upper values, back along the lower
+        bands.append((f"{group} {low}th-{high}th percentile", theta + theta[::-1],
+                      upper + upper[:1] + (lower + lower[:1])[::-1]))
+    return bands
+@st.cache_data(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL, show_spinner=False)
+def cached_uncertainty(inputs_key, _inputs, samples, seed):
+    return simulate_report(get_analyzer(), _inputs, samples=samples, seed=seed)
+
+# Plotly is imported on first chart, not at startup
+def create_radar_chart(category_scores, bands=(), competitors=None):
+    import plotly.graph_objects as go
 
-    def _get_scalability_rating(self, scores):
-        key_scalability_factors = [
-            scores['operational_efficiency'],
-            scores['product_delivery'],
-            scores['financial_health']
-        ]
-        avg_scalability = sum(key_scalability_factors) / len(key_scalability_factors)
-
-        if avg_scalability >= 8.5: return "Highly Scalable"
-        elif avg_scalability >= 7: return "Scalable"
-        elif avg_scalability >= 5.5: return "Moderately Scalable"
-        elif avg_scalability >= 4: return "Limited Scalability"
-        else: return "Poor Scalability"
-
-    def _generate_recommendations(self, scores):
-        recommendations = []
-        for category, score in scores.items():
-            if score < 6:
-                recommendations.append(self._get_category_recommendation(category, score, scores))
-        return recommendations
-
-    def _get_category_recommendation(self, category, score, data):
-        analyzer = RecommendationAnalyzer()
-        quality_score = analyzer.calculate_data_quality_score(data, category)
-    
-        recommendations = []
-    
-        if category == 'marketing':
-            # Market Share Based Recommendations
-            market_share = data.get('market_share', 0)
-            industry = data.get('industry', 'General')
-            benchmark = self._get_industry_benchmark(industry, 'market_share')
-            
-            if market_share < benchmark:
-                if data.get('brand_recognition', 0) < 50:
-                    recommendations.append({
-                        'text': "Increase brand awareness through targeted digital marketing and PR campaigns",
-                        'priority': 'high'
-                    })
-                if data.get('customer_acquisition_cost', 0) > self._get_industry_benchmark(industry, 'cac'):
-                    recommendations.append({
-                        'text': "Optimize marketing channels to reduce customer acquisition costs",
-                        'priority': 'high'
-                    })
-            
-            # ROAS Based Recommendations
-            roas = data.get('marketing_roi', 0)
-            if roas < self._get_industry_benchmark(industry, 'roas'):
-                recommendations.append({
-                    'text': "Review and optimize marketing spend allocation across channels",
-                    'priority': 'medium'
-                })
-    
-        # Format recommendations with confidence scores
-        formatted_recommendations = []
-        for rec in recommendations:
-            formatted_rec = analyzer.format_recommendation(
-                rec['text'], 
-                quality_score * (1.2 if rec['priority'] == 'high' else 1.0)
-            )
-            formatted_recommendations.append(formatted_rec)
-    
-        return formatted_recommendations
-
-    def _get_industry_benchmark(self, industry, metric):
-        benchmarks = {
-            "B2B Software": {
-                "total_addressable_audience": 100000,
-                "cac": 400,
-                "marketing_roi": 250,
-                "gross_profit_margin": 70,
-                "net_profit_margin": 15,
-                "current_ratio": 2.0,
-                "quick_ratio": 1.5,
-                "inventory_turnover": 12,
-                "days_sales_outstanding": 45
-            },
-            "B2C E-commerce": {
-                "total_addressable_audience": 500000,
-                "cac": 30,
-                "marketing_roi": 400,
-                "gross_profit_margin": 45,
-                "net_profit_margin": 10,
-                "current_ratio": 1.8,
-                "quick_ratio": 1.2,
-                "inventory_turnover": 8,
-                "days_sales_outstanding": 30
-            },
-            # Add other industries with their benchmarks
-        }
-        return benchmarks.get(industry, {}).get(metric, 0)
-
-    def _assess_risks(self, scores):
-        risks = []
-        for category, score in scores.items():
-            if score < 5:
-                risks.append(f"High risk in {category.replace('_', ' ')}: Score {score:.1f}/10")
-            elif score < 7:
-                risks.append(f"Moderate risk in {category.replace('_', ' ')}: Score {score:.1f}/10")
-        return risks if risks else ["No significant risks identified"]
-def create_radar_chart(category_scores):
     categories = list(category_scores.keys())
     values = list(category_scores.values())
     values.append(values[0])
     categories.append(categories[0])
 
-    fig = go.Figure(data=go.Scatterpolar(
+    fig = go.Figure()
+    for i, (name, theta, r) in enumerate(bands):
+        fig.add_trace(go.Scatterpolar(
+            r=r, theta=theta, fill='toself', mode='lines', line={'width': 0},
+            fillcolor=f'rgba(128, 128, 128, {0.15 * (i + 1):.2f})', name=name, hoverinfo='skip'
+        ))
+    for company, scores in (competitors or {}).items():
+        r = [scores[category] for category in categories]
+        fig.add_trace(go.Scatterpolar(r=r, theta=categories, mode='lines', line={'width': 1}, name=company))
+    fig.add_trace(go.Scatterpolar(
         r=values,
         theta=categories,
         fill='toself',
@@ -401,12 +152,28 @@ def create_radar_chart(category_scores):
                 visible=True,
                 range=[0, 10]
             )),
-        showlegend=False
+        showlegend=bool(bands or competitors)
     )
 
     return fig
 
+@st.fragment
+def display_radar(inputs_key, report, industry, radar_chart):
+    # Picking competitors only reruns this fragment; their overlay is cached
+    # per selection and history version
+    store = get_history_store()
+    store.refresh()
+    sequence = store.sequence
+    saved = cached_latest_scores(sequence)['company'].tolist()
+    competitors = st.multiselect("Compare with saved companies", saved, max_selections=MAX_COMPETITORS,
+                                 key='radar_competitors', disabled=not saved)
+    if competitors:
+        radar_chart = cached_competitor_radar(inputs_key, tuple(competitors), sequence, report, industry)
+    st.plotly_chart(radar_chart)
+
 def create_risk_gauge(score):
+    import plotly.graph_objects as go
+
     fig = go.Figure(go.Indicator(
         mode = "gauge+number",
         value = score,
@@ -449,9 +216,10 @@ def display_enhanced_recommendations(report, data):
     
     with tab1:
         st.subheader("Recommendations")
-        # Simply display each recommendation as text
-        for rec in report['recommendations']:
-            st.warning(rec)  # Using warning to make it stand out
+        # One list of recommendations per flagged category
+        for category_recs in report['recommendations']:
+            for rec in category_recs:
+                st.warning(f"{rec['indicator']} {rec['text']} (confidence: {rec['confidence_level']})")
     
     with tab2:
         st.subheader("Data Quality Analysis")
@@ -467,309 +235,437 @@ def display_enhanced_recommendations(report, data):
                     st.write(f"- Add data for: {metric}")
     
     with tab3:
-        st.subheader("Industry Benchmarks")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric(
-                "Industry Avg CAC", 
-                f"${data.get('customer_acquisition_cost', 0)}"
-            )
-        with col2:
-            st.metric(
-                "Industry Avg ROI",
-                f"{data.get('marketing_roi', 0)}%"
-            )
-def main():
-    st.write("Debug: Application Starting")
-    st.title("Business Viability & Scalability Analysis Tool")
-
-    analyzer = BusinessAnalysisTool()
-
-    with st.form("business_metrics_form"):
-        st.header("Business Metrics")
-        
-        # Marketing Metrics
-        st.subheader("Marketing Metrics")
-        col1, col2 = st.columns(2)
-        with col1:
-            inputs = {}
-            inputs['total_addressable_audience'] = st.number_input(
-                "Total Addressable Audience",
-                help="Total number of potential customers in your target market",
-                min_value=0,
-                max_value=10000000,
-                value=10000
-            )
-            inputs['campaign_effectiveness'] = st.slider(
-                "Campaign Effectiveness (1-10)",
-                help="Overall effectiveness of your marketing campaigns",
-                min_value=1,
-                max_value=10,
-                value=7
-            )
-            inputs['customer_acquisition_cost'] = st.number_input(
-                "Customer Acquisition Cost ($)",
-                help="Average cost to acquire a new customer",
-                min_value=0,
-                max_value=10000,
-                value=500
-            )
-        with col2:
-            inputs['conversion_rate'] = st.slider(
-                "Conversion Rate (%)",
-                help="Percentage of leads that convert to customers",
-                min_value=0,
-                max_value=100,
-                value=25
-            )
-            inputs['marketing_roi'] = st.number_input(
-                "Marketing ROI (%)",
-                help="Return on Marketing Investment",
-                min_value=0,
-                max_value=1000,
-                value=150
-            )
-
-        # Sales Metrics
-        st.subheader("Sales Metrics")
-        col3, col4 = st.columns(2)
-        with col3:
-            inputs['revenue_growth'] = st.slider(
-                "Revenue Growth (%)",
-                help="Year-over-year revenue growth rate",
-                min_value=0,
-                max_value=100,
-                value=30
-            )
-            inputs['recurring_revenue_percentage'] = st.slider(
-                "Recurring Revenue (%)",
-                help="Percentage of revenue that is recurring",
-                min_value=0,
-                max_value=100,
-                value=70
-            )
-            inputs['average_deal_size'] = st.number_input(
-                "Average Deal Size ($)",
-                help="Average revenue per sale",
-                min_value=0,
-                max_value=100000,
-                value=5000
-            )
-        with col4:
-            inputs['pipeline_conversion'] = st.slider(
-                "Pipeline Conversion (%)",
-                help="Percentage of opportunities that convert to sales",
-                min_value=0,
-                max_value=100,
-                value=20
-            )
-            inputs['sales_cycle_length'] = st.number_input(
-                "Sales Cycle Length (days)",
-                help="Average time to close a deal",
-                min_value=0,
-                max_value=365,
-                value=45
-            )
-
-        # Product Delivery Metrics
-        st.subheader("Product & Delivery Metrics")
-        col5, col6 = st.columns(2)
-        with col5:
-            inputs['defect_rate'] = st.slider(
-                "Defect Rate (%)",
-                help="Percentage of products with defects",
-                min_value=0,
-                max_value=100,
-                value=2
-            )
-            inputs['on_time_delivery'] = st.slider(
-                "On-Time Delivery (%)",
-                help="Percentage of deliveries made on time",
-                min_value=0,
-                max_value=100,
-                value=95
-            )
-            inputs['product_satisfaction'] = st.slider(
-                "Product Satisfaction (%)",
-                help="Customer satisfaction with product",
-                min_value=0,
-                max_value=100,
-                value=90
-            )
-        with col6:
-            inputs['sla_compliance'] = st.slider(
-                "SLA Compliance (%)",
-                help="Service Level Agreement compliance rate",
-                min_value=0,
-                max_value=100,
-                value=98
-            )
-            inputs['automation_percentage'] = st.slider(
-                "Automation Level (%)",
-                help="Percentage of processes that are automated",
-                min_value=0,
-                max_value=100,
-                value=60
-            )
-
-        # Financial Metrics
-        st.subheader("Financial Metrics")
-        col7, col8 = st.columns(2)
-        with col7:
-            inputs['gross_profit_margin'] = st.slider(
-                "Gross Profit Margin (%)",
-                help="(Revenue - COGS) / Revenue × 100",
-                min_value=-100,
-                max_value=100,
-                value=65
-            )
-            inputs['net_profit_margin'] = st.slider(
-                "Net Profit Margin (%)",
-                help="Net Profit / Revenue × 100",
-                min_value=-100,
-                max_value=100,
-                value=15
-            )
-            inputs['operating_margin'] = st.slider(
-                "Operating Margin (%)",
-                help="Operating Income / Revenue × 100",
-                min_value=-100,
-                max_value=100,
-                value=25
-            )
-            inputs['current_ratio'] = st.number_input(
-                "Current Ratio",
-                help="Current Assets / Current Liabilities",
-                min_value=0.0,
-                max_value=10.0,
-                value=2.5
-            )
-        with col8:
-            inputs['quick_ratio'] = st.number_input(
-                "Quick Ratio",
-                help="(Current Assets - Inventory) / Current Liabilities",
-                min_value=0.0,
-                max_value=10.0,
-                value=1.8
-            )
-            inputs['debt_to_equity'] = st.number_input(
-                "Debt to Equity Ratio",
-                help="Total Debt / Total Equity",
-                min_value=0.0,
-                max_value=10.0,
-                value=1.0
-            )
-            inputs['inventory_turnover'] = st.number_input(
-                "Inventory Turnover Ratio",
-                help="Cost of Goods Sold / Average Inventory",
-                min_value=0.0,
-                max_value=50.0,
-                value=12.0
-            )
-            inputs['days_sales_outstanding'] = st.number_input(
-                "Days Sales Outstanding",
-                help="Average collection period",
-                min_value=0,
-                max_value=365,
-                value=45
-            )
+        industry = data.get('industry', 'General')
+        st.subheader(f"Industry Benchmarks: {industry}")
+        benchmarks = get_benchmarks().for_industry(industry)
+        if not benchmarks:
+            st.info(f"No benchmarks available for {industry}")
+        columns = st.columns(2)
+        for i, (metric, benchmark) in enumerate(benchmarks.items()):
+            with columns[i % 2]:
+                value = data.get(metric)
+                st.metric(
+                    f"Industry Avg {metric.replace('_', ' ').title()}",
+                    f"{benchmark:g}",
+                    delta=None if value is None else f"{value - benchmark:+g} (yours)",
+                    delta_color="off"
+                )
+
+def display_peer_percentiles(percentiles):
+    st.subheader(f"Peer Percentiles ({percentiles['peer_group'].replace('__all__', 'all industries')})")
+    columns = st.columns(len(percentiles['categories']) or 1)
+    for column, (category, percentile) in zip(columns, percentiles['categories'].items()):
+        column.metric(category.replace('_', ' ').title(), f"{percentile:.0f}th")
+    with st.expander("Percentile by metric"):
+        st.dataframe(
+            pd.DataFrame(percentiles['metrics'].items(), columns=["Metric", "Percentile"]),
+            hide_index=True
+        )
+
+@st.fragment
+def display_uncertainty(inputs):
+    with st.expander("Score Uncertainty (Monte Carlo)"):
+        st.caption("Each input is sampled around its value with a spread that grows as data quality drops")
+        col1, col2, col3 = st.columns(3)
+        data_source = col1.selectbox("Data Source", ['manual', 'automatic'], key='data_source')
+        data_age = col2.slider("Data Age (months)", min_value=0, max_value=12, value=6, key='data_age_months')
+        samples = col3.select_slider("Samples", options=[10000, 20000, 50000, 100000], value=20000,
+                                     key='uncertainty_samples')
+        simulated = dict(inputs, data_source=data_source, data_age_months=data_age)
+        result = cached_uncertainty(inputs_cache_key(simulated), simulated, samples, 0)
+
+        st.metric("Viability Rating Probabilities", describe_probabilities(result['viability_probabilities']))
+        st.metric("Scalability Rating Probabilities", describe_probabilities(result['scalability_probabilities']))
+        bands = {'Overall': result['overall_score']}
+        bands.update((category.replace('_', ' ').title(), band)
+                     for category, band in result['category_scores'].items())
+        st.dataframe(pd.DataFrame.from_dict(bands, orient='index'))
+
+@st.cache_data(max_entries=REPORT_CACHE_MAX_ENTRIES, ttl=REPORT_CACHE_TTL, show_spinner=False)
+def cached_sensitivity(inputs_key, _inputs):
+    return analyze_sensitivity(get_analyzer(), _inputs)
+
+def create_sensitivity_chart(table):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(x=table["Score Gain per 1% of Range"], y=table["Input"], orientation='h'))
+    fig.update_layout(xaxis={'title': "Score Gain per 1% of Range"}, yaxis={'autorange': 'reversed'}, height=400)
+    return fig
 
-        # Operational Efficiency
-        st.subheader("Operational Efficiency")
-        col9, col10 = st.columns(2)
-        with col9:
-            inputs['resource_utilization'] = st.slider(
-                "Resource Utilization (%)",
-                help="Percentage of resources being utilized",
-                min_value=0,
-                max_value=100,
-                value=80
-            )
-            inputs['process_automation'] = st.slider(
-                "Process Automation (%)",
-                help="Percentage of processes automated",
-                min_value=0,
-                max_value=100,
-                value=70
-            )
-            inputs['error_rate'] = st.slider(
-                "Error Rate (%)",
-                help="Percentage of errors in processes",
-                min_value=0,
-                max_value=100,
-                value=3
-            )
-        with col10:
-            inputs['cost_per_unit'] = st.number_input(
-                "Cost per Unit ($)",
-                help="Average cost to produce one unit",
-                min_value=0,
-                max_value=1000,
-                value=50
-            )
-            inputs['cycle_time'] = st.number_input(
-                "Cycle Time (days)",
-                help="Time to complete one process cycle",
-                min_value=0,
-                max_value=100,
-                value=15
-            )
+def display_sensitivity(inputs_key, inputs):
+    sensitivity = cached_sensitivity(inputs_key, inputs)
+    labels = {field: label for _, _, columns in FORM_SECTIONS
+              for fields in columns for field, _, label, *_ in fields}
+    ranked = [row for row in sensitivity['inputs'] if row['impact'] > 0]
+
+    st.subheader("Score Sensitivity")
+    if not ranked:
+        st.write("No single input change improves the overall score from here.")
+        return
+    top = ranked[0]
+    st.info(f"Highest-leverage improvement: {top['direction']} "
+            f"{labels.get(top['field'], top['field'].replace('_', ' ').title())}")
+    if sensitivity['next_rating']:
+        st.caption(f"{sensitivity['gap']:.2f} points from a {sensitivity['next_rating']} viability rating")
+
+    table = pd.DataFrame({
+        "Input": [labels.get(row['field'], row['field'].replace('_', ' ').title()) for row in ranked[:10]],
+        "Direction": [row['direction'].title() for row in ranked[:10]],
+        "Score Gain per 1% of Range": [row['impact'] for row in ranked[:10]],
+        "Change to Next Rating": [row['change_to_next_rating'] for row in ranked[:10]]
+    })
+    st.plotly_chart(create_sensitivity_chart(table))
+    with st.expander("Sensitivity by input"):
+        st.dataframe(table, hide_index=True)
+
+@st.fragment
+def display_target_plan(inputs, report):
+    better = [rating for rating, threshold in BusinessAnalysisTool.VIABILITY_RATINGS
+              if threshold > report['overall_score']][::-1]
+    st.subheader("Path to a Higher Rating")
+    if not better:
+        st.write("Already at the highest viability rating.")
+        return
+    labels = {field: label for _, _, columns in FORM_SECTIONS
+              for fields in columns for field, _, label, *_ in fields}
+    analyzer = get_analyzer()
+    col1, col2 = st.columns(2)
+    target = col1.selectbox("Target Rating", better, key='target_rating')
+    fixed = col2.multiselect("Inputs to keep as they are", analyzer.plan.fields, key='target_fixed',
+                             format_func=lambda field: labels.get(field, field.replace('_', ' ').title()))
+    plan = TargetOptimizer(analyzer).solve(inputs, target, fixed=fixed)
+    if not plan['reachable']:
+        st.warning(f"{target} can't be reached within the allowed input ranges.")
+        return
+    st.caption(f"Smallest total change (as a share of each input's range) that reaches {target}: "
+               f"projected score {plan['projected_score']:.2f}")
+    st.dataframe(pd.DataFrame({
+        "Input": [labels.get(c['field'], c['field'].replace('_', ' ').title()) for c in plan['changes']],
+        "Current": [c['from'] for c in plan['changes']],
+        "Target": [c['to'] for c in plan['changes']],
+        "Change": [c['change'] for c in plan['changes']]
+    }), hide_index=True)
+
+def create_trajectory_chart(history):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=history['period'], y=history['overall_score'], name="Overall",
+                             line={'width': 4}))
+    for category in get_analyzer().plan.categories:
+        fig.add_trace(go.Scatter(x=history['period'], y=history[f'{category}_score'],
+                                 name=category.replace('_', ' ').title()))
+    fig.update_layout(yaxis={'range': [0, 10], 'title': "Score"}, xaxis={'type': 'category'}, height=400)
+    return fig
 
-        # People & Culture
-        st.subheader("People & Culture")
-        col11, col12 = st.columns(2)
-        with col11:
-            inputs['employee_satisfaction'] = st.slider(
-                "Employee Satisfaction (%)",
-                help="Overall employee satisfaction score",
-                min_value=0,
-                max_value=100,
-                value=80
-            )
-            inputs['employee_retention'] = st.slider(
-                "Employee Retention (%)",
-                help="Employee retention rate",
-                min_value=0,
-                max_value=100,
-                value=85
-            )
-            inputs['skill_coverage'] = st.slider(
-                "Skill Coverage (%)",
-                help="Percentage of required skills covered by team",
-                min_value=0,
-                max_value=100,
-                value=75
-            )
-        with col12:
-            inputs['leadership_experience'] = st.slider(
-                "Leadership Experience (1-10)",
-                help="Rating of leadership team experience",
-                min_value=1,
-                max_value=10,
-                value=8
-            )
-            inputs['culture_rating'] = st.slider(
-                "Culture Rating (1-10)",
-                help="Rating of company culture",
-                min_value=1,
-                max_value=10,
-                value=8
-            )
-            inputs['innovation_rating'] = st.slider(
-                "Innovation Rating (1-10)",
-                help="Rating of company innovation capability",
-                min_value=1,
-                max_value=10,
-                value=7
-            )
+@st.fragment
+def display_history(inputs):
+    st.subheader("Score History")
+    store = get_history_store()
+    col1, col2 = st.columns(2)
+    company = col1.text_input("Company", key='history_company')
+    period = col2.text_input("Period (YYYY-MM)", value=datetime.date.today().strftime('%Y-%m'),
+                             key='history_period')
+    if st.button("Save Report to History", disabled=not company):
+        try:
+            append_scored(store, get_analyzer(), period, pd.DataFrame([dict(inputs, company=company)]))
+        except ValueError as error:
+            st.error(str(error))
+    if not company:
+        return
+
+    # The CLI may have appended since this store was last read
+    store.refresh()
+    history = cached_company_history(company, store.sequence)
+    if history.empty:
+        st.write("No saved reports for this company yet.")
+        return
+    st.plotly_chart(create_trajectory_chart(history))
+    latest = history.iloc[-1]
+    columns = st.columns(3)
+    for column, months in zip(columns, (3, 6, 12)):
+        delta = latest[f'overall_score_delta_{months}m']
+        column.metric(f"{months}-Month Change", "n/a" if pd.isna(delta) else f"{delta:+.2f}")
+
+# (field, widget, label, help, default) per column of each form section; bounds
+# come from FIELD_RANGES and each section is scored live by its analyze_* method
+FORM_SECTIONS = (
+    ("Marketing Metrics", 'analyze_marketing', (
+        (
+            ('total_addressable_audience', 'number_input', "Total Addressable Audience",
+             "Total number of potential customers in your target market", 10000),
+            ('campaign_effectiveness', 'slider', "Campaign Effectiveness (1-10)",
+             "Overall effectiveness of your marketing campaigns", 7),
+            ('customer_acquisition_cost', 'number_input', "Customer Acquisition Cost ($)",
+             "Average cost to acquire a new customer", 500)
+        ),
+        (
+            ('conversion_rate', 'slider', "Conversion Rate (%)",
+             "Percentage of leads that convert to customers", 25),
+            ('marketing_roi', 'number_input', "Marketing ROI (%)",
+             "Return on Marketing Investment", 150)
+        )
+    )),
+    ("Sales Metrics", 'analyze_sales', (
+        (
+            ('revenue_growth', 'slider', "Revenue Growth (%)",
+             "Year-over-year revenue growth rate", 30),
+            ('recurring_revenue_percentage', 'slider', "Recurring Revenue (%)",
+             "Percentage of revenue that is recurring", 70),
+            ('average_deal_size', 'number_input', "Average Deal Size ($)",
+             "Average revenue per sale", 5000)
+        ),
+        (
+            ('pipeline_conversion', 'slider', "Pipeline Conversion (%)",
+             "Percentage of opportunities that convert to sales", 20),
+            ('sales_cycle_length', 'number_input', "Sales Cycle Length (days)",
+             "Average time to close a deal", 45)
+        )
+    )),
+    ("Product & Delivery Metrics", 'analyze_product_delivery', (
+        (
+            ('defect_rate', 'slider', "Defect Rate (%)",
+             "Percentage of products with defects", 2),
+            ('on_time_delivery', 'slider', "On-Time Delivery (%)",
+             "Percentage of deliveries made on time", 95),
+            ('product_satisfaction', 'slider', "Product Satisfaction (%)",
+             "Customer satisfaction with product", 90)
+        ),
+        (
+            ('sla_compliance', 'slider', "SLA Compliance (%)",
+             "Service Level Agreement compliance rate", 98),
+            ('automation_percentage', 'slider', "Automation Level (%)",
+             "Percentage of processes that are automated", 60)
+        )
+    )),
+    ("Financial Metrics", 'analyze_financial_health', (
+        (
+            ('gross_profit_margin', 'slider', "Gross Profit Margin (%)",
+             "(Revenue - COGS) / Revenue × 100", 65),
+            ('net_profit_margin', 'slider', "Net Profit Margin (%)",
+             "Net Profit / Revenue × 100", 15),
+            ('operating_margin', 'slider', "Operating Margin (%)",
+             "Operating Income / Revenue × 100", 25),
+            ('current_ratio', 'number_input', "Current Ratio",
+             "Current Assets / Current Liabilities", 2.5)
+        ),
+        (
+            ('quick_ratio', 'number_input', "Quick Ratio",
+             "(Current Assets - Inventory) / Current Liabilities", 1.8),
+            ('debt_to_equity', 'number_input', "Debt to Equity Ratio",
+             "Total Debt / Total Equity", 1.0),
+            ('inventory_turnover', 'number_input', "Inventory Turnover Ratio",
+             "Cost of Goods Sold / Average Inventory", 12.0),
+            ('days_sales_outstanding', 'number_input', "Days Sales Outstanding",
+             "Average collection period", 45)
+        )
+    )),
+    ("Operational Efficiency", 'analyze_operational_efficiency', (
+        (
+            ('resource_utilization', 'slider', "Resource Utilization (%)",
+             "Percentage of resources being utilized", 80),
+            ('process_automation', 'slider', "Process Automation (%)",
+             "Percentage of processes automated", 70),
+            ('error_rate', 'slider', "Error Rate (%)",
+             "Percentage of errors in processes", 3)
+        ),
+        (
+            ('cost_per_unit', 'number_input', "Cost per Unit ($)",
+             "Average cost to produce one unit", 50),
+            ('cycle_time', 'number_input', "Cycle Time (days)",
+             "Time to complete one process cycle", 15)
+        )
+    )),
+    ("People & Culture", 'analyze_people', (
+        (
+            ('employee_satisfaction', 'slider', "Employee Satisfaction (%)",
+             "Overall employee satisfaction score", 80),
+            ('employee_retention', 'slider', "Employee Retention (%)",
+             "Employee retention rate", 85),
+            ('skill_coverage', 'slider', "Skill Coverage (%)",
+             "Percentage of required skills covered by team", 75)
+        ),
+        (
+            ('leadership_experience', 'slider', "Leadership Experience (1-10)",
+             "Rating of leadership team experience", 8),
+            ('culture_rating', 'slider', "Culture Rating (1-10)",
+             "Rating of company culture", 8),
+            ('innovation_rating', 'slider', "Innovation Rating (1-10)",
+             "Rating of company innovation capability", 7)
+        )
+    ))
+)
 
-        # Submit button
-        submitted = st.form_submit_button("Generate Analysis")
+def scenario_label(scenario):
+    score = "" if scenario['overall_score'] is None else f", {scenario['overall_score']:.2f}"
+    company = f" ({scenario['company']})" if scenario['company'] else ""
+    return f"{scenario['name']}{company} - {scenario['created_at'][:10]}{score}"
+
+@st.fragment
+def display_scenarios():
+    st.header("Saved Scenarios")
+    store = get_scenario_store()
+    name = st.text_input("Scenario Name", key='scenario_name')
+    company = st.text_input("Company", key='scenario_company')
+    if st.button("Save Current Inputs", disabled=not name):
+        inputs = current_inputs()
+        store.save(name, inputs, session_report(inputs_cache_key(inputs), inputs), company)
+        st.success(f"Saved {name}")
+
+    company_filter = st.text_input("Filter by Company", key='scenario_filter')
+    scenarios = store.find(company=company_filter or None)
+    if not scenarios:
+        st.caption("No saved scenarios yet")
+        return
+    labels = {scenario['id']: scenario_label(scenario) for scenario in scenarios}
+    scenario_id = st.selectbox("Scenario", list(labels), format_func=labels.get, key='scenario_id')
+    col1, col2 = st.columns(2)
+    if col1.button("Load"):
+        inputs = store.load(scenario_id)['inputs']
+        st.session_state['pending_inputs'] = inputs
+        st.session_state['submitted_inputs'] = inputs
+        st.rerun(scope='app')
+    if col2.button("Delete"):
+        store.delete(scenario_id)
+        st.rerun(scope='fragment')
+
+@st.fragment
+def display_scenario_diff():
+    store = get_scenario_store()
+    scenarios = store.find(limit=500)
+    if len(scenarios) < 2:
+        return
+    with st.expander("Compare Scenarios"):
+        labels = {scenario['id']: scenario_label(scenario) for scenario in scenarios}
+        col1, col2 = st.columns(2)
+        before = col1.selectbox("From", list(labels), index=1, format_func=labels.get, key='diff_from')
+        after = col2.selectbox("To", list(labels), index=0, format_func=labels.get, key='diff_to')
+        diff = diff_scenarios(store.load(before), store.load(after))
+        columns = st.columns(len(diff['scores']))
+        for column, (category, score) in zip(columns, diff['scores'].items()):
+            column.metric(category.replace('_', ' ').title(), f"{score['to']:.2f}", f"{score['change']:+.2f}")
+        if diff['inputs']:
+            st.dataframe(pd.DataFrame({
+                "Input": [change['field'].replace('_', ' ').title() for change in diff['inputs']],
+                "From": [str(change['from']) for change in diff['inputs']],
+                "To": [str(change['to']) for change in diff['inputs']],
+                "Change": [change['change'] for change in diff['inputs']]
+            }), hide_index=True)
+        else:
+            st.caption("The two scenarios have the same inputs")
+
+@st.fragment
+def display_ledger_import():
+    with st.expander("Fill Financial Metrics from Ledger Exports"):
+        st.caption("General ledger: date, account (or account_class), debit and credit (or a signed amount). "
+                   "Invoices: invoice_date, paid_date, amount.")
+        ledgers = st.file_uploader("General Ledger", type=['csv', 'parquet'], accept_multiple_files=True,
+                                   key='ledger_files')
+        invoices = st.file_uploader("Invoices (optional, for DSO)", type=['csv', 'parquet'],
+                                    accept_multiple_files=True, key='invoice_files')
+        col1, col2 = st.columns(2)
+        period = col1.text_input("As of (YYYY-MM, blank for latest)", key='ledger_period')
+        months = col2.number_input("Trailing Months", min_value=1, max_value=36, value=12, key='ledger_months')
+        if not st.button("Derive Financial Metrics", disabled=not ledgers):
+            return
+        if period:
+            try:
+                month_ordinal(period)
+            except ValueError as error:
+                st.error(str(error))
+                return
+        ingest = LedgerIngest()
+        with st.spinner("Reading ledger..."):
+            for source in ledgers:
+                ingest.add_ledger(source)
+            for source in invoices:
+                ingest.add_invoices(source)
+            derived = ingest.financial_inputs(period or None, months)
+        stats = ingest.throughput()
+        st.caption(f"{stats['rows']:,} rows in {stats['seconds']:.2f}s "
+                   f"({stats['rows_per_second']:,.0f} rows/sec, {stats['skipped_rows']:,} skipped)")
+        if not derived:
+            st.warning("No financial metrics could be derived from these files")
+            return
+        # Each value takes its widget's type (whole-number sliders stay ints)
+        defaults = {field: default for _, _, columns in FORM_SECTIONS
+                    for fields in columns for field, *_, default in fields}
+        st.session_state['pending_inputs'] = {
+            field: round(value) if isinstance(defaults[field], int) else value
+            for field, value in derived.items() if field in defaults
+        }
+        st.rerun(scope='app')
+
+def init_form_state():
+    st.session_state.setdefault('industry', get_benchmarks().industries[0])
+    for _, _, columns in FORM_SECTIONS:
+        for fields in columns:
+            for field, *_, default in fields:
+                st.session_state.setdefault(field, default)
+
+def current_inputs():
+    inputs = {field: st.session_state[field]
+              for _, _, columns in FORM_SECTIONS
+              for fields in columns
+              for field, *_ in fields}
+    inputs['industry'] = st.session_state['industry']
+    return inputs
+
+@st.fragment
+def form_section(title, analyze, columns):
+    # Widget changes rerun only this fragment and its category score; the
+    # full report waits for the explicit submit button in main()
+    st.subheader(title)
+    for column, fields in zip(st.columns(2), columns):
+        with column:
+            for field, widget, label, help_text, _ in fields:
+                control = st.slider if widget == 'slider' else st.number_input
+                min_value, max_value = FIELD_RANGES[field]
+                control(label, help=help_text, min_value=min_value, max_value=max_value, key=field)
+    score = getattr(get_analyzer(), analyze)(current_inputs())
+    st.metric("Section Score (live)", f"{score:.1f}/10")
+
+def display_stage_timings():
+    # Debug panel, only shown when STAGE_TIMING=1; counts and percentiles are
+    # for the whole server process, not just this session
+    with st.sidebar.expander("Stage timings"):
+        summary = STAGE_TIMINGS.summary()
+        if not summary:
+            st.info("No stages timed yet")
+            return
+        st.dataframe(pd.DataFrame(summary).round(3), hide_index=True)
+        st.download_button("Prometheus metrics", STAGE_TIMINGS.prometheus(),
+                           file_name="stage_timings.prom", mime="text/plain")
+
+def render():
+    st.title("Business Viability & Scalability Analysis Tool")
 
-    # Show analysis if form is submitted
-    if submitted:
-        # Generate report
-        report = analyzer.generate_comprehensive_report(inputs)
+    # Inputs loaded on the previous run (a scenario, ledger figures) are
+    # written into the widget keys before any widget exists, which is the
+    # only point Streamlit allows it
+    if 'pending_inputs' in st.session_state:
+        st.session_state.update(st.session_state.pop('pending_inputs'))
+    init_form_state()
+    with st.sidebar:
+        display_scenarios()
+    st.header("Business Metrics")
+    st.selectbox("Industry", get_benchmarks().industries, key='industry',
+                 help="Used for industry benchmarks and benchmark-based recommendations")
+    for title, analyze, columns in FORM_SECTIONS:
+        form_section(title, analyze, columns)
+    display_ledger_import()
+
+    if st.button("Generate Analysis", type="primary", key="generate_analysis"):
+        st.session_state['submitted_inputs'] = current_inputs()
+
+    # Show analysis for the last submitted inputs
+    if 'submitted_inputs' in st.session_state:
+        inputs = st.session_state['submitted_inputs']
+
+        # Generate report, incrementally from this session's previous one
+        inputs_key = inputs_cache_key(inputs)
+        report = session_report(inputs_key, inputs)
+        gauge_chart, radar_chart = cached_charts(inputs_key, report, inputs.get('industry'))
 
         # Display overall scores
         st.header("Analysis Results")
@@ -777,7 +673,6 @@ def main():
 
         with col1:
             st.subheader("Overall Performance")
-            gauge_chart = create_risk_gauge(report['overall_score'])
             st.plotly_chart(gauge_chart)
 
             st.metric("Viability Rating", report['viability_rating'])
@@ -785,11 +680,38 @@ def main():
 
         with col2:
             st.subheader("Category Performance")
-            radar_chart = create_radar_chart(report['category_scores'])
-            st.plotly_chart(radar_chart)
+            display_radar(inputs_key, report, inputs.get('industry'), radar_chart)
+
+        display_uncertainty(inputs)
+        display_sensitivity(inputs_key, inputs)
+        display_target_plan(inputs, report)
+        display_history(inputs)
+
+        if 'peer_percentiles' in report:
+            display_peer_percentiles(report['peer_percentiles'])
 
         # Display enhanced recommendations
-        display_enhanced_recommendations(report, inputs)
+        with STAGE_TIMINGS.stage('display_enhanced_recommendations'):
+            display_enhanced_recommendations(report, inputs)
+
+    display_scenario_diff()
+
+def main():
+    st.set_page_config(
+        page_title="Business Analysis Tool", 
+        layout="wide",
+        menu_items={
+            'Get Help': None,
+            'Report a bug': None,
+            'About': None
+        }
+    )
+    with STAGE_TIMINGS.stage('script_run'):
+        render()
+    if STAGE_TIMINGS.enabled:
+        if STAGE_TIMING_EXPORT:
+            STAGE_TIMINGS.write_prometheus(STAGE_TIMING_EXPORT)
+        display_stage_timings()
 
 if __name__ == "__main__":
     main()
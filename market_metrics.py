@@ -1,5 +1,16 @@
+import os
+
 import streamlit as st
 
+from core.industry_benchmarks import get_benchmarks
+from core.market_share import MARKET_SHARE_PATH, SIZE_CLASSES, MarketShareEstimator
+
+@st.cache_resource
+def get_market_share_estimator():
+    if os.path.exists(MARKET_SHARE_PATH):
+        return MarketShareEstimator.load(MARKET_SHARE_PATH)
+    return None
+
 def get_marketing_metrics(col):
     st.subheader("Marketing Metrics")
     metrics = {}
@@ -25,12 +36,13 @@ def get_marketing_metrics(col):
             st.markdown(f"Industry Benchmark: 15-20% for market leaders")
     else:
         company_age = st.slider("Company Age (years)", 0, 50, 1)
-        company_size = st.selectbox("Company Size", 
-            ["Startup (1-10 employees)",
-             "Small (11-50 employees)",
-             "Medium (51-200 employees)",
-             "Large (201+ employees)"])
-        metrics['market_share'] = estimate_market_share(company_age, company_size)
+        company_size = st.selectbox("Company Size", SIZE_CLASSES)
+        estimator = get_market_share_estimator()
+        if estimator is not None:
+            # Median share of peers of this age and size in the industry picked on the main form
+            metrics['market_share'] = estimator.estimate(company_age, company_size, st.session_state.get('industry'))
+        else:
+            metrics['market_share'] = estimate_market_share(company_age, company_size)
         st.info(f"Estimated Market Share: {metrics['market_share']:.1f}%")
 
     st.markdown("#### Customer Acquisition")
@@ -50,13 +62,13 @@ def get_marketing_metrics(col):
         metrics['customer_acquisition_cost'] = cac
         metrics['marketing_roi'] = roas * 100
     else:
-        industry = st.selectbox("Industry", 
-            ["B2B Software", "B2C E-commerce", "Professional Services", "Manufacturing"])
+        industry = st.selectbox("Industry", get_benchmarks().industries)
         metrics.update(get_industry_benchmarks(industry))
 
     return metrics
 
 def estimate_market_share(age, size):
+    # Rule of thumb for when no fitted estimator is available
     size_factors = {
         "Startup (1-10 employees)": 0.1,
         "Small (11-50 employees)": 0.5,
@@ -67,22 +79,8 @@ def estimate_market_share(age, size):
     return size_factors[size] * age_multiplier
 
 def get_industry_benchmarks(industry):
-    benchmarks = {
-        "B2B Software": {
-            "customer_acquisition_cost": 400,
-            "marketing_roi": 250,
-        },
-        "B2C E-commerce": {
-            "customer_acquisition_cost": 30,
-            "marketing_roi": 400,
-        },
-        "Professional Services": {
-            "customer_acquisition_cost": 200,
-            "marketing_roi": 300,
-        },
-        "Manufacturing": {
-            "customer_acquisition_cost": 600,
-            "marketing_roi": 200,
-        }
+    benchmarks = get_benchmarks()
+    return {
+        "customer_acquisition_cost": benchmarks.get(industry, "customer_acquisition_cost"),
+        "marketing_roi": benchmarks.get(industry, "marketing_roi"),
     }
-    return benchmarks[industry]
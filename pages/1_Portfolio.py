@@ -0,0 +1,167 @@
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from core.analysis import BusinessAnalysisTool
+from core.portfolio import SCORE_RANGE, Portfolio
+
+PORTFOLIO_PATH = os.environ.get(
+    'PORTFOLIO_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'portfolio.parquet'))
+# Scored portfolios are large; only the last few are kept server-side
+PORTFOLIO_CACHE_ENTRIES = 4
+AGGREGATE_CACHE_ENTRIES = 256
+RATING_COLORS = {"Excellent": '#1a9850', "Strong": '#91cf60', "Good": '#fee08b', "Fair": '#fc8d59',
+                 "Poor": '#d73027'}
+
+@st.cache_resource
+def get_portfolio_analyzer():
+    # Portfolio views don't show peer percentiles, so no peer index is loaded
+    return BusinessAnalysisTool()
+
+@st.cache_resource(max_entries=PORTFOLIO_CACHE_ENTRIES, show_spinner="Scoring portfolio...")
+def load_portfolio(source_key, name, _read):
+    buffer = io.BytesIO(_read())
+    frame = pd.read_parquet(buffer) if name.endswith('.parquet') else pd.read_csv(buffer)
+    return Portfolio.score(get_portfolio_analyzer(), frame)
+
+# Aggregates are keyed on the portfolio and filter selection (and the view,
+# for the scatter), so revisiting a selection doesn't recompute anything
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def cached_aggregates(source_key, _portfolio, industries, ratings):
+    mask = _portfolio.mask(industries, ratings)
+    edges, distributions = _portfolio.score_distributions(mask)
+    return int(mask.sum()), edges, distributions, _portfolio.rating_counts(mask)
+
+@st.cache_data(max_entries=AGGREGATE_CACHE_ENTRIES, show_spinner=False)
+def cached_scatter(source_key, _portfolio, industries, ratings, x_range, y_range):
+    return _portfolio.scatter(_portfolio.mask(industries, ratings), x_range, y_range)
+
+def portfolio_source():
+    uploaded = st.file_uploader("Portfolio (.csv or .parquet, one row per company)", type=['csv', 'parquet'])
+    if uploaded is not None:
+        return hashlib.sha256(uploaded.getvalue()).hexdigest(), uploaded.name, uploaded.getvalue
+    if os.path.exists(PORTFOLIO_PATH):
+        # The file is only read when this version of it isn't cached yet
+        def read():
+            with open(PORTFOLIO_PATH, 'rb') as f:
+                return f.read()
+        return f"{PORTFOLIO_PATH}:{os.path.getmtime(PORTFOLIO_PATH)}", PORTFOLIO_PATH, read
+    return None
+
+def create_scatter_chart(scatter, x_range, y_range):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    if scatter['binned']:
+        fig.add_trace(go.Scattergl(
+            x=scatter['x'], y=scatter['y'], mode='markers',
+            marker={'symbol': 'square', 'size': 5, 'color': np.log10(scatter['count']),
+                    'colorscale': 'Viridis', 'colorbar': {'title': "log10 companies"}},
+            customdata=scatter['count'], hovertemplate="%{customdata:,} companies<extra></extra>"
+        ))
+    else:
+        for rating, color in RATING_COLORS.items():
+            rows = scatter['viability'] == rating
+            if rows.any():
+                fig.add_trace(go.Scattergl(
+                    x=scatter['x'][rows], y=scatter['y'][rows], mode='markers', name=rating,
+                    marker={'size': 5, 'color': color}, text=scatter['company'][rows],
+                    hovertemplate="%{text}<br>Overall %{x:.2f}, scalability %{y:.2f}<extra></extra>"
+                ))
+    fig.update_layout(
+        xaxis={'title': "Overall Score", 'range': list(x_range)},
+        yaxis={'title': "Scalability Score", 'range': list(y_range)},
+        dragmode='select', height=550, margin={'t': 30}
+    )
+    return fig
+
+def create_distribution_chart(edges, distributions):
+    import plotly.graph_objects as go
+
+    centers = (edges[:-1] + edges[1:]) / 2
+    fig = go.Figure()
+    for name, counts in distributions.items():
+        fig.add_trace(go.Scatter(x=centers, y=counts, mode='lines', name=name.replace('_', ' ').title(),
+                                 line={'width': 4 if name == 'overall' else 2}))
+    fig.update_layout(xaxis={'title': "Score", 'range': list(SCORE_RANGE)}, yaxis={'title': "Companies"},
+                      height=400, margin={'t': 30})
+    return fig
+
+def create_rating_chart(industries, ratings, counts):
+    import plotly.graph_objects as go
+
+    fig = go.Figure([go.Bar(x=industries, y=counts[:, r], name=rating, marker_color=RATING_COLORS.get(rating))
+                     for r, rating in enumerate(ratings)])
+    fig.update_layout(barmode='stack', yaxis={'title': "Companies"}, height=400, margin={'t': 30})
+    return fig
+
+def display_scatter(source_key, portfolio, industries, ratings):
+    # Box-selecting a region zooms the view into it; the zoomed view is
+    # re-queried server-side, so it is binned finer or shown point by point
+    view = st.session_state.get('portfolio_view', (SCORE_RANGE, SCORE_RANGE))
+    x_range, y_range = view
+    scatter = cached_scatter(source_key, portfolio, industries, ratings, x_range, y_range)
+
+    col1, col2 = st.columns([4, 1])
+    if scatter['binned']:
+        col1.caption(f"{scatter['total']:,} companies in view, binned to {len(scatter['x']):,} cells; "
+                     f"box-select a region to zoom in")
+    else:
+        col1.caption(f"{scatter['total']:,} companies in view")
+    if col2.button("Reset Zoom", disabled=view == (SCORE_RANGE, SCORE_RANGE)):
+        st.session_state['portfolio_view'] = (SCORE_RANGE, SCORE_RANGE)
+        st.rerun()
+
+    # Keyed on the view so a zoom starts from a fresh, empty selection
+    event = st.plotly_chart(create_scatter_chart(scatter, x_range, y_range), on_select='rerun',
+                            selection_mode='box', key=f"portfolio_scatter_{x_range}_{y_range}")
+    boxes = event.selection.get('box', []) if event else []
+    if boxes:
+        box = boxes[0]
+        zoomed = (tuple(sorted(float(x) for x in box['x'])), tuple(sorted(float(y) for y in box['y'])))
+        if zoomed[0][0] < zoomed[0][1] and zoomed[1][0] < zoomed[1][1]:
+            st.session_state['portfolio_view'] = zoomed
+            st.rerun()
+
+def main():
+    st.set_page_config(page_title="Portfolio", layout="wide")
+    st.title("Portfolio Overview")
+
+    source = portfolio_source()
+    if source is None:
+        st.info("Upload a portfolio file to see every company at once")
+        return
+    source_key, name, read = source
+    try:
+        portfolio = load_portfolio(source_key, name, read)
+    except ValueError as error:
+        st.error(f"Couldn't score this portfolio: {error}")
+        return
+    if st.session_state.get('portfolio_source') != source_key:
+        st.session_state['portfolio_source'] = source_key
+        st.session_state['portfolio_view'] = (SCORE_RANGE, SCORE_RANGE)
+
+    col1, col2 = st.columns(2)
+    industries = tuple(col1.multiselect("Industries", portfolio.industries.tolist()))
+    ratings = tuple(col2.multiselect("Viability Ratings", portfolio.viability_ratings))
+    selected, edges, distributions, rating_counts = cached_aggregates(source_key, portfolio, industries, ratings)
+    st.metric("Companies", f"{selected:,} of {len(portfolio):,}")
+
+    st.subheader("Overall vs Scalability")
+    display_scatter(source_key, portfolio, industries, ratings)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Score Distributions")
+        st.plotly_chart(create_distribution_chart(edges, distributions))
+    with col2:
+        st.subheader("Viability Ratings by Industry")
+        st.plotly_chart(create_rating_chart(portfolio.industries.tolist(), portfolio.viability_ratings,
+                                            rating_counts))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import concurrent.futures
+import contextlib
+import datetime
+import json
+import numbers
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS scenarios (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        company TEXT,
+        industry TEXT,
+        created_at TEXT NOT NULL,
+        overall_score REAL,
+        inputs TEXT NOT NULL,
+        report TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS scenarios_company ON scenarios (company, created_at)",
+    "CREATE INDEX IF NOT EXISTS scenarios_industry ON scenarios (industry, created_at)",
+    "CREATE INDEX IF NOT EXISTS scenarios_created_at ON scenarios (created_at)",
+    "CREATE INDEX IF NOT EXISTS scenarios_overall_score ON scenarios (overall_score)"
+)
+SUMMARY_COLUMNS = 'id, name, company, industry, created_at, overall_score'
+ORDERINGS = {'created_at': 'created_at DESC', 'overall_score': 'overall_score DESC'}
+
+
+class ScenarioStore:
+    # Saved form inputs and their reports in one SQLite file. Reads borrow
+    # a connection from a small pool (WAL mode lets them run alongside the
+    # writer); writes from every session go through one writer thread that
+    # commits whatever has queued up, up to max_batch_size statements, in a
+    # single transaction, so concurrent saves don't fight over the file lock
+    def __init__(self, path, pool_size=4, max_batch_size=64, max_wait=0.005):
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        with contextlib.closing(self._connect()) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+        self.pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self.pool.put(self._connect())
+        self.writes = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, name='scenario-writer', daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    @contextlib.contextmanager
+    def connection(self):
+        connection = self.pool.get()
+        try:
+            yield connection
+        finally:
+            self.pool.put(connection)
+
+    def save(self, name, inputs, report, company=None):
+        created_at = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+        return self._write(
+            "INSERT INTO scenarios (name, company, industry, created_at, overall_score, inputs, report) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, company or None, inputs.get('industry'), created_at, report.get('overall_score'),
+             json.dumps(inputs), json.dumps(report))
+        )
+
+    def delete(self, scenario_id):
+        self._write("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+    def load(self, scenario_id):
+        with self.connection() as connection:
+            row = connection.execute(f"SELECT {SUMMARY_COLUMNS}, inputs, report FROM scenarios WHERE id = ?",
+                                     (scenario_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No scenario {scenario_id}")
+        scenario = dict(row)
+        scenario['inputs'] = json.loads(scenario['inputs'])
+        scenario['report'] = json.loads(scenario['report'])
+        return scenario
+
+    def find(self, company=None, industry=None, min_score=None, since=None, order_by='created_at', limit=100):
+        # Scenario summaries (no inputs or report) matching every given filter
+        conditions, parameters = [], []
+        for clause, value in (("company = ?", company), ("industry = ?", industry),
+                              ("overall_score >= ?", min_score), ("created_at >= ?", since)):
+            if value is not None:
+                conditions.append(clause)
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        with self.connection() as connection:
+            rows = connection.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM scenarios {where}ORDER BY {ORDERINGS[order_by]} LIMIT ?",
+                (*parameters, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        self.writes.put(None)
+        self.writer.join()
+        while not self.pool.empty():
+            self.pool.get().close()
+
+    def _write(self, sql, parameters):
+        future = concurrent.futures.Future()
+        self.writes.put((sql, parameters, future))
+        return future.result()
+
+    def _write_loop(self):
+        connection = self._connect()
+        while True:
+            first = self.writes.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self.writes.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.writes.put(None)
+                    break
+                batch.append(item)
+            try:
+                with connection:
+                    results = [connection.execute(sql, parameters).lastrowid for sql, parameters, _ in batch]
+            except sqlite3.Error:
+                # Retry one by one so a bad statement only fails its own caller
+                results = []
+                for sql, parameters, _ in batch:
+                    try:
+                        with connection:
+                            results.append(connection.execute(sql, parameters).lastrowid)
+                    except sqlite3.Error as error:
+                        results.append(error)
+            for (_, _, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        connection.close()
+
+
+def diff_scenarios(before, after):
+    # Field-by-field input changes from one scenario to another, and how
+    # each category score (and the overall score) moved
+    before_inputs, after_inputs = before['inputs'], after['inputs']
+    changes = []
+    for field in [*before_inputs, *(field for field in after_inputs if field not in before_inputs)]:
+        old, new = before_inputs.get(field), after_inputs.get(field)
+        if old == new:
+            continue
+        numeric = all(isinstance(value, numbers.Number) and not isinstance(value, bool) for value in (old, new))
+        changes.append({'field': field, 'from': old, 'to': new, 'change': new - old if numeric else None})
+
+    before_scores = dict(before['report']['category_scores'], overall=before['report']['overall_score'])
+    after_scores = dict(after['report']['category_scores'], overall=after['report']['overall_score'])
+    scores = {category: {'from': before_scores[category], 'to': after_scores[category],
+                         'change': round(after_scores[category] - before_scores[category], 2)}
+              for category in after_scores if category in before_scores}
+    return {'inputs': changes, 'scores': scores}
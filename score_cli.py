@@ -0,0 +1,171 @@
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.analysis import BusinessAnalysisTool
+from core.data_quality import RecommendationAnalyzer
+from core.optimizer import TargetOptimizer
+from core.sensitivity import top_leverage
+
+
+def read_chunks(path, columns, chunksize, text_columns=()):
+    if path.endswith('.parquet'):
+        parquet_file = pq.ParquetFile(path)
+        present = [c for c in columns if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=present):
+            yield batch.to_pandas()
+    else:
+        wanted = set(columns)
+        # text_columns (the ids) stay strings even in a chunk where they look numeric or are empty
+        yield from pd.read_csv(path, usecols=lambda c: c in wanted, chunksize=chunksize, low_memory=False,
+                               dtype={c: str for c in text_columns})
+
+
+def input_columns(analyzer, details=False):
+    # Columns scoring reads; --details also needs what the recommendation
+    # rules, their industry benchmarks and the data-quality scores read
+    columns = list(analyzer.plan.fields)
+    if details:
+        columns += list(analyzer.recommendation_rules.field_categories)
+        for metrics in analyzer.recommendation_analyzer.REQUIRED_METRICS.values():
+            for tier in metrics.values():
+                columns += tier
+        columns += ['industry', 'data_source', 'data_age_months']
+    return list(dict.fromkeys(columns))
+
+
+def validate_chunks(chunks, fields, stats):
+    for chunk in chunks:
+        for field in fields:
+            if field in chunk and chunk[field].dtype.kind not in 'biuf':
+                values = pd.to_numeric(chunk[field], errors='coerce')
+                stats['invalid_values'] += int((values.isna() & chunk[field].notna()).sum())
+                chunk[field] = values
+        stats['rows'] += len(chunk)
+        yield chunk
+
+
+def score_chunk(analyzer, chunk, id_columns, details, leverage=False, target=None):
+    scored = analyzer.score_batch(chunk, details=details)
+    if details:
+        scored['recommendations'] = scored['recommendations'].map(json.dumps)
+        scored['risk_assessment'] = scored['risk_assessment'].map(json.dumps)
+    if leverage:
+        scored = scored.join(top_leverage(analyzer, chunk))
+    if target:
+        plans = TargetOptimizer(analyzer).solve_frame(chunk, target)
+        scored['target_reachable'] = [plan['reachable'] for plan in plans]
+        scored['target_cost'] = [round(plan['cost'], 4) for plan in plans]
+        scored['target_changes'] = [json.dumps({change['field']: round(change['to'], 4) for change in plan['changes']})
+                                    for plan in plans]
+    ids = [c for c in id_columns if c in chunk]
+    if ids:
+        scored = pd.concat([chunk[ids], scored], axis=1)
+    return scored
+
+
+def score_chunks(chunks, analyzer, id_columns, details=False, leverage=False, target=None):
+    for chunk in chunks:
+        yield score_chunk(analyzer, chunk, id_columns, details, leverage, target)
+
+
+_worker_analyzer = None
+
+
+def _init_worker():
+    # One analyzer (and its RecommendationAnalyzer) per worker process,
+    # reused for every shard the worker receives
+    global _worker_analyzer
+    _worker_analyzer = BusinessAnalysisTool(recommendation_analyzer=RecommendationAnalyzer())
+
+
+def _score_shard(chunk, id_columns, details, leverage, target):
+    return score_chunk(_worker_analyzer, chunk, id_columns, details, leverage, target)
+
+
+def score_chunks_parallel(chunks, workers, id_columns, details=False, leverage=False, target=None):
+    # Keep a bounded window of shards in flight and yield them in submission
+    # order, so output order matches input order and memory stays bounded
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_score_shard, chunk, id_columns, details, leverage, target))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_chunks(chunks, path):
+    if path.endswith('.parquet'):
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                # Later chunks can infer other types (an integer column with a
+                # gap reads as float), so each is cast to the file's schema
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(path, mode='w' if header else 'a', header=header, index=False)
+            header = False
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet export of company metrics")
+    parser.add_argument('input', help="Input .csv or .parquet file, one row per company")
+    parser.add_argument('output', help="Output .csv or .parquet file")
+    parser.add_argument('--chunksize', type=int, default=100000,
+                        help="Rows read, scored and written per chunk")
+    parser.add_argument('--id-column', action='append', default=[], dest='id_columns',
+                        help="Column copied through to the output (repeatable)")
+    parser.add_argument('--details', action='store_true',
+                        help="Also write recommendations and risk assessment (as JSON) per row")
+    parser.add_argument('--leverage', action='store_true',
+                        help="Also flag each company's highest-leverage input and the direction to move it")
+    parser.add_argument('--target', choices=[rating for rating, _ in BusinessAnalysisTool.VIABILITY_RATINGS],
+                        help="Also write the cheapest input changes that reach this viability rating")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes to shard chunks across")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    analyzer = BusinessAnalysisTool()
+    fields = analyzer.plan.fields
+    stats = {'rows': 0, 'invalid_values': 0}
+
+    start = time.perf_counter()
+    chunks = read_chunks(args.input, list(dict.fromkeys([*args.id_columns, *input_columns(analyzer, args.details)])),
+                         args.chunksize, args.id_columns)
+    chunks = validate_chunks(chunks, fields, stats)
+    if args.workers > 1:
+        chunks = score_chunks_parallel(chunks, args.workers, args.id_columns, args.details, args.leverage, args.target)
+    else:
+        chunks = score_chunks(chunks, analyzer, args.id_columns, args.details, args.leverage, args.target)
+    write_chunks(chunks, args.output)
+    elapsed = time.perf_counter() - start
+
+    rate = stats['rows'] / elapsed if elapsed > 0 else 0
+    print(f"Scored {stats['rows']:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    if stats['invalid_values']:
+        print(f"Warning: {stats['invalid_values']:,} non-numeric values were scored as 0", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from core.analysis import BusinessAnalysisTool
+from core.peer_ranking import PEER_INDEX_PATH, PeerIndex
+
+MAX_BODY_BYTES = 1 << 20
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def is_number(value):
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class MicroBatcher:
+    # Coalesces concurrent submit() calls into batches of up to max_batch_size
+    # inputs, waiting at most max_wait seconds after the first one arrives,
+    # and scores each batch in a worker thread so the event loop keeps
+    # accepting requests meanwhile
+    def __init__(self, analyzer, max_batch_size=256, max_wait=0.002):
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.scored = 0
+
+    async def submit(self, data):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((data, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            records = [data for data, _ in batch]
+            try:
+                reports = await loop.run_in_executor(None, self.analyzer.generate_comprehensive_reports, records)
+            except Exception:
+                # Rescore one by one so a bad input only fails its own request
+                reports = [await loop.run_in_executor(None, self._score_one, data) for data in records]
+            for (_, future), report in zip(batch, reports):
+                if future.done():
+                    continue
+                if isinstance(report, Exception):
+                    future.set_exception(report)
+                else:
+                    future.set_result(report)
+            self.batches += 1
+            self.scored += len(batch)
+
+    def _score_one(self, data):
+        try:
+            return self.analyzer.generate_comprehensive_reports([data])[0]
+        except Exception as error:
+            return error
+
+
+class ScoringService:
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.started = time.time()
+
+    async def handle(self, reader, writer):
+        # Minimal HTTP/1.1 with keep-alive: POST /report with a JSON object of
+        # inputs returns the report; GET /health returns batching counters
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {'error': "Request body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self.route(method, path, body)
+                close = (headers.get('connection', '').lower() == 'close'
+                         or version.strip() == 'HTTP/1.0' and headers.get('connection', '').lower() != 'keep-alive')
+                await self.respond(writer, status, payload, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok', 'uptime': round(time.time() - self.started, 1),
+                         'batches': self.batcher.batches, 'scored': self.batcher.scored}
+        if path != '/report':
+            return 404, {'error': f"Unknown path {path}"}
+        if method != 'POST':
+            return 405, {'error': "Use POST with a JSON object of inputs"}
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError as error:
+            return 400, {'error': f"Invalid JSON: {error}"}
+        if not isinstance(data, dict):
+            return 400, {'error': "Expected a JSON object of inputs"}
+        invalid = [field for field in self.batcher.analyzer.plan.fields
+                   if data.get(field) is not None and not is_number(data[field])]
+        if invalid:
+            return 400, {'error': f"Expected numbers for {', '.join(invalid)}"}
+        try:
+            return 200, await self.batcher.submit(data)
+        except Exception as error:
+            return 500, {'error': str(error)}
+
+    async def respond(self, writer, status, payload, close=False):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+
+async def serve(host, port, max_batch_size, max_wait):
+    peer_index = PeerIndex.load(PEER_INDEX_PATH) if os.path.exists(PEER_INDEX_PATH) else None
+    batcher = MicroBatcher(BusinessAnalysisTool(peer_index=peer_index), max_batch_size, max_wait)
+    service = ScoringService(batcher)
+    server = await asyncio.start_server(service.handle, host, port, backlog=1024)
+    print(f"Scoring service on http://{host}:{port} "
+          f"(max batch {max_batch_size}, max wait {max_wait * 1000:g}ms)", flush=True)
+    async with server:
+        await asyncio.gather(server.serve_forever(), batcher.run())
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="HTTP scoring service with request micro-batching")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=256,
+                        help="Most requests scored together in one batch")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0,
+                        help="Longest a request waits for others to join its batch")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch_size, args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+from core.peer_ranking import PeerIndex
+
+
+def test_batch_reports_match_single_reports():
+    reference = generate_companies(300, seed=12)
+    columns = [field for field in BusinessAnalysisTool().plan.fields if field in reference]
+    for analyzer in (BusinessAnalysisTool(),
+                     BusinessAnalysisTool(peer_index=PeerIndex.build(reference, columns, min_peers=10))):
+        frame = generate_companies(1000, seed=13, missing_rate=0.1).drop(columns='company')
+        records = frame.to_dict('records')
+        expected = [analyzer.generate_comprehensive_report(record) for record in records]
+        assert analyzer.generate_comprehensive_reports(records) == expected
+
+        scored = analyzer.score_batch(frame, details=True)
+        for report, (_, row) in zip(expected, scored.iterrows()):
+            assert row['overall_score'] == report['overall_score']
+            assert {category: row[f'{category}_score'] for category in report['category_scores']} == \
+                report['category_scores']
+            assert row['viability_rating'] == report['viability_rating']
+            assert row['scalability_rating'] == report['scalability_rating']
+            assert row['recommendations'] == report['recommendations']
+            assert row['risk_assessment'] == report['risk_assessment']
@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+
+
+def test_out_of_range_scores_raise_instead_of_wrapping():
+    analyzer = BusinessAnalysisTool()
+    frame = generate_companies(5, seed=4)
+    frame.loc[2, 'revenue_growth'] = 1e9
+    assert analyzer.score_batch(frame)['overall_score'].max() > 327
+    with pytest.raises(ValueError):
+        analyzer.score_compact(frame)
+    with pytest.raises(ValueError):
+        analyzer.report_codec.encode(analyzer.generate_comprehensive_report(frame.iloc[2].to_dict()))
+
+
+def test_in_range_batch_matches_reports():
+    analyzer = BusinessAnalysisTool()
+    frame = generate_companies(200, seed=5, missing_rate=0.1)
+    batch = analyzer.score_compact(frame)
+    for row, record in enumerate(frame.to_dict('records')):
+        report = analyzer.generate_comprehensive_report({k: v for k, v in record.items() if not pd.isna(v)})
+        assert batch[row].to_dict() == report
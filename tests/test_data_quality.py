@@ -0,0 +1,26 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_companies
+from core.data_quality import RecommendationAnalyzer
+
+
+def test_dict_and_batch_scores_match():
+    analyzer = RecommendationAnalyzer()
+    frame = generate_companies(200, seed=9, missing_rate=0.3)
+    records = frame.to_dict('records')
+    # Missing inputs as NaN, None or left out altogether
+    for index, record in enumerate(records):
+        for field, value in list(record.items()):
+            if isinstance(value, float) and math.isnan(value):
+                if index % 3 == 1:
+                    record[field] = None
+                elif index % 3 == 2:
+                    del record[field]
+    for category in analyzer.REQUIRED_METRICS:
+        quality, levels = analyzer.calculate_data_quality_batch(pd.DataFrame(records), category)
+        expected = [analyzer.calculate_data_quality_score(record, category) for record in records]
+        np.testing.assert_allclose(quality, expected)
+        assert list(levels) == [analyzer.get_confidence_level(score) for score in expected]
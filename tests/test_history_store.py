@@ -0,0 +1,87 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from history_store import MAX_PARTS, HistoryStore, month_ordinal
+
+
+def month_frame(month, companies=('a', 'b', 'c')):
+    # Company i scores month * (i + 1), so every delta is known up front
+    return pd.DataFrame({'company': list(companies), 'revenue_growth': [month] * len(companies),
+                         'overall_score': [month * (i + 1.0) for i in range(len(companies))]})
+
+
+def test_deltas_and_compaction(tmp_path):
+    store = HistoryStore(str(tmp_path), ['overall_score'])
+    for month in range(1, 13):
+        store.append(f'2024-{month:02d}', month_frame(month))
+    # A second process sees the first one's state, and a period written twice resolves to the latest append
+    other = HistoryStore(str(tmp_path), ['overall_score'])
+    other.append('2024-12', month_frame(100, ['b']))
+    store.append('2025-01', month_frame(13))
+
+    history = store.company_history('b')
+    assert list(history['period']) == [f'2024-{month:02d}' for month in range(1, 13)] + ['2025-01']
+    assert history['overall_score'].tolist() == [2.0 * month for month in range(1, 12)] + [100.0, 26.0]
+    assert np.isnan(history['overall_score_delta_3m'][:3]).all()
+    assert history['overall_score_delta_3m'][3:11].tolist() == [6.0] * 8
+    assert history.loc[11, 'overall_score_delta_6m'] == 100.0 - 12.0
+    # 2025-01 was compared against 2024-10 (3m) and 2024-07 (6m); 2024-01 is 12 months back
+    assert history.loc[12, ['overall_score_delta_3m', 'overall_score_delta_6m', 'overall_score_delta_12m']].tolist() \
+        == [26.0 - 20.0, 26.0 - 14.0, 26.0 - 2.0]
+    # The append past MAX_PARTS parts compacted them
+    assert 1 < len(store.parts()) <= MAX_PARTS
+
+    before = {company: store.company_history(company) for company in 'abc'}
+    store.compact()
+    assert len(store.parts()) == 1
+    for company, frame in before.items():
+        after = store.company_history(company)
+        pd.testing.assert_frame_equal(after.drop(columns='sequence'), frame.drop(columns='sequence'))
+
+    latest = store.latest().set_index('company')
+    assert latest.loc['a', 'period'] == '2025-01'
+    assert latest.loc['c', 'overall_score'] == 39.0
+
+
+def append_months(root, company):
+    store = HistoryStore(root, ['overall_score'])
+    for month in range(1, 7):
+        store.append(f'2024-{month:02d}', month_frame(month, [company]))
+
+
+def test_concurrent_writers_keep_every_company(tmp_path):
+    # Each writer reloads the state under the lock, so none drops another's companies
+    context = multiprocessing.get_context('fork')
+    writers = [context.Process(target=append_months, args=(str(tmp_path), f'company-{i}')) for i in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+    store = HistoryStore(str(tmp_path), ['overall_score'])
+    assert sorted(store.latest()['company']) == [f'company-{i}' for i in range(4)]
+    assert (store.latest()['period'] == '2024-06').all()
+    for i in range(4):
+        assert store.company_history(f'company-{i}')['overall_score_delta_3m'].tolist()[3:] == [3.0] * 3
+
+
+def test_late_periods_do_not_evict_newer_months(tmp_path):
+    store = HistoryStore(str(tmp_path), ['overall_score'])
+    store.append('2024-12', month_frame(12, ['a']))
+    # 2023-11 shares 2024-12's ring buffer slot
+    store.append('2023-11', month_frame(1, ['a']))
+    store.append('2025-03', month_frame(15, ['a']))
+    assert store.company_history('a')['overall_score_delta_3m'].iloc[-1] == 3.0
+    assert store.latest()['period'].tolist() == ['2025-03']
+
+
+def test_periods_are_parsed_strictly(tmp_path):
+    assert month_ordinal('2024-03') == month_ordinal('2024-03-31') == 2024 * 12 + 2
+    store = HistoryStore(str(tmp_path), ['overall_score'])
+    for period in ('2024-13', '2024-3', 'March 2024'):
+        with pytest.raises(ValueError):
+            store.append(period, month_frame(1))
+    assert store.parts() == []
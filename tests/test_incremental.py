@@ -0,0 +1,44 @@
+import numpy as np
+
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+from core.incremental import IncrementalEvaluator
+from core.peer_ranking import PeerIndex
+
+
+def test_updates_match_full_reports():
+    analyzer = BusinessAnalysisTool()
+    evaluator = IncrementalEvaluator(analyzer)
+    companies = generate_companies(50, seed=6).drop(columns='company').to_dict('records')
+    rng = np.random.default_rng(6)
+    state = evaluator.evaluate(companies[0])
+    for company in companies[1:]:
+        # Move a few inputs (sometimes the industry) to another company's values
+        data = dict(state.data)
+        for field in rng.choice(list(company), 3, replace=False):
+            data[field] = company[field]
+        state = evaluator.update(state, data)
+        assert state.report == analyzer.generate_comprehensive_report(data)
+
+
+def test_updates_drop_removed_peer_metrics():
+    reference = generate_companies(300, seed=7)
+    columns = [field for field in BusinessAnalysisTool().plan.fields if field in reference]
+    analyzer = BusinessAnalysisTool(peer_index=PeerIndex.build(reference, columns, min_peers=10))
+    evaluator = IncrementalEvaluator(analyzer)
+    companies = generate_companies(50, seed=8).drop(columns='company').to_dict('records')
+    rng = np.random.default_rng(8)
+    state = evaluator.evaluate(companies[0])
+    for company in companies[1:]:
+        # Edits also remove inputs or set them to None
+        data = dict(state.data)
+        for field in rng.choice(list(company), 4, replace=False):
+            action = rng.integers(3)
+            if action == 0:
+                data[field] = company[field]
+            elif action == 1:
+                data.pop(field, None)
+            else:
+                data[field] = None
+        state = evaluator.update(state, data)
+        assert state.report == analyzer.generate_comprehensive_report(data)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from ledger_ingest import LedgerIngest, MonthlyAccumulator
+
+LEDGER = """date,account,debit,credit
+2024-01-01,1000,1000,0
+2024-01-01,3000,0,1000
+2024-01-05,1200,300,0
+2024-01-05,2000,0,300
+2024-01-20,1000,2000,0
+2024-01-20,4000,0,2000
+2024-01-20,5000,1200,0
+2024-01-20,1000,0,1200
+2024-02-10,1000,2000,0
+2024-02-10,4000,0,2000
+2024-02-10,5000,1200,0
+2024-02-10,1000,0,1200
+2024-02-15,6000,400,0
+2024-02-15,1000,0,400
+not a date,1000,5,0
+2024-02-16,12000,5,0
+"""
+
+INVOICES = """invoice_date,paid_date,amount
+2024-01-10,2024-02-09,1000
+2024-02-01,2024-03-02,3000
+2024-02-05,,500
+someday,2024-02-01,100
+"""
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_accumulator_matches_a_groupby_sum():
+    rng = np.random.default_rng(14)
+    accumulator = MonthlyAccumulator(5)
+    expected = np.zeros((40, 5))
+    for _ in range(6):
+        months = rng.integers(24000, 24040, 1000)
+        keys = rng.integers(0, 5, 1000)
+        weights = rng.normal(size=1000)
+        np.add.at(expected, (months - 24000, keys), weights)
+        accumulator.add(months, keys, weights)
+    months, values = accumulator.table()
+    assert months.tolist() == sorted(set(months.tolist()))
+    np.testing.assert_allclose(values, expected[months - 24000])
+
+
+def test_ledger_totals(tmp_path):
+    ingest = LedgerIngest()
+    ingest.add_ledger(write(tmp_path / 'ledger.csv', LEDGER))
+    months, values = ingest.ledger.table()
+    assert months.tolist() == [2024 * 12, 2024 * 12 + 1]
+    totals = dict(zip(ingest.classes, values.sum(axis=0)))
+    assert totals['cash'] == 1000 + 2000 - 1200 + 2000 - 1200 - 400
+    assert totals['revenue'] == -4000
+    assert totals['cost_of_goods_sold'] == 2400
+    assert ingest.stats['ledger_rows'] == 16
+    assert ingest.stats['skipped_rows'] == 2
+
+    # Two months of flows, annualized; no receivables or invoices, so no DSO
+    inputs = ingest.financial_inputs('2024-02')
+    assert inputs == {'gross_profit_margin': 40.0, 'operating_margin': 30.0, 'net_profit_margin': 30.0,
+                      'current_ratio': 8.33, 'quick_ratio': 7.33, 'debt_to_equity': 0.0,
+                      'inventory_turnover': 48.0}
+    assert ingest.financial_inputs() == inputs
+
+    ingest.add_invoices(write(tmp_path / 'invoices.csv', INVOICES))
+    # Open invoices are left out; both paid ones took 30 days
+    assert ingest.financial_inputs('2024-02')['days_sales_outstanding'] == 30.0
+    assert ingest.stats['skipped_rows'] == 3
+
+
+def test_dso_from_receivables(tmp_path):
+    ingest = LedgerIngest()
+    ingest.add_ledger(write(tmp_path / 'ledger.csv', "date,account_class,amount\n"
+                                                     "2024-01-31,receivables,100\n"
+                                                     "2024-01-31,cash,3550\n"
+                                                     "2024-01-31,revenue,-3650\n"))
+    assert ingest.financial_inputs('2024-01')['days_sales_outstanding'] == round(100 / (3650 * 12) * 365, 2)
+
+
+def test_periods_are_parsed_strictly(tmp_path):
+    ingest = LedgerIngest()
+    ingest.add_ledger(write(tmp_path / 'ledger.csv', LEDGER))
+    for period in ('2024-13', '2024-2', 'Feb 2024', '202402'):
+        with pytest.raises(ValueError):
+            ingest.financial_inputs(period)
+    assert ingest.financial_inputs('2024-02-29') == ingest.financial_inputs('2024-02')
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from core.market_share import SIZE_CLASSES, MarketShareEstimator, size_classes
+
+
+def peers():
+    # (industry, size class, age, share) rows: one full cell in A, sparse cells
+    # in B, a full size class in C, and rows without an industry or age
+    rows = [('A', 0, 2.5, float(share)) for share in range(1, 41)]
+    rows += [('B', 0, 2.0, float(share)) for share in range(100, 105)]
+    rows += [('C', 1, 0.5, 7.0)] * 35
+    rows += [('B', 1, 10.0, 50.0)] * 5
+    rows += [(None, 2, 4.0, 60.0)] * 3
+    rows += [('A', 0, np.nan, 1000.0), ('A', 0, 2.5, np.nan)]
+    return pd.DataFrame(rows, columns=['industry', 'company_size', 'company_age', 'market_share']).assign(
+        company_size=lambda frame: [SIZE_CLASSES[size] for size in frame['company_size']])
+
+
+def test_fit_and_fallbacks(tmp_path):
+    estimator = MarketShareEstimator.fit_frame(peers())
+    assert estimator.industries == ('A', 'B', 'C', '__all__')
+    # A's cell has enough peers for its own median
+    assert estimator.estimate(2.9, SIZE_CLASSES[0], 'A') == 20.5
+    assert estimator.counts[0, 0, 2] == 40
+    # B's 5 peers fall back to the same size and age across industries: 1..40 and 100..104
+    assert estimator.estimate(2.0, 0, 'B') == 23.0
+    # ... and where that is sparse too, to the size class across ages: 35 x 7 and 5 x 50
+    assert estimator.estimate(10.0, 1, 'B') == 7.0
+    assert estimator.estimate(0.5, 1, 'C') == 7.0
+    # Size classes without enough peers anywhere use every peer
+    valid = peers().dropna(subset=['company_age', 'market_share'])
+    assert estimator.estimate(4.0, 2, None) == float(np.median(valid['market_share']))
+    # Unknown industries read the all-industries level
+    assert estimator.estimate(2.0, 0, 'Unknown') == estimator.estimate(2.0, 0)
+
+    path = str(tmp_path / 'market_share.npz')
+    estimator.save(path)
+    loaded = MarketShareEstimator.load(path)
+    assert loaded.industries == estimator.industries
+    assert loaded.age_edges == estimator.age_edges
+    np.testing.assert_array_equal(loaded.table, estimator.table)
+    np.testing.assert_array_equal(loaded.counts, estimator.counts)
+
+
+def test_headcounts_map_to_size_classes():
+    assert size_classes([1, 10, 11, 50, 51, 200, 201]).tolist() == [0, 0, 1, 1, 2, 2, 3]
+    frame = peers()
+    by_label = MarketShareEstimator.fit_frame(frame)
+    headcounts = {label: count for label, count in zip(SIZE_CLASSES, (5, 30, 100, 500))}
+    by_headcount = MarketShareEstimator.fit_frame(frame.assign(company_size=frame['company_size'].map(headcounts)))
+    np.testing.assert_array_equal(by_headcount.table, by_label.table)
+
+
+def test_empty_fit_falls_back_to_nan():
+    estimator = MarketShareEstimator.fit([], [], [], [])
+    assert estimator.industries == ('__all__',)
+    assert np.isnan(estimator.estimate(3, 0))
@@ -0,0 +1,46 @@
+import math
+
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+from core.optimizer import TargetOptimizer
+
+
+def test_nan_inputs_start_from_zero():
+    analyzer = BusinessAnalysisTool()
+    optimizer = TargetOptimizer(analyzer)
+    record = {'revenue_growth': math.nan, 'conversion_rate': None, 'market_share': 5}
+    plan = optimizer.solve(record, "Good")
+    assert plan == optimizer.solve({'revenue_growth': 0, 'conversion_rate': 0, 'market_share': 5}, "Good")
+    assert plan['reachable']
+    assert not math.isnan(plan['projected_score'])
+    assert plan['projected_score'] >= plan['threshold']
+    for change in plan['changes']:
+        assert not math.isnan(change['to'])
+
+
+def test_solve_frame_matches_solve():
+    analyzer = BusinessAnalysisTool()
+    optimizer = TargetOptimizer(analyzer)
+    frame = generate_companies(200, seed=3, missing_rate=0.2)
+    plans = optimizer.solve_frame(frame, "Strong")
+    for record, plan in zip(frame.to_dict('records'), plans):
+        assert optimizer.solve(record, "Strong") == plan
+        if plan['reachable']:
+            assert plan['projected_score'] >= plan['threshold']
+
+
+def test_guard_crossings_are_bought_first():
+    # Moving a guarded input just past 0 is nearly free and jumps its score
+    analyzer = BusinessAnalysisTool()
+    optimizer = TargetOptimizer(analyzer)
+    record = {'customer_acquisition_cost': 0, 'delivery_cost': 0}
+    plan = optimizer.solve(record, 1)
+    assert plan['reachable']
+    assert plan['cost'] < 1e-3
+    assert plan['projected_score'] >= plan['threshold']
+    assert all(0 < change['to'] < 1 for change in plan['changes'])
+
+    plan = optimizer.solve(record, 4)
+    assert plan['reachable']
+    assert plan['cost'] < 5.17
+    assert plan['projected_score'] >= plan['threshold']
@@ -0,0 +1,21 @@
+import math
+
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+from core.peer_ranking import PeerIndex
+
+
+def test_rank_record_matches_rank_frame():
+    reference = generate_companies(300, seed=10)
+    columns = [field for field in BusinessAnalysisTool().plan.fields if field in reference]
+    index = PeerIndex.build(reference, columns, min_peers=10)
+    frame = generate_companies(200, seed=11, missing_rate=0.2)
+    ranked = index.rank_frame(frame)
+    for (row, record), (_, ranks) in zip(frame.iterrows(), ranked.iterrows()):
+        record = record.to_dict()
+        if row % 2:
+            # None and NaN are both skipped
+            record = {field: None if isinstance(value, float) and math.isnan(value) else value
+                      for field, value in record.items()}
+        expected = {column[:-len('_percentile')]: rank for column, rank in ranks.items() if not math.isnan(rank)}
+        assert index.rank_record(record, {})['metrics'] == expected
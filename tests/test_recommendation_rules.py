@@ -0,0 +1,44 @@
+import math
+
+import pandas as pd
+
+from core.analysis import BusinessAnalysisTool
+from core.recommendation_rules import Benchmark
+
+
+def test_none_and_nan_fields_match_evaluate_frame():
+    rules = BusinessAnalysisTool().recommendation_rules
+    records = [
+        {'industry': 'B2B Software', 'market_share': None, 'brand_recognition': 20, 'revenue_growth': None,
+         'current_ratio': math.nan, 'debt_to_equity': 3, 'employee_retention': None},
+        {'industry': None, 'market_share': 1, 'marketing_roi': None, 'gross_profit_margin': None,
+         'days_sales_outstanding': 90},
+        {}
+    ]
+    fired = rules.evaluate_frame(pd.DataFrame.from_records(records))
+    for row, record in enumerate(records):
+        expected = [index for index in range(len(rules.rule_ids)) if fired[row, index]]
+        assert sorted(index for category in rules.category_rules
+                      for index in rules.evaluate(record, category)) == expected
+
+
+def test_every_rule_can_fire():
+    rules = BusinessAnalysisTool().recommendation_rules
+    fired = set()
+    for industry in rules.benchmarks.industries:
+        for index, conditions in enumerate(rules.conditions):
+            record = {'industry': industry}
+            for field, compare, threshold in conditions:
+                if isinstance(threshold, Benchmark):
+                    threshold = rules.benchmarks.get(industry, threshold.metric, None)
+                    if threshold is None:
+                        break
+                # Inputs are non-negative, so a '<' threshold has to be above 0
+                value = threshold / 2 if compare(threshold / 2, threshold) else threshold * 2 + 1
+                assert value >= 0 and compare(value, threshold)
+                record[field] = value
+            else:
+                assert index in rules.evaluate(record, rules.categories[index])
+                assert rules.evaluate_frame(pd.DataFrame([record]))[0, index]
+                fired.add(index)
+    assert fired == set(range(len(rules.rule_ids)))
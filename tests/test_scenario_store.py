@@ -0,0 +1,76 @@
+import concurrent.futures
+import sqlite3
+
+import pytest
+
+from core.analysis import BusinessAnalysisTool
+from scenario_store import ScenarioStore, diff_scenarios
+
+
+def test_save_load_and_find(tmp_path):
+    analyzer = BusinessAnalysisTool()
+    store = ScenarioStore(str(tmp_path / 'scenarios.db'))
+    inputs = {'industry': 'B2B Software', 'revenue_growth': 25, 'market_share': 4.5}
+    report = analyzer.generate_comprehensive_report(inputs)
+    scenario_id = store.save('baseline', inputs, report, company='Acme')
+    scenario = store.load(scenario_id)
+    assert scenario['inputs'] == inputs
+    assert scenario['report'] == report
+    assert (scenario['name'], scenario['company'], scenario['industry']) == ('baseline', 'Acme', 'B2B Software')
+
+    better = dict(inputs, revenue_growth=60)
+    store.save('growth', better, analyzer.generate_comprehensive_report(better), company='Acme')
+    store.save('other', {'industry': 'Manufacturing'}, {'overall_score': 0.0}, company='Other')
+    assert [row['name'] for row in store.find(company='Acme', order_by='overall_score')] == ['growth', 'baseline']
+    assert [row['name'] for row in store.find(industry='Manufacturing')] == ['other']
+    assert [row['name'] for row in store.find(min_score=report['overall_score'], order_by='overall_score')] == ['growth', 'baseline']
+
+    store.delete(scenario_id)
+    with pytest.raises(KeyError):
+        store.load(scenario_id)
+    store.close()
+
+
+def test_concurrent_saves_and_failures(tmp_path):
+    store = ScenarioStore(str(tmp_path / 'scenarios.db'), max_wait=0.05)
+    with concurrent.futures.ThreadPoolExecutor(16) as pool:
+        # A scenario without a name breaks the NOT NULL constraint, and only fails its own save
+        futures = [pool.submit(store.save, None if i == 5 else f'scenario {i}', {'i': i}, {'overall_score': i})
+                   for i in range(32)]
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[5].result()
+    ids = [future.result() for i, future in enumerate(futures) if i != 5]
+    assert len(set(ids)) == 31
+    assert [store.load(scenario_id)['inputs']['i'] for scenario_id in ids] == [i for i in range(32) if i != 5]
+    store.close()
+
+
+def test_close_drains_queued_writes(tmp_path):
+    path = str(tmp_path / 'scenarios.db')
+    store = ScenarioStore(path, max_wait=0.05)
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(store.save, f'scenario {i}', {}, {}) for i in range(8)]
+        concurrent.futures.wait(futures)
+        store.close()
+    assert not store.writer.is_alive()
+    assert all(future.result() for future in futures)
+    reopened = ScenarioStore(path)
+    assert len(reopened.find()) == 8
+    reopened.close()
+
+
+def test_diff_scenarios():
+    before = {'inputs': {'revenue_growth': 10, 'industry': 'Manufacturing', 'market_share': 2},
+              'report': {'overall_score': 4.2, 'category_scores': {'sales': 3.1, 'marketing': 5.0}}}
+    after = {'inputs': {'revenue_growth': 25, 'industry': 'B2B Software', 'defect_rate': 1},
+             'report': {'overall_score': 5.0, 'category_scores': {'sales': 4.75, 'marketing': 5.0}}}
+    diff = diff_scenarios(before, after)
+    assert diff['inputs'] == [
+        {'field': 'revenue_growth', 'from': 10, 'to': 25, 'change': 15},
+        {'field': 'industry', 'from': 'Manufacturing', 'to': 'B2B Software', 'change': None},
+        {'field': 'market_share', 'from': 2, 'to': None, 'change': None},
+        {'field': 'defect_rate', 'from': None, 'to': 1, 'change': None}
+    ]
+    assert diff['scores'] == {'sales': {'from': 3.1, 'to': 4.75, 'change': 1.65},
+                              'marketing': {'from': 5.0, 'to': 5.0, 'change': 0.0},
+                              'overall': {'from': 4.2, 'to': 5.0, 'change': 0.8}}
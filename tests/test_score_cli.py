@@ -0,0 +1,43 @@
+import json
+
+import pandas as pd
+
+import score_cli
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+
+
+def test_details_match_comprehensive_report(tmp_path):
+    companies = generate_companies(300, seed=7, missing_rate=0.1)
+    source, output = tmp_path / 'companies.csv', tmp_path / 'scored.csv'
+    companies.to_csv(source, index=False)
+
+    score_cli.main([str(source), str(output), '--details', '--id-column', 'company', '--chunksize', '128'])
+
+    scored = pd.read_csv(output)
+    analyzer = BusinessAnalysisTool()
+    for record, row in zip(pd.read_csv(source).to_dict('records'), scored.itertuples()):
+        # Empty cells are missing inputs, as in a form that left them out
+        report = analyzer.generate_comprehensive_report({k: v for k, v in record.items() if not pd.isna(v)})
+        assert row.overall_score == report['overall_score']
+        assert json.loads(row.recommendations) == report['recommendations']
+        assert json.loads(row.risk_assessment) == report['risk_assessment']
+
+
+def test_parquet_output_keeps_one_schema(tmp_path):
+    companies = generate_companies(300, seed=8, missing_rate=0.1)
+    # Ids that look numeric in the first chunk, then names and gaps
+    companies['company'] = [str(i) if i < 128 else (None if i % 7 == 0 else f'company-{i}')
+                            for i in range(len(companies))]
+    source = tmp_path / 'companies.csv'
+    companies.to_csv(source, index=False)
+    for output in ('scored.csv', 'scored.parquet'):
+        score_cli.main([str(source), str(tmp_path / output), '--id-column', 'company', '--target', 'Good',
+                        '--chunksize', '128'])
+
+    scored = pd.read_parquet(tmp_path / 'scored.parquet')
+    assert len(scored) == len(companies)
+    assert scored['company'].tolist() == companies['company'].tolist()
+    expected = pd.read_csv(tmp_path / 'scored.csv', dtype={'company': str})
+    pd.testing.assert_frame_equal(scored.drop(columns='company'), expected.drop(columns='company'),
+                                  check_dtype=False)
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from core.analysis import BusinessAnalysisTool
+from scoring_service import MicroBatcher, ScoringService
+
+
+class FailingAnalyzer(BusinessAnalysisTool):
+    # Any batch holding a record marked 'fail' raises
+    def generate_comprehensive_reports(self, records):
+        if any(record.get('fail') for record in records):
+            raise ValueError("bad record")
+        return super().generate_comprehensive_reports(records)
+
+
+def run_batcher(records, max_batch_size=8):
+    async def main():
+        batcher = MicroBatcher(FailingAnalyzer(), max_batch_size=max_batch_size, max_wait=0.05)
+        worker = asyncio.ensure_future(batcher.run())
+        results = await asyncio.gather(*[batcher.submit(record) for record in records], return_exceptions=True)
+        worker.cancel()
+        return batcher, results
+
+    return asyncio.run(main())
+
+
+def test_requests_are_batched():
+    analyzer = BusinessAnalysisTool()
+    records = [{'revenue_growth': growth, 'market_share': 5} for growth in range(6)]
+    batcher, results = run_batcher(records)
+    assert batcher.batches == 1
+    assert batcher.scored == len(records)
+    assert results == [analyzer.generate_comprehensive_report(record) for record in records]
+
+
+def test_bad_input_only_fails_its_own_request():
+    analyzer = BusinessAnalysisTool()
+    records = [{'revenue_growth': 10}, {'fail': True}, {'revenue_growth': None}, {'market_share': 8}]
+    batcher, results = run_batcher(records)
+    assert batcher.batches == 1
+    assert isinstance(results[1], ValueError)
+    for record, result in zip(records, results):
+        if not record.get('fail'):
+            assert result == analyzer.generate_comprehensive_report(record)
+
+
+def test_non_numeric_inputs_are_rejected():
+    service = ScoringService(MicroBatcher(BusinessAnalysisTool()))
+    status, payload = asyncio.run(service.route('POST', '/report', json.dumps({'revenue_growth': 'abc'}).encode()))
+    assert status == 400
+    assert 'revenue_growth' in payload['error']
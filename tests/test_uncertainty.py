@@ -0,0 +1,40 @@
+import pandas as pd
+
+from benchmarks.synthetic import generate_companies
+from core.analysis import BusinessAnalysisTool
+from core.uncertainty import simulate_report, simulate_scores
+
+
+def test_bands_bracket_the_point_scores():
+    analyzer = BusinessAnalysisTool()
+    scores = inside = 0
+    for record in generate_companies(60, seed=9, missing_rate=0.2).to_dict('records'):
+        record = {k: v for k, v in record.items() if not pd.isna(v)}
+        report = analyzer.generate_comprehensive_report(record)
+        bands = simulate_report(analyzer, record, samples=4000)
+        pairs = [(report['overall_score'], bands['overall_score'])] + [
+            (report['category_scores'][category], bands['category_scores'][category])
+            for category in report['category_scores']]
+        for point, band in pairs:
+            assert band['p5'] <= point <= band['p95']
+            scores += 1
+            inside += band['p25'] <= point <= band['p75']
+    # Scores that saturate (a clamp at 10, an input near its bound) skew a
+    # little below the point; everything else is centered on it
+    assert inside >= 0.95 * scores
+
+
+def test_missing_inputs_do_not_vary():
+    analyzer = BusinessAnalysisTool()
+    bands = simulate_report(analyzer, {'revenue_growth': None}, samples=2000)
+    report = analyzer.generate_comprehensive_report({})
+    assert set(bands['overall_score'].values()) == {report['overall_score']}
+
+
+def test_guarded_inputs_stay_on_their_side_of_zero():
+    analyzer = BusinessAnalysisTool()
+    # Small positive costs sit right next to the guard, which scores 0 and below as 0
+    scores = simulate_scores(analyzer, {'delivery_cost': 1, 'cash_flow_operations': 1}, samples=2000)
+    at_guard = analyzer.generate_comprehensive_report({'delivery_cost': 0, 'cash_flow_operations': 0})
+    for category in ('product_delivery', 'financial_health'):
+        assert scores[category].min() > at_guard['category_scores'][category]